@@ -0,0 +1,4 @@
+"""
+Stand Up Sydney MCP benchmark suite
+Local upstream stand-ins plus a concurrent SSE load driver for droplet-setup/server.py
+"""
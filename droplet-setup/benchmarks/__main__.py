@@ -0,0 +1,258 @@
+"""
+Benchmark runner
+Starts the upstream stand-ins and the MCP server, drives it over SSE and reports / compares results
+
+Usage (from droplet-setup/):
+    python -m benchmarks --clients 20 --duration 30
+    python -m benchmarks --latency notion=0.4 --error-rate metricool=0.05 --save-baseline
+    python -m benchmarks --startup-only --startup-runs 10 --max-startup 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.load import compare_to_baseline, run_load
+from benchmarks.mock_upstreams import server_env
+
+SETUP_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> float:
+    """Block until something accepts connections on the port; returns seconds waited"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"process exited with code {process.returncode} before listening on {port}")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.02)
+    raise TimeoutError(f"nothing listening on port {port} after {timeout}s")
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident set size from /proc (Linux droplet); None elsewhere"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def build_server_script(workdir: Path) -> Path:
+    """Concatenate server.py + server_extensions.py the way the droplet deploys them"""
+    script = workdir / 'server.py'
+    script.write_text(
+        (SETUP_DIR / 'server.py').read_text() + '\n' + (SETUP_DIR / 'server_extensions.py').read_text()
+    )
+    return script
+
+
+def measure_startup(script: Path, env: dict, workdir: Path, runs: int) -> dict:
+    """Cold-start the server `runs` times; seconds from spawn to first accepted connection"""
+    samples = []
+    for run in range(runs):
+        port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, str(script)], cwd=workdir,
+            env={**env, 'MCP_PORT': str(port), 'MCP_JOBS_DB': str(workdir / f'startup-{run}.sqlite3')},
+            stdout=subprocess.DEVNULL
+        )
+        try:
+            samples.append(_wait_for_port(port, server))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+    samples.sort()
+    return {
+        'runs': runs,
+        'min_seconds': round(samples[0], 3),
+        'p50_seconds': round(samples[len(samples) // 2], 3),
+        'max_seconds': round(samples[-1], 3),
+    }
+
+
+async def _sample_memory(pid: int, samples: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        rss = _rss_mb(pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _drive(url: str, pid: int, args) -> dict:
+    memory: List[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_memory(pid, memory, stop))
+    try:
+        if args.warmup:
+            await run_load(url, args.clients, args.warmup, seed=args.seed + 10_000)
+        summary = await run_load(url, args.clients, args.duration, seed=args.seed)
+    finally:
+        stop.set()
+        await sampler
+    summary['memory_mb'] = {
+        'start': memory[0] if memory else None,
+        'peak': max(memory) if memory else None,
+        'end': memory[-1] if memory else None,
+    }
+    return summary
+
+
+def _print_startup(startup: dict) -> None:
+    print(f"🚀 Cold start over {startup['runs']} runs: min {startup['min_seconds']}s, "
+          f"p50 {startup['p50_seconds']}s, max {startup['max_seconds']}s to first accepted connection")
+
+
+def _print_report(summary: dict) -> None:
+    print(f"\n📊 {summary['calls']} calls in {summary['duration_seconds']}s "
+          f"→ {summary['throughput_rps']} rps, {summary['errors']} errors")
+    print(f"🧠 Server RSS (MB): {summary['memory_mb']}")
+    print(f"🚀 Server startup: {summary.get('startup_seconds')}s to first accepted connection\n")
+    print(f"{'tool':32} {'calls':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for tool, stats in summary['tools'].items():
+        print(f"{tool:32} {stats['calls']:>7} {stats['errors']:>7} "
+              f"{str(stats['p50_ms']):>9} {str(stats['p95_ms']):>9} {str(stats['p99_ms']):>9}")
+    for tool, sample in summary.get('error_samples', {}).items():
+        print(f"  ⚠️ {tool}: {sample}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the Stand Up Sydney MCP server against local stand-ins")
+    parser.add_argument('--clients', type=int, default=10, help='Concurrent MCP SSE clients')
+    parser.add_argument('--duration', type=float, default=20.0, help='Measured seconds of load')
+    parser.add_argument('--warmup', type=float, default=3.0, help='Unmeasured warm-up seconds')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--latency', action='append', default=[], metavar='UPSTREAM=SECONDS')
+    parser.add_argument('--error-rate', action='append', default=[], metavar='UPSTREAM=P')
+    parser.add_argument('--throttle-rate', action='append', default=[], metavar='UPSTREAM=P')
+    parser.add_argument('--server-env', action='append', default=[], metavar='KEY=VALUE',
+                        help='Extra environment for the MCP server (e.g. MCP_CACHE_TTL_EVENTS=0)')
+    parser.add_argument('--output', type=Path, help='Write the JSON summary here')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed regression vs baseline (0.2 = 20%%)')
+    parser.add_argument('--startup-runs', type=int, default=0, help='Also measure this many cold starts')
+    parser.add_argument('--startup-only', action='store_true', help='Only measure cold starts (no load test)')
+    parser.add_argument('--max-startup', type=float, default=1.0,
+                        help='Fail when the median cold start exceeds this many seconds')
+    args = parser.parse_args(argv)
+    if args.startup_only and not args.startup_runs:
+        args.startup_runs = 10
+
+    mock_port, server_port = _free_port(), _free_port()
+    mock_cmd = [sys.executable, '-m', 'benchmarks.mock_upstreams', '--port', str(mock_port)]
+    for flag, values in (('--latency', args.latency), ('--error-rate', args.error_rate),
+                         ('--throttle-rate', args.throttle_rate)):
+        for value in values:
+            mock_cmd += [flag, value]
+
+    with tempfile.TemporaryDirectory(prefix='mcp-bench-') as tmp:
+        workdir = Path(tmp)
+        script = build_server_script(workdir)
+        env = {
+            **os.environ,
+            **server_env(f'http://127.0.0.1:{mock_port}'),
+            'PYTHONPATH': os.pathsep.join(filter(None, [str(SETUP_DIR), os.environ.get('PYTHONPATH')])),
+            'MCP_HOST': '127.0.0.1',
+            'MCP_PORT': str(server_port),
+            'MCP_JOBS_DB': str(workdir / 'jobs.sqlite3'),
+        }
+        for item in args.server_env:
+            key, _, value = item.partition('=')
+            env[key] = value
+
+        if args.startup_only:
+            # Upstreams are not contacted while starting, so no stand-ins are needed
+            startup = measure_startup(script, env, workdir, args.startup_runs)
+            _print_startup(startup)
+            if args.output:
+                args.output.write_text(json.dumps({'startup': startup}, indent=2))
+            return _check_startup(startup, args.max_startup)
+
+        mock = subprocess.Popen(mock_cmd, cwd=SETUP_DIR)
+        server = None
+        try:
+            _wait_for_port(mock_port, mock)
+            server = subprocess.Popen([sys.executable, str(script)], cwd=workdir, env=env,
+                                      stdout=subprocess.DEVNULL)
+            startup = _wait_for_port(server_port, server)
+            summary = asyncio.run(_drive(f'http://127.0.0.1:{server_port}/sse', server.pid, args))
+            summary['startup_seconds'] = round(startup, 3)
+            if args.startup_runs:
+                summary['startup'] = measure_startup(script, env, workdir, args.startup_runs)
+        finally:
+            for process in (server, mock):
+                if process is not None:
+                    process.terminate()
+                    try:
+                        process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+
+    summary['config'] = {
+        'clients': args.clients, 'duration': args.duration, 'latency': args.latency,
+        'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate, 'server_env': args.server_env,
+        'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count(),
+    }
+    _print_report(summary)
+    status = 0
+    if 'startup' in summary:
+        _print_startup(summary['startup'])
+        status = _check_startup(summary['startup'], args.max_startup)
+
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(summary, indent=2))
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return status
+
+    if args.baseline.exists():
+        regressions = compare_to_baseline(summary, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"  • {regression}")
+            return 1
+        print("\n✅ No regressions against baseline")
+    return status
+
+
+def _check_startup(startup: dict, max_seconds: float) -> int:
+    if startup['p50_seconds'] > max_seconds:
+        print(f"\n❌ Median cold start {startup['p50_seconds']}s exceeds {max_seconds}s")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Concurrent MCP load driver
+N SSE clients calling a weighted tool mix, with per-tool latency percentiles and baseline comparison
+"""
+
+import asyncio
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastmcp import Client
+from fastmcp.client.transports import SSETransport
+
+ArgsFactory = Callable[[random.Random], dict]
+
+# (weight, tool name, argument factory) - ids match the seeded mock data set
+DEFAULT_MIX: List[Tuple[int, str, ArgsFactory]] = [
+    (20, 'query_supabase', lambda rng: {'table': 'events', 'filters': {'id': str(rng.randint(1, 60))}}),
+    (15, 'query_supabase', lambda rng: {'table': 'comedians', 'filters': {'id': str(rng.randint(1, 200))}}),
+    (10, 'standup_generate_lineup', lambda rng: {'event_id': str(rng.randint(1, 60))}),
+    (2, 'standup_generate_lineups', lambda rng: {'start_date': '2026-01-05', 'end_date': '2026-01-11'}),
+    (8, 'notion_query_database', lambda rng: {'database_id': 'mock-events-db'}),
+    (5, 'metricool_get_brands', lambda rng: {}),
+    (5, 'github_list_issues', lambda rng: {'repo': 'standupsydney/site'}),
+    (5, 'standup_book_comedian', lambda rng: {
+        'comedian_id': str(rng.randint(1, 200)), 'event_id': str(rng.randint(1, 60)), 'fee': 150.0
+    }),
+    (3, 'standup_create_event', lambda rng: {'event_data': {
+        'title': f'Benchmark Show {rng.randint(1, 10 ** 6)}', 'venue': 'Factory Theatre',
+        'event_date': '2026-03-01T19:30:00+11:00', 'status': 'Planning'
+    }}),
+    (3, 'standup_sync_n8n_webhook', lambda rng: {'workflow_name': 'benchmark', 'data': {'source': 'benchmark'}}),
+    (2, 'mcp_health_check', lambda rng: {'deep': False}),
+]
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.error_samples: Dict[str, str] = {}
+        self.started = 0.0
+        self.finished = 0.0
+
+    def record(self, tool: str, elapsed: float, error: Optional[BaseException] = None) -> None:
+        if error is None:
+            self.latencies.setdefault(tool, []).append(elapsed)
+        else:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+            self.error_samples.setdefault(tool, f"{type(error).__name__}: {error}"[:300])
+
+    def summary(self) -> dict:
+        elapsed = self.finished - self.started
+        tools = {}
+        total_ok = 0
+        for tool in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(tool, [])
+            total_ok += len(samples)
+            tools[tool] = {
+                'calls': len(samples) + self.errors.get(tool, 0),
+                'errors': self.errors.get(tool, 0),
+                'p50_ms': round(percentile(samples, 0.50) * 1000, 2) if samples else None,
+                'p95_ms': round(percentile(samples, 0.95) * 1000, 2) if samples else None,
+                'p99_ms': round(percentile(samples, 0.99) * 1000, 2) if samples else None,
+                'max_ms': round(max(samples) * 1000, 2) if samples else None,
+            }
+        total_errors = sum(self.errors.values())
+        return {
+            'duration_seconds': round(elapsed, 2),
+            'calls': total_ok + total_errors,
+            'errors': total_errors,
+            'throughput_rps': round(total_ok / elapsed, 2) if elapsed else 0.0,
+            'tools': tools,
+            'error_samples': self.error_samples,
+        }
+
+
+async def _client_loop(url: str, deadline: float, mix, rng: random.Random, result: LoadResult) -> None:
+    weights = [weight for weight, _, _ in mix]
+    async with Client(SSETransport(url)) as client:
+        while time.monotonic() < deadline:
+            _, tool, make_args = rng.choices(mix, weights=weights)[0]
+            started = time.perf_counter()
+            try:
+                await client.call_tool(tool, make_args(rng))
+            except Exception as e:
+                result.record(tool, time.perf_counter() - started, e)
+            else:
+                result.record(tool, time.perf_counter() - started)
+
+
+async def run_load(url: str, clients: int, duration: float, mix=None, seed: int = 1) -> dict:
+    """Drive the server with `clients` concurrent SSE sessions for `duration` seconds"""
+    mix = mix or DEFAULT_MIX
+    result = LoadResult()
+    result.started = time.monotonic()
+    deadline = result.started + duration
+    await asyncio.gather(*[
+        _client_loop(url, deadline, mix, random.Random(seed + i), result)
+        for i in range(clients)
+    ])
+    result.finished = time.monotonic()
+    return result.summary()
+
+
+def compare_to_baseline(current: dict, baseline: dict, tolerance: float = 0.2, min_delta_ms: float = 5.0) -> List[str]:
+    """Human-readable regressions: p95 latency or throughput worse than baseline by more than `tolerance`"""
+    regressions = []
+    base_rps = baseline.get('throughput_rps') or 0
+    if base_rps and current['throughput_rps'] < base_rps * (1 - tolerance):
+        regressions.append(f"throughput {current['throughput_rps']} rps < baseline {base_rps} rps")
+    for tool, stats in current['tools'].items():
+        base = baseline.get('tools', {}).get(tool)
+        if not base or base.get('p95_ms') is None or stats.get('p95_ms') is None:
+            continue
+        limit = base['p95_ms'] * (1 + tolerance)
+        if stats['p95_ms'] > limit and stats['p95_ms'] - base['p95_ms'] > min_delta_ms:
+            regressions.append(f"{tool}: p95 {stats['p95_ms']}ms > baseline {base['p95_ms']}ms")
+        base_error_rate = base['errors'] / base['calls'] if base.get('calls') else 0
+        error_rate = stats['errors'] / stats['calls'] if stats['calls'] else 0
+        if error_rate > base_error_rate + 0.01:
+            regressions.append(f"{tool}: error rate {error_rate:.2%} > baseline {base_error_rate:.2%}")
+    return regressions
@@ -0,0 +1,372 @@
+"""
+Local upstream stand-ins
+One Starlette app serving Supabase/PostgREST, Notion, GitHub, Metricool and n8n under path prefixes,
+with configurable latency and error injection per upstream
+"""
+
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+UPSTREAMS = ('supabase', 'notion', 'github', 'metricool', 'n8n')
+
+
+@dataclass
+class UpstreamBehaviour:
+    """Latency and fault profile for one upstream stand-in"""
+    latency: float = 0.05
+    jitter: float = 0.5
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+
+
+@dataclass
+class MockConfig:
+    behaviours: Dict[str, UpstreamBehaviour] = field(
+        default_factory=lambda: {name: UpstreamBehaviour() for name in UPSTREAMS}
+    )
+    events: int = 60
+    comedians: int = 200
+    bookings_per_event: int = 6
+    seed: int = 7
+
+
+def seed_tables(config: MockConfig) -> Dict[str, List[dict]]:
+    """Deterministic Stand Up Sydney data set (events, comedians, bookings)"""
+    rng = random.Random(config.seed)
+    start = datetime(2026, 1, 5, 19, 30, tzinfo=timezone.utc)
+    venues = ['The Comedy Store', 'Factory Theatre', 'Enmore Theatre', 'Giant Dwarf', 'The Chippo Hotel']
+    comedians = [
+        {'id': str(i), 'name': f'Comedian {i}', 'bio': 'Stand-up comedian based in Sydney. ' * 4,
+         'updated_at': start.isoformat()}
+        for i in range(1, config.comedians + 1)
+    ]
+    events, bookings = [], []
+    booking_ids = itertools.count(1)
+    for i in range(1, config.events + 1):
+        event_date = start + timedelta(days=i // 5, hours=i % 3)
+        events.append({
+            'id': str(i), 'title': f'Stand Up Sydney Showcase #{i}', 'venue': rng.choice(venues),
+            'event_date': event_date.isoformat(), 'status': 'Confirmed', 'updated_at': start.isoformat()
+        })
+        for comedian in rng.sample(comedians, config.bookings_per_event):
+            bookings.append({
+                'id': str(next(booking_ids)), 'event_id': str(i), 'comedian_id': comedian['id'],
+                'fee': 150.0, 'status': 'confirmed', 'updated_at': start.isoformat()
+            })
+    return {'events': events, 'comedians': comedians, 'bookings': bookings}
+
+
+def notion_page(page_id: str, title: str) -> dict:
+    """Page object shaped like Notion's, including the nested metadata real responses carry"""
+    now = datetime.now(timezone.utc).isoformat()
+    user = {'object': 'user', 'id': 'c2f20311-9e54-4d11-8c79-7398424ae41e'}
+    return {
+        'object': 'page', 'id': page_id, 'created_time': now, 'last_edited_time': now,
+        'created_by': user, 'last_edited_by': user, 'cover': None, 'icon': None,
+        'parent': {'type': 'database_id', 'database_id': 'mock-events-db'},
+        'archived': False, 'in_trash': False, 'url': f'https://www.notion.so/{page_id}',
+        'public_url': None,
+        'properties': {
+            'Title': {'id': 'title', 'type': 'title', 'title': [{
+                'type': 'text', 'text': {'content': title, 'link': None},
+                'annotations': {'bold': False, 'italic': False, 'strikethrough': False,
+                                'underline': False, 'code': False, 'color': 'default'},
+                'plain_text': title, 'href': None
+            }]},
+            'Status': {'id': 'st', 'type': 'select', 'select': {'id': 'opt', 'name': 'Confirmed', 'color': 'green'}},
+            'Date': {'id': 'dt', 'type': 'date', 'date': {'start': now, 'end': None, 'time_zone': None}},
+        },
+        'request_id': page_id,
+    }
+
+
+def build_app(config: MockConfig) -> Starlette:
+    tables = seed_tables(config)
+    ids = itertools.count(100000)
+    counters = {name: {'requests': 0, 'errors': 0, 'throttled': 0} for name in UPSTREAMS}
+
+    def upstream(name):
+        """Apply the upstream's latency / error / throttle profile around a handler"""
+        def decorator(handler):
+            async def wrapper(request: Request):
+                behaviour = config.behaviours[name]
+                counters[name]['requests'] += 1
+                if behaviour.latency:
+                    spread = behaviour.latency * behaviour.jitter
+                    await asyncio.sleep(max(0.0, random.uniform(behaviour.latency - spread, behaviour.latency + spread)))
+                roll = random.random()
+                if roll < behaviour.throttle_rate:
+                    counters[name]['throttled'] += 1
+                    return JSONResponse({'message': 'rate limited'}, status_code=429,
+                                        headers={'Retry-After': str(behaviour.retry_after)})
+                if roll < behaviour.throttle_rate + behaviour.error_rate:
+                    counters[name]['errors'] += 1
+                    return JSONResponse({'message': 'injected failure'}, status_code=503)
+                return await handler(request)
+            return wrapper
+        return decorator
+
+    # ---------- Supabase / PostgREST ----------
+
+    def split_top_level(text: str) -> List[str]:
+        parts, depth, current, quoted = [], 0, '', False
+        for char in text:
+            if char == '"':
+                quoted = not quoted
+            elif not quoted and char == '(':
+                depth += 1
+            elif not quoted and char == ')':
+                depth -= 1
+            elif not quoted and char == ',' and depth == 0:
+                parts.append(current)
+                current = ''
+                continue
+            current += char
+        return parts + [current] if current else parts
+
+    def matches(row: dict, key: str, op: str, operand: str) -> bool:
+        operand = operand.strip('"')
+        value = row.get(key)
+        if op == 'eq':
+            return str(value) == operand
+        if op == 'in':
+            return str(value) in set(operand.strip('()').split(','))
+        if value is None:
+            return False
+        return {'gte': str(value) >= operand, 'gt': str(value) > operand,
+                'lte': str(value) <= operand, 'lt': str(value) < operand}.get(op, True)
+
+    def logical(row: dict, expression: str, combine) -> bool:
+        """PostgREST or=(a.gt.x,and(a.eq.x,b.gt.y)) style expressions"""
+        results = []
+        for part in split_top_level(expression.strip()[1:-1]):
+            if part.startswith(('and(', 'or(')):
+                nested, _, inner = part.partition('(')
+                results.append(logical(row, '(' + inner, all if nested == 'and' else any))
+            else:
+                key, _, rest = part.partition('.')
+                op, _, operand = rest.partition('.')
+                results.append(matches(row, key, op, operand))
+        return combine(results)
+
+    def postgrest_filter(request: Request, rows: List[dict]) -> List[dict]:
+        for key, value in request.query_params.multi_items():
+            if key in ('select', 'order', 'limit', 'offset'):
+                continue
+            if key in ('or', 'and'):
+                rows = [row for row in rows if logical(row, value, any if key == 'or' else all)]
+                continue
+            op, _, operand = value.partition('.')
+            rows = [row for row in rows if matches(row, key, op, operand)]
+        if 'order' in request.query_params:
+            for column in reversed(request.query_params['order'].split(',')):
+                name, _, direction = column.partition('.')
+                rows = sorted(rows, key=lambda row: str(row.get(name, '')), reverse=direction == 'desc')
+        if 'limit' in request.query_params:
+            rows = rows[:int(request.query_params['limit'])]
+        return rows
+
+    @upstream('supabase')
+    async def supabase_root(request: Request):
+        return JSONResponse({'swagger': '2.0'})
+
+    @upstream('supabase')
+    async def supabase_table(request: Request):
+        table = tables.setdefault(request.path_params['table'], [])
+        if request.method == 'GET':
+            return JSONResponse(postgrest_filter(request, table))
+        if request.method == 'POST':
+            payload = await request.json()
+            row = {'id': str(next(ids)), **payload, 'updated_at': datetime.now(timezone.utc).isoformat()}
+            table.append(row)
+            return JSONResponse([row], status_code=201)
+        matched = postgrest_filter(request, table)
+        if request.method == 'PATCH':
+            payload = await request.json()
+            for row in matched:
+                row.update(payload, updated_at=datetime.now(timezone.utc).isoformat())
+            return JSONResponse(matched)
+        if request.method == 'DELETE':
+            for row in matched:
+                table.remove(row)
+            return JSONResponse(matched)
+        return Response(status_code=405)
+
+    # ---------- Notion ----------
+
+    @upstream('notion')
+    async def notion_pages(request: Request):
+        payload = await request.json()
+        title = payload.get('properties', {}).get('Title', {}).get('title', [{}])[0].get('text', {}).get('content', '')
+        return JSONResponse(notion_page(f"page-{next(ids)}", title))
+
+    @upstream('notion')
+    async def notion_page_update(request: Request):
+        return JSONResponse(notion_page(request.path_params['page_id'], 'Updated'))
+
+    @upstream('notion')
+    async def notion_query(request: Request):
+        payload = await request.json() if await request.body() else {}
+        page_size = min(int(payload.get('page_size', 100)), 100)
+        results = [notion_page(f"page-{event['id']}", event['title']) for event in tables['events'][:page_size]]
+        return JSONResponse({'object': 'list', 'results': results, 'next_cursor': None, 'has_more': False})
+
+    @upstream('notion')
+    async def notion_me(request: Request):
+        return JSONResponse({'object': 'user', 'id': 'bot', 'type': 'bot'})
+
+    # ---------- GitHub ----------
+
+    def etagged(request: Request, body) -> Response:
+        raw = json.dumps(body).encode()
+        etag = '"' + hashlib.sha1(raw).hexdigest() + '"'
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers={'ETag': etag})
+        return Response(raw, media_type='application/json', headers={'ETag': etag})
+
+    @upstream('github')
+    async def github_issues(request: Request):
+        if request.method == 'POST':
+            payload = await request.json()
+            number = next(ids)
+            return JSONResponse({'id': number, 'number': number, 'title': payload.get('title'),
+                                 'state': 'open', 'html_url': f'https://github.com/mock/issues/{number}',
+                                 'labels': [], 'user': {'login': 'mock'}, 'body': payload.get('body')},
+                                status_code=201)
+        issues = [{'number': i, 'title': f'Issue {i}', 'state': 'open', 'labels': []} for i in range(1, 31)]
+        return etagged(request, issues)
+
+    @upstream('github')
+    async def github_dispatch(request: Request):
+        return Response(status_code=204)
+
+    @upstream('github')
+    async def github_runs(request: Request):
+        return etagged(request, {'total_count': 1, 'workflow_runs': [
+            {'id': 1, 'status': 'completed', 'conclusion': 'success', 'head_branch': 'main'}
+        ]})
+
+    @upstream('github')
+    async def github_rate_limit(request: Request):
+        return JSONResponse({'resources': {'core': {'limit': 5000, 'remaining': 4999}}})
+
+    # ---------- Metricool ----------
+
+    @upstream('metricool')
+    async def metricool_brands(request: Request):
+        return JSONResponse({'brands': [{'id': str(i), 'label': f'Brand {i}'} for i in range(1, 6)]})
+
+    @upstream('metricool')
+    async def metricool_posts(request: Request):
+        payload = await request.json()
+        return JSONResponse({'id': str(next(ids)), **payload, 'status': 'scheduled'}, status_code=201)
+
+    # ---------- n8n ----------
+
+    @upstream('n8n')
+    async def n8n_webhook(request: Request):
+        return JSONResponse({'status': 'ok', 'workflow': request.path_params['workflow']})
+
+    async def n8n_health(request: Request):
+        return JSONResponse({'status': 'ok'})
+
+    async def mock_stats(request: Request):
+        return JSONResponse(counters)
+
+    return Starlette(routes=[
+        Route('/_stats', mock_stats),
+        Mount('/supabase', routes=[
+            Route('/rest/v1/', supabase_root),
+            Route('/rest/v1/{table}', supabase_table, methods=['GET', 'POST', 'PATCH', 'DELETE']),
+        ]),
+        Mount('/notion', routes=[
+            Route('/v1/pages', notion_pages, methods=['POST']),
+            Route('/v1/pages/{page_id}', notion_page_update, methods=['PATCH']),
+            Route('/v1/databases/{database_id}/query', notion_query, methods=['POST']),
+            Route('/v1/users/me', notion_me),
+        ]),
+        Mount('/github', routes=[
+            Route('/repos/{owner}/{repo}/issues', github_issues, methods=['GET', 'POST']),
+            Route('/repos/{owner}/{repo}/actions/workflows/{workflow}/dispatches', github_dispatch, methods=['POST']),
+            Route('/repos/{owner}/{repo}/actions/workflows/{workflow}/runs', github_runs),
+            Route('/rate_limit', github_rate_limit),
+        ]),
+        Mount('/metricool', routes=[
+            Route('/v1/brands', metricool_brands),
+            Route('/v1/posts', metricool_posts, methods=['POST']),
+        ]),
+        Route('/n8n/webhook/{workflow}', n8n_webhook, methods=['POST']),
+        Route('/n8n/healthz', n8n_health),
+        # The server derives the n8n health URL from the webhook host, without the path prefix
+        Route('/healthz', n8n_health),
+    ])
+
+
+def server_env(base_url: str) -> Dict[str, str]:
+    """Environment that points the MCP server at the stand-ins"""
+    return {
+        'SUPABASE_URL': f'{base_url}/supabase',
+        'SUPABASE_ANON_KEY': 'benchmark-anon-key',
+        'NOTION_API_URL': f'{base_url}/notion',
+        'NOTION_TOKEN': 'benchmark-notion-token',
+        'NOTION_EVENTS_DATABASE_ID': 'mock-events-db',
+        'GITHUB_API_URL': f'{base_url}/github',
+        'GITHUB_TOKEN': 'benchmark-github-token',
+        'METRICOOL_API_URL': f'{base_url}/metricool',
+        'METRICOOL_API_KEY': 'benchmark-metricool-key',
+        'N8N_WEBHOOK_URL': f'{base_url}/n8n/webhook',
+        'STANDUP_ENV': 'benchmark',
+    }
+
+
+def _parse_overrides(values: List[str], flag: str) -> Dict[str, float]:
+    overrides = {}
+    for value in values or []:
+        name, _, number = value.partition('=')
+        if name not in UPSTREAMS or not number:
+            raise SystemExit(f"{flag} expects <upstream>=<number> with upstream in {', '.join(UPSTREAMS)}")
+        overrides[name] = float(number)
+    return overrides
+
+
+def main(argv: List[str] = None) -> None:
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve local Supabase/Notion/GitHub/Metricool/n8n stand-ins")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--latency', action='append', metavar='UPSTREAM=SECONDS',
+                        help='Mean response latency per upstream (default 0.05s)')
+    parser.add_argument('--error-rate', action='append', metavar='UPSTREAM=P',
+                        help='Probability of an injected 503')
+    parser.add_argument('--throttle-rate', action='append', metavar='UPSTREAM=P',
+                        help='Probability of an injected 429 with Retry-After')
+    args = parser.parse_args(argv)
+
+    config = MockConfig()
+    for name, value in _parse_overrides(args.latency, '--latency').items():
+        config.behaviours[name].latency = value
+    for name, value in _parse_overrides(args.error_rate, '--error-rate').items():
+        config.behaviours[name].error_rate = value
+    for name, value in _parse_overrides(args.throttle_rate, '--throttle-rate').items():
+        config.behaviours[name].throttle_rate = value
+
+    uvicorn.run(build_app(config), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
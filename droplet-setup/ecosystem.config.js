@@ -1,21 +1,37 @@
+// MCP server processes behind nginx; each listens on 8000 + i and shares cache,
+// rate limits and the job table through SQLite in /opt/services/fastmcp/data.
+// nginx only routes to the ports listed by nginx-mcp-upstream.sh: run it with the same MCP_WORKERS.
+const MCP_WORKERS = parseInt(process.env.MCP_WORKERS || '2', 10);
+
+const mcpWorkers = Array.from({ length: MCP_WORKERS }, (_, i) => {
+  const port = 8000 + i;
+  return {
+    name: MCP_WORKERS > 1 ? `standupsydney-mcp-${i}` : 'standupsydney-mcp',
+    script: '/opt/services/fastmcp/venv/bin/python',
+    args: '/opt/services/fastmcp/server.py',
+    cwd: '/opt/services/fastmcp',
+    env: {
+      NODE_ENV: 'production',
+      MCP_HOST: '127.0.0.1',
+      MCP_PORT: String(port),
+      MCP_WORKERS: String(MCP_WORKERS),
+      MCP_WORKER_ID: String(i),
+      // SSE message posts must reach the worker holding the session; nginx routes on this prefix
+      FASTMCP_MESSAGE_PATH: `/mcp/w${port}/messages/`
+    },
+    log_file: `/opt/services/fastmcp/logs/combined-${i}.log`,
+    out_file: `/opt/services/fastmcp/logs/out-${i}.log`,
+    error_file: `/opt/services/fastmcp/logs/error-${i}.log`,
+    time: true,
+    autorestart: true,
+    max_restarts: 10,
+    restart_delay: 5000
+  };
+});
+
 module.exports = {
   apps: [
-    {
-      name: 'standupsydney-mcp',
-      script: '/opt/services/fastmcp/venv/bin/python',
-      args: '/opt/services/fastmcp/server.py',
-      cwd: '/opt/services/fastmcp',
-      env: {
-        NODE_ENV: 'production'
-      },
-      log_file: '/opt/services/fastmcp/logs/combined.log',
-      out_file: '/opt/services/fastmcp/logs/out.log',
-      error_file: '/opt/services/fastmcp/logs/error.log',
-      time: true,
-      autorestart: true,
-      max_restarts: 10,
-      restart_delay: 5000
-    },
+    ...mcpWorkers,
     {
       name: 'n8n-automation',
       script: 'n8n',
@@ -0,0 +1,33 @@
+#!/bin/bash
+# nginx-mcp-upstream.sh
+# Writes the nginx upstream for the MCP workers started by ecosystem.config.js.
+# Both read MCP_WORKERS (default 2, ports 8000 + i), so rerun this whenever the
+# worker count changes:  MCP_WORKERS=3 ./nginx-mcp-upstream.sh && pm2 reload ecosystem.config.js
+
+set -e  # Exit on any error
+
+MCP_WORKERS="${MCP_WORKERS:-2}"
+UPSTREAM_CONF="${UPSTREAM_CONF:-/etc/nginx/conf.d/standupsydney-mcp-upstream.conf}"
+
+if ! [[ "$MCP_WORKERS" =~ ^[1-9][0-9]?$ ]]; then
+    echo "❌ MCP_WORKERS must be between 1 and 99, got '$MCP_WORKERS'" >&2
+    exit 1
+fi
+
+{
+    echo "# Generated by nginx-mcp-upstream.sh for MCP_WORKERS=$MCP_WORKERS - do not edit"
+    echo "upstream standupsydney_mcp {"
+    echo "    least_conn;"
+    for ((i = 0; i < MCP_WORKERS; i++)); do
+        echo "    server 127.0.0.1:$((8000 + i));"
+    done
+    echo "}"
+} | sudo tee "$UPSTREAM_CONF" > /dev/null
+
+echo "✅ nginx upstream written to $UPSTREAM_CONF ($MCP_WORKERS workers, ports 8000-$((8000 + MCP_WORKERS - 1)))"
+
+# Only reload once the site config is installed (first run happens before it is copied)
+if [ -e /etc/nginx/sites-enabled/standupsydney ]; then
+    sudo nginx -t
+    sudo systemctl reload nginx
+fi
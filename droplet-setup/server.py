@@ -4,31 +4,375 @@ Stand Up Sydney MCP Server
 Consolidated MCP server with all business tools
 """
 
-import os
+import time
+
+# Taken before the imports below so the startup report includes them
+STARTUP_BEGAN = time.perf_counter()
+
 import json
 import asyncio
+import socket
+import threading
 import httpx
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
 from fastmcp import FastMCP, Context
 from dotenv import load_dotenv
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from standup_mcp.cache import ReadCache, make_key
+from standup_mcp.conditional import ConditionalCache
+from standup_mcp.jobs import JobQueue
+from standup_mcp.metrics import ToolMetrics
+from standup_mcp.notion_sync import NotionEventSync, NotionPageIndex
+from standup_mcp.projection import shape
+from standup_mcp.ratelimit import RateLimiterRegistry, jittered_backoff, parse_retry_after
+from standup_mcp.replica import LocalReplica
+from standup_mcp.resilience import BreakerRegistry, DeadlineExceeded, compensated, remaining, with_deadline
+from standup_mcp.serialization import encode_result, json_body, parse
+from standup_mcp.settings import Settings
+from standup_mcp.shared_store import SharedStore
+
+# Seconds since STARTUP_BEGAN at which each startup phase finished (see _report_first_connection)
+STARTUP = {'imports': round(time.perf_counter() - STARTUP_BEGAN, 3)}
 
-# Load environment variables
+# Load environment variables, then read and validate every setting once
 load_dotenv()
+settings = Settings.from_env()
+
+# ========================================
+# INSTRUMENTATION
+# ========================================
+
+tool_metrics = ToolMetrics(
+    measure_payloads=settings.metrics_payload_sizes
+)
+
+# Every tool call runs under a deadline that nested tool calls and upstream requests inherit
+TOOL_DEADLINE_SECONDS = settings.tool_deadline_seconds
+
+def tool_deadline(name: str) -> float:
+    """Deadline for one tool, overridable per tool via MCP_TOOL_DEADLINE_<TOOL_NAME>"""
+    return settings.tool_deadline(name)
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP whose @mcp.tool() registrations are instrumented, run under a per-tool deadline
+    and return pre-encoded JSON to the client"""
+    
+    def tool(self, *args, **kwargs):
+        register = super().tool(*args, **kwargs)
+    
+        def decorator(fn):
+            return register(tool_metrics.instrument(encode_result(with_deadline(fn, tool_deadline))))
+    
+        return decorator
+
+@asynccontextmanager
+async def server_lifespan(server):
+    """Start the job workers when the server boots, so jobs left in SQLite by a restart are resumed"""
+    # Idempotent, and deliberately not stopped on exit: some SDK versions enter this once per session
+    await job_queue.start()
+    yield
 
 # Initialize FastMCP server
-mcp = FastMCP(
+mcp = InstrumentedFastMCP(
     "Stand Up Sydney MCP Server",
+    lifespan=server_lifespan,
     dependencies=[
         "httpx", 
-        "psycopg2-binary", 
         "python-dotenv",
-        "playwright",
-        "asyncio",
-        "aiofiles"
+        "orjson"
     ]
 )
 
+# ========================================
+# SHARED STATE
+# ========================================
+
+# Number of server processes behind nginx (see ecosystem.config.js); with more than one,
+# cache entries, invalidations and upstream rate limits are shared through SQLite
+MCP_WORKERS = settings.workers
+MCP_WORKER_ID = settings.worker_id
+
+shared_store = None
+if MCP_WORKERS > 1 or settings.shared_state:
+    shared_store = SharedStore(
+        settings.shared_state_db,
+        # Short: workers waiting on each other's writes give up (cache) or retry later (rate tokens)
+        busy_timeout_ms=settings.shared_state_busy_ms,
+        # Larger results are only cached per process
+        max_entry_bytes=settings.shared_cache_max_kb * 1024
+    )
+
+# ========================================
+# READ CACHE
+# ========================================
+
+# Per-namespace TTLs in seconds; Supabase tables not listed here are never cached
+READ_CACHE_TTLS = {
+    'supabase:events': settings.cache_ttl_events,
+    'supabase:comedians': settings.cache_ttl_comedians,
+    'metricool:brands': settings.cache_ttl_metricool_brands,
+    'notion:query': settings.cache_ttl_notion_query,
+    # Deep health results are shared so frequent load balancer probes don't hammer upstreams
+    'health:deep': settings.health_cache_seconds,
+}
+
+read_cache = ReadCache(
+    max_entries=settings.cache_max_entries,
+    default_ttl=0,
+    ttls=READ_CACHE_TTLS,
+    store=shared_store
+)
+
+# ========================================
+# LOCAL REPLICA
+# ========================================
+
+# Optional in-process copy of the tables the business tools read, refreshed by updated_at delta pulls.
+# Tables map to the columns indexed for equality lookups (id is always indexed).
+REPLICA_TABLES = {
+    'events': [],
+    'bookings': ['event_id', 'comedian_id'],
+    'comedians': [],
+}
+
+def _replica_generations(table: str) -> tuple:
+    """Shared (writes, deletes) generations of a replicated table"""
+    return (shared_store.generation(f"supabase:{table}"),
+            shared_store.generation(f"replica-deletes:{table}"))
+
+local_replica = None
+if settings.replica_enabled:
+    local_replica = LocalReplica(
+        fetch_page=lambda table, params: _fetch_supabase_page(table, params),
+        tables=REPLICA_TABLES,
+        db_path=settings.replica_db,
+        watermark_column=settings.replica_watermark_column,
+        sync_interval=settings.replica_sync_seconds,
+        full_sync_interval=settings.replica_full_sync_seconds,
+        max_staleness=settings.replica_max_staleness,
+        # Each worker has its own replica: other workers' writes are seen through the shared generations
+        generations=_replica_generations if shared_store is not None else None
+    )
+
+async def _replica_apply(table: str, rows, deleted: bool = False) -> None:
+    """Mirror a Supabase write (already invalidated in read_cache) into the local replica"""
+    if local_replica is None or not local_replica.replicates(table):
+        return
+    rows = rows if isinstance(rows, list) else [rows]
+    if deleted:
+        ids = [row['id'] for row in rows if isinstance(row, dict) and 'id' in row]
+        local_replica.delete(table, ids)
+        deleted = bool(ids)
+        if deleted and shared_store is not None:
+            # Delta pulls can't see deletions, so this makes other workers' replicas resync in full
+            await asyncio.to_thread(shared_store.bump_generation, f"replica-deletes:{table}")
+    else:
+        local_replica.upsert(table, [row for row in rows if isinstance(row, dict)])
+    if shared_store is not None:
+        # The write is already applied here: only other workers' writes should force a resync
+        local_replica.acknowledge(table, await asyncio.to_thread(_replica_generations, table), deleted=deleted)
+
+# ========================================
+# BACKGROUND JOB QUEUE
+# ========================================
+
+# Slow outbound side-effects run here; tools return a job id immediately when background=True
+job_queue = JobQueue(
+    db_path=settings.jobs_db,
+    workers=settings.job_workers,
+    max_attempts=settings.job_max_attempts
+)
+
+# ========================================
+# NOTION EVENT SYNC
+# ========================================
+
+# Supabase events -> Notion events database reconciler (standup_sync_notion_events). Pages are
+# matched on NOTION_EVENTS_ID_PROPERTY (a text property holding the event id) when the database
+# has one, otherwise on title + date until the reconciler has linked them in its index.
+notion_event_sync = NotionEventSync(
+    index=NotionPageIndex(settings.notion_sync_db),
+    fetch_events=lambda params: _fetch_supabase_page('events', params),
+    query_notion=lambda body: _query_notion_pages(settings.notion_events_database_id, body),
+    create_page=lambda properties: _create_notion_page(settings.notion_events_database_id, properties),
+    update_page=lambda page_id, properties: _update_notion_page(page_id, properties),
+    properties_for=lambda event_data: _event_notion_properties(event_data),
+    id_property=settings.notion_events_id_property,
+    watermark_column=settings.notion_sync_watermark_column,
+    batch_size=settings.notion_sync_batch_size
+)
+
+# ========================================
+# UPSTREAM HTTP
+# ========================================
+
+def _upstream_limit(service: str, rate: float, concurrency: int) -> dict:
+    """Rate (requests/second) and concurrency for an upstream, overridable via env"""
+    return {
+        'rate': settings.rate_limits.get(service, rate),
+        'concurrency': settings.concurrency_limits.get(service, concurrency)
+    }
+
+UPSTREAM_LIMITS = {
+    # Notion allows an average of 3 requests/second per integration
+    'notion': _upstream_limit('notion', 3, 3),
+    # GitHub secondary limits punish bursts of concurrent content-creating requests
+    'github': _upstream_limit('github', 5, 5),
+    'metricool': _upstream_limit('metricool', 2, 2),
+    'supabase': _upstream_limit('supabase', 50, 20),
+    'n8n': _upstream_limit('n8n', 20, 10),
+}
+
+# Rates are global across workers; each worker gets its share of the concurrency limit
+upstream_limiters = RateLimiterRegistry(UPSTREAM_LIMITS, store=shared_store, workers=MCP_WORKERS)
+
+UPSTREAM_MAX_ATTEMPTS = settings.upstream_max_attempts
+# Longer Retry-After values (e.g. an exhausted hourly quota) fail fast instead of stalling every caller
+UPSTREAM_MAX_RETRY_AFTER = settings.upstream_max_retry_after
+
+# Upstream base URLs (overridable so benchmarks can point the server at local stand-ins)
+NOTION_API_URL = settings.notion_api_url
+GITHUB_API_URL = settings.github_api_url
+METRICOOL_API_URL = settings.metricool_api_url
+
+_IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+# Per-request timeout (further capped by the calling tool's remaining deadline)
+UPSTREAM_TIMEOUT_SECONDS = settings.upstream_timeout_seconds
+UPSTREAM_TIMEOUTS = {
+    service: settings.upstream_timeouts.get(service, UPSTREAM_TIMEOUT_SECONDS)
+    for service in UPSTREAM_LIMITS
+}
+
+# Consecutive transport errors / timeouts / 5xx open an upstream's circuit so callers fail fast
+upstream_breakers = BreakerRegistry(
+    failure_threshold=settings.breaker_failure_threshold,
+    recovery_timeout=settings.breaker_recovery_seconds
+)
+
+_http_client = None
+
+def http_client() -> httpx.AsyncClient:
+    """Shared connection-pooled HTTP client for all upstream calls"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _http_client
+
+def _rate_limited_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to back off if the response is an upstream rate-limit rejection, else None"""
+    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+    if response.status_code == 429:
+        return retry_after if retry_after is not None else jittered_backoff(attempt)
+    if response.status_code in (403, 503) and retry_after is not None:
+        # GitHub secondary rate limits answer 403 + Retry-After; Notion may answer 503
+        return retry_after
+    if response.status_code == 403 and response.headers.get('X-RateLimit-Remaining') == '0':
+        reset = response.headers.get('X-RateLimit-Reset')
+        return max(0.0, float(reset) - time.time()) if reset else None
+    return None
+
+async def upstream_request(service: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request through the per-upstream rate limiter with Retry-After aware retries
+
+    Rate-limit rejections are retried for every method (the upstream did not
+    process them); transport errors are only retried for idempotent methods.
+    Open circuits raise CircuitOpenError immediately, and no attempt or retry
+    wait is started past the calling tool's deadline.
+    """
+    limiter = upstream_limiters.get(service)
+    breaker = upstream_breakers.get(service)
+    method = method.upper()
+    
+    for attempt in range(1, UPSTREAM_MAX_ATTEMPTS + 1):
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceeded(f"{service} request not sent: tool deadline exceeded")
+        timeout = UPSTREAM_TIMEOUTS.get(service, UPSTREAM_TIMEOUT_SECONDS)
+        if left is not None:
+            timeout = min(timeout, left)
+    
+        breaker.before_call()
+        try:
+            async with limiter.slot():
+                started = time.perf_counter()
+                try:
+                    response = await http_client().request(method, url, timeout=timeout, **kwargs)
+                except httpx.TransportError:
+                    tool_metrics.observe_upstream(service, method, 'transport_error', time.perf_counter() - started)
+                    raise
+                tool_metrics.observe_upstream(
+                    service, method, str(response.status_code),
+                    time.perf_counter() - started, len(response.content)
+                )
+        except httpx.TransportError:
+            breaker.record_failure()
+            limiter.counters['errors'] += 1
+            if method not in _IDEMPOTENT_METHODS or attempt == UPSTREAM_MAX_ATTEMPTS:
+                raise
+            backoff = jittered_backoff(attempt)
+            left = remaining()
+            if left is not None and backoff >= left:
+                raise
+            limiter.counters['retries'] += 1
+            await asyncio.sleep(backoff)
+            continue
+        except BaseException:
+            # Cancelled (deadline or client gone) before an outcome: not the upstream's fault
+            breaker.release()
+            raise
+    
+        delay = _rate_limited_delay(response, attempt)
+        if delay is None:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return response
+        breaker.release()
+        left = remaining()
+        if attempt == UPSTREAM_MAX_ATTEMPTS or delay > UPSTREAM_MAX_RETRY_AFTER or (left is not None and delay >= left):
+            limiter.counters['throttled'] += 1
+            return response
+        # Pausing the shared bucket holds back every caller, not just this one
+        await limiter.throttled(delay)
+        limiter.counters['retries'] += 1
+    
+    return response
+
+# ========================================
+# CONDITIONAL REQUEST CACHE
+# ========================================
+
+# Validators + bodies for repeat reads; a 304 from GitHub does not count against the rate limit
+conditional_cache = ConditionalCache(
+    max_entries=settings.conditional_cache_entries,
+    max_bytes=settings.conditional_cache_mb * 1024 * 1024
+)
+
+async def conditional_get(service: str, url: str, headers: dict) -> httpx.Response:
+    """GET with If-None-Match / If-Modified-Since; a 304 is answered from the stored body"""
+    response, cached = await conditional_cache.fetch(
+        conditional_cache.key(url, headers),
+        lambda validators: upstream_request(service, 'GET', url, headers={**headers, **validators})
+    )
+    
+    if cached is not None:
+        return httpx.Response(
+            200,
+            content=cached,
+            headers={'Content-Type': 'application/json', 'X-MCP-Cache': 'revalidated'},
+            request=response.request
+        )
+    return response
+
 # ========================================
 # SUPABASE TOOLS
 # ========================================
@@ -38,8 +382,22 @@ async def query_supabase(table: str, filters: dict = None, ctx: Context = None)
     """Query Supabase database table with optional filters"""
     await ctx.info(f"Querying Supabase table: {table}")
     
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    if local_replica is not None and local_replica.replicates(table):
+        local_replica.start()
+        rows = local_replica.select(table, filters)
+        if rows is not None:
+            return rows
+    
+    return await read_cache.get_or_load(
+        f"supabase:{table}",
+        make_key(filters),
+        lambda: _fetch_supabase(table, filters)
+    )
+
+async def _fetch_supabase(table: str, filters: dict = None) -> list:
+    """Fetch rows from Supabase, bypassing the read cache"""
+    supabase_url = settings.supabase_url
+    supabase_key = settings.supabase_anon_key
     
     headers = {
         'apikey': supabase_key,
@@ -56,20 +414,59 @@ async def query_supabase(table: str, filters: dict = None, ctx: Context = None)
         if params:
             url += "?" + "&".join(params)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Supabase query failed: {response.status_code} - {response.text}")
+    response = await upstream_request('supabase', 'GET', url, headers=headers)
+    if response.status_code == 200:
+        return json_body(response)
+    else:
+        raise Exception(f"Supabase query failed: {response.status_code} - {response.text}")
+
+async def _fetch_supabase_page(table: str, params: dict) -> list:
+    """Fetch rows with raw PostgREST query parameters (used by the replica's delta pulls)"""
+    supabase_url = settings.supabase_url
+    supabase_key = settings.supabase_anon_key
+    
+    headers = {
+        'apikey': supabase_key,
+        'Authorization': f'Bearer {supabase_key}'
+    }
+    
+    response = await upstream_request('supabase', 'GET', f"{supabase_url}/rest/v1/{table}", headers=headers, params=params)
+    if response.status_code == 200:
+        return json_body(response)
+    else:
+        raise Exception(f"Supabase page fetch failed: {response.status_code} - {response.text}")
+
+# Values per in.(...) filter; keeps request URLs well under proxy limits with UUID keys
+SUPABASE_IN_CHUNK = settings.supabase_in_chunk
+
+async def _select_in(table: str, column: str, values) -> list:
+    """Rows whose column matches any of the values, in one set-based query per chunk (replica first)"""
+    values = list(dict.fromkeys(str(value) for value in values if value is not None))
+    if not values:
+        return []
+    
+    if local_replica is not None and local_replica.replicates(table):
+        local_replica.start()
+        rows = local_replica.select_in(table, column, values)
+        if rows is not None:
+            return rows
+    
+    async def _load() -> list:
+        chunks = [values[i:i + SUPABASE_IN_CHUNK] for i in range(0, len(values), SUPABASE_IN_CHUNK)]
+        pages = await asyncio.gather(*[
+            _fetch_supabase_page(table, {column: f"in.({','.join(chunk)})"}) for chunk in chunks
+        ])
+        return [row for page in pages for row in page]
+    
+    return await read_cache.get_or_load(f"supabase:{table}", make_key(column, 'in', sorted(values)), _load)
 
 @mcp.tool()
 async def insert_supabase(table: str, data: dict, ctx: Context = None) -> dict:
     """Insert data into Supabase table"""
     await ctx.info(f"Inserting into Supabase table: {table}")
     
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    supabase_url = settings.supabase_url
+    supabase_key = settings.supabase_anon_key
     
     headers = {
         'apikey': supabase_key,
@@ -80,20 +477,22 @@ async def insert_supabase(table: str, data: dict, ctx: Context = None) -> dict:
     
     url = f"{supabase_url}/rest/v1/{table}"
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=data)
-        if response.status_code in [200, 201]:
-            return response.json()
-        else:
-            raise Exception(f"Supabase insert failed: {response.status_code} - {response.text}")
+    response = await upstream_request('supabase', 'POST', url, headers=headers, json=data)
+    if response.status_code in [200, 201]:
+        await read_cache.invalidate(f"supabase:{table}")
+        rows = json_body(response)
+        await _replica_apply(table, rows)
+        return rows
+    else:
+        raise Exception(f"Supabase insert failed: {response.status_code} - {response.text}")
 
 @mcp.tool()
 async def update_supabase(table: str, filters: dict, data: dict, ctx: Context = None) -> dict:
     """Update data in Supabase table"""
     await ctx.info(f"Updating Supabase table: {table}")
     
-    supabase_url = os.getenv('SUPABASE_URL')
-    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    supabase_url = settings.supabase_url
+    supabase_key = settings.supabase_anon_key
     
     headers = {
         'apikey': supabase_key,
@@ -109,23 +508,51 @@ async def update_supabase(table: str, filters: dict, data: dict, ctx: Context =
     
     url = f"{supabase_url}/rest/v1/{table}?" + "&".join(params)
     
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(url, headers=headers, json=data)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Supabase update failed: {response.status_code} - {response.text}")
+    response = await upstream_request('supabase', 'PATCH', url, headers=headers, json=data)
+    if response.status_code == 200:
+        await read_cache.invalidate(f"supabase:{table}")
+        rows = json_body(response)
+        await _replica_apply(table, rows)
+        return rows
+    else:
+        raise Exception(f"Supabase update failed: {response.status_code} - {response.text}")
+
+async def _delete_supabase(table: str, filters: dict) -> list:
+    """Delete rows from Supabase table (used to roll back partial writes)"""
+    supabase_url = settings.supabase_url
+    supabase_key = settings.supabase_anon_key
+    
+    headers = {
+        'apikey': supabase_key,
+        'Authorization': f'Bearer {supabase_key}',
+        'Prefer': 'return=representation'
+    }
+    
+    params = []
+    for key, value in filters.items():
+        params.append(f"{key}=eq.{value}")
+    
+    url = f"{supabase_url}/rest/v1/{table}?" + "&".join(params)
+    
+    response = await upstream_request('supabase', 'DELETE', url, headers=headers)
+    if response.status_code in [200, 204]:
+        await read_cache.invalidate(f"supabase:{table}")
+        deleted = json_body(response) if response.content else []
+        await _replica_apply(table, deleted, deleted=True)
+        return deleted
+    else:
+        raise Exception(f"Supabase delete failed: {response.status_code} - {response.text}")
 
 # ========================================
 # GITHUB TOOLS
 # ========================================
 
 @mcp.tool()
-async def github_create_issue(repo: str, title: str, body: str, labels: list = None, ctx: Context = None) -> dict:
-    """Create GitHub issue in repository"""
+async def github_create_issue(repo: str, title: str, body: str, labels: list = None, fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
+    """Create GitHub issue in repository (compact=False or `fields` for more of the issue object)"""
     await ctx.info(f"Creating GitHub issue: {title}")
     
-    github_token = os.getenv('GITHUB_TOKEN')
+    github_token = settings.github_token
     headers = {
         'Authorization': f'token {github_token}',
         'Accept': 'application/vnd.github.v3+json'
@@ -137,23 +564,73 @@ async def github_create_issue(repo: str, title: str, body: str, labels: list = N
         'labels': labels or []
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"https://api.github.com/repos/{repo}/issues",
-            headers=headers,
-            json=data
-        )
-        if response.status_code == 201:
-            return response.json()
-        else:
-            raise Exception(f"GitHub issue creation failed: {response.status_code}")
+    response = await upstream_request(
+        'github', 'POST',
+        f"{GITHUB_API_URL}/repos/{repo}/issues",
+        headers=headers,
+        json=data
+    )
+    if response.status_code == 201:
+        return shape('github_issue', json_body(response), fields, compact)
+    else:
+        raise Exception(f"GitHub issue creation failed: {response.status_code}")
+
+@mcp.tool()
+async def github_list_issues(repo: str, state: str = "open", labels: str = None, page: int = 1, per_page: int = 100, fields: list = None, compact: bool = True, ctx: Context = None) -> list:
+    """List GitHub issues in repository, one page at a time (unchanged pages are revalidated via ETag)"""
+    await ctx.info(f"Listing GitHub issues for {repo}")
+    
+    github_token = settings.github_token
+    headers = {
+        'Authorization': f'token {github_token}',
+        'Accept': 'application/vnd.github.v3+json'
+    }
+    
+    url = f"{GITHUB_API_URL}/repos/{repo}/issues?state={state}&per_page={min(per_page, 100)}&page={page}"
+    if labels:
+        url += f"&labels={labels}"
+    
+    response = await conditional_get('github', url, headers)
+    if response.status_code == 200:
+        return shape('github_issues', json_body(response), fields, compact)
+    else:
+        raise Exception(f"GitHub issue listing failed: {response.status_code}")
 
 @mcp.tool()
-async def github_deploy_trigger(repo: str, branch: str = "main", environment: str = "production", ctx: Context = None) -> dict:
-    """Trigger GitHub Actions deployment workflow"""
+async def github_deploy_status(repo: str, branch: str = "main", fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
+    """Get recent runs of the deploy workflow (unchanged results are revalidated via ETag)"""
+    await ctx.info(f"Checking deployment status for {repo}:{branch}")
+    
+    github_token = settings.github_token
+    headers = {
+        'Authorization': f'token {github_token}',
+        'Accept': 'application/vnd.github.v3+json'
+    }
+    
+    response = await conditional_get(
+        'github',
+        f"{GITHUB_API_URL}/repos/{repo}/actions/workflows/deploy.yml/runs?branch={branch}&per_page=5",
+        headers
+    )
+    if response.status_code == 200:
+        return shape('github_workflow_runs', json_body(response), fields, compact)
+    else:
+        raise Exception(f"GitHub deploy status request failed: {response.status_code}")
+
+@mcp.tool()
+async def github_deploy_trigger(repo: str, branch: str = "main", environment: str = "production", background: bool = False, ctx: Context = None) -> dict:
+    """Trigger GitHub Actions deployment workflow (background=True returns a job id immediately)"""
     await ctx.info(f"Triggering deployment for {repo}:{branch}")
     
-    github_token = os.getenv('GITHUB_TOKEN')
+    if background:
+        job_id = await job_queue.enqueue('github_deploy_trigger', {'repo': repo, 'branch': branch, 'environment': environment})
+        return {"status": "queued", "job_id": job_id}
+    
+    return await _trigger_github_deploy(repo, branch, environment)
+
+async def _trigger_github_deploy(repo: str, branch: str = "main", environment: str = "production") -> dict:
+    """Dispatch the deploy workflow (shared by the tool and the job queue)"""
+    github_token = settings.github_token
     headers = {
         'Authorization': f'token {github_token}',
         'Accept': 'application/vnd.github.v3+json'
@@ -166,10 +643,10 @@ async def github_deploy_trigger(repo: str, branch: str = "main", environment: st
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"https://api.github.com/repos/{repo}/actions/workflows/deploy.yml/dispatches",
-            headers=headers,
-            json=data
-        )
-        return {"status": "triggered", "repo": repo, "branch": branch}
+    response = await upstream_request(
+        'github', 'POST',
+        f"{GITHUB_API_URL}/repos/{repo}/actions/workflows/deploy.yml/dispatches",
+        headers=headers,
+        json=data
+    )
+    return {"status": "triggered", "repo": repo, "branch": branch}
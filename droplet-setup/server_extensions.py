@@ -3,11 +3,23 @@
 # ========================================
 
 @mcp.tool()
-async def notion_create_page(database_id: str, properties: dict, content: str = "", ctx: Context = None) -> dict:
-    """Create page in Notion database"""
+async def notion_create_page(database_id: str, properties: dict, content: str = "", background: bool = False, fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
+    """Create page in Notion database (background=True returns a job id immediately)"""
     await ctx.info(f"Creating Notion page in database: {database_id}")
     
-    notion_token = os.getenv('NOTION_TOKEN')
+    if background:
+        job_id = await job_queue.enqueue(
+            'notion_create_page',
+            {'database_id': database_id, 'properties': properties, 'content': content}
+        )
+        return {"status": "queued", "job_id": job_id}
+    
+    page = await _create_notion_page(database_id, properties, content)
+    return shape('notion_page', page, fields, compact)
+
+async def _create_notion_page(database_id: str, properties: dict, content: str = "") -> dict:
+    """Create a Notion page without a request context (safe for background tasks)"""
+    notion_token = settings.notion_token
     headers = {
         'Authorization': f'Bearer {notion_token}',
         'Content-Type': 'application/json',
@@ -35,50 +47,125 @@ async def notion_create_page(database_id: str, properties: dict, content: str =
             }
         ]
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.notion.com/v1/pages",
-            headers=headers,
-            json=data
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Notion page creation failed: {response.status_code} - {response.text}")
+    response = await upstream_request(
+        'notion', 'POST',
+        f"{NOTION_API_URL}/v1/pages",
+        headers=headers,
+        json=data
+    )
+    if response.status_code == 200:
+        await read_cache.invalidate('notion:query')
+        return json_body(response)
+    else:
+        raise Exception(f"Notion page creation failed: {response.status_code} - {response.text}")
+
+async def _archive_notion_page(page_id: str) -> dict:
+    """Archive a Notion page (used to roll back partial writes)"""
+    notion_token = settings.notion_token
+    headers = {
+        'Authorization': f'Bearer {notion_token}',
+        'Content-Type': 'application/json',
+        'Notion-Version': '2022-06-28'
+    }
+    
+    response = await upstream_request(
+        'notion', 'PATCH',
+        f"{NOTION_API_URL}/v1/pages/{page_id}",
+        headers=headers,
+        json={'archived': True}
+    )
+    if response.status_code == 200:
+        await read_cache.invalidate('notion:query')
+        return json_body(response)
+    else:
+        raise Exception(f"Notion page archive failed: {response.status_code} - {response.text}")
 
 @mcp.tool()
-async def notion_query_database(database_id: str, filter_conditions: dict = None, ctx: Context = None) -> dict:
-    """Query Notion database with optional filters"""
+async def notion_query_database(database_id: str, filter_conditions: dict = None, page_size: int = 100, start_cursor: str = None, fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
+    """Query Notion database with optional filters; pass back next_cursor as start_cursor for the next page"""
     await ctx.info(f"Querying Notion database: {database_id}")
     
-    notion_token = os.getenv('NOTION_TOKEN')
+    result = await read_cache.get_or_load(
+        'notion:query',
+        make_key(database_id, filter_conditions, page_size, start_cursor),
+        lambda: _fetch_notion_query(database_id, filter_conditions, page_size, start_cursor)
+    )
+    return shape('notion_query', result, fields, compact)
+
+# Notion has no ETags, so stored query results are revalidated with a last_edited_time probe.
+# Archived pages don't show up in that probe, so results are fully refetched after this age.
+NOTION_REVALIDATE_MAX_AGE = settings.notion_revalidate_max_age
+
+def _notion_validator_timestamp() -> str:
+    """Revalidation watermark: Notion rounds last_edited_time to the minute, so step back one"""
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=1)
+    return now.isoformat()
+
+async def _notion_database_changed_since(database_id: str, since: str, headers: dict) -> bool:
+    """True if any page in the database was edited at or after `since`"""
+    response = await upstream_request(
+        'notion', 'POST',
+        f"{NOTION_API_URL}/v1/databases/{database_id}/query",
+        headers=headers,
+        json={
+            'filter': {'timestamp': 'last_edited_time', 'last_edited_time': {'on_or_after': since}},
+            'page_size': 1
+        }
+    )
+    if response.status_code != 200:
+        return True
+    return bool(json_body(response).get('results'))
+
+async def _fetch_notion_query(database_id: str, filter_conditions: dict = None, page_size: int = 100, start_cursor: str = None) -> dict:
+    """Query a Notion database, bypassing the read cache"""
+    notion_token = settings.notion_token
     headers = {
         'Authorization': f'Bearer {notion_token}',
         'Content-Type': 'application/json',
         'Notion-Version': '2022-06-28'
     }
     
-    data = {}
+    data = {'page_size': min(page_size, 100)}
     if filter_conditions:
         data['filter'] = filter_conditions
+    if start_cursor:
+        data['start_cursor'] = start_cursor
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"https://api.notion.com/v1/databases/{database_id}/query",
-            headers=headers,
-            json=data
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Notion database query failed: {response.status_code} - {response.text}")
+    cache_key = conditional_cache.key(
+        f"notion:query:{database_id}:{make_key(filter_conditions, data['page_size'], start_cursor)}", headers
+    )
+    entry = conditional_cache.get(cache_key)
+    validated_at = _notion_validator_timestamp()
+    if entry is not None and time.time() - entry.stored_at < NOTION_REVALIDATE_MAX_AGE:
+        if not await _notion_database_changed_since(database_id, entry.validated_at, headers):
+            conditional_cache.record(revalidated=True)
+            entry.validated_at = validated_at
+            return parse(entry.body)
+    
+    response = await upstream_request(
+        'notion', 'POST',
+        f"{NOTION_API_URL}/v1/databases/{database_id}/query",
+        headers=headers,
+        json=data
+    )
+    if response.status_code == 200:
+        conditional_cache.record(revalidated=False)
+        conditional_cache.store(cache_key, response.content, validated_at=validated_at)
+        return json_body(response)
+    else:
+        raise Exception(f"Notion database query failed: {response.status_code} - {response.text}")
 
 @mcp.tool()
-async def notion_update_page(page_id: str, properties: dict, ctx: Context = None) -> dict:
+async def notion_update_page(page_id: str, properties: dict, fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
     """Update Notion page properties"""
     await ctx.info(f"Updating Notion page: {page_id}")
     
-    notion_token = os.getenv('NOTION_TOKEN')
+    page = await _update_notion_page(page_id, properties)
+    return shape('notion_page', page, fields, compact)
+
+async def _update_notion_page(page_id: str, properties: dict) -> dict:
+    """Update Notion page properties without a request context"""
+    notion_token = settings.notion_token
     headers = {
         'Authorization': f'Bearer {notion_token}',
         'Content-Type': 'application/json',
@@ -87,48 +174,89 @@ async def notion_update_page(page_id: str, properties: dict, ctx: Context = None
     
     data = {'properties': properties}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(
-            f"https://api.notion.com/v1/pages/{page_id}",
-            headers=headers,
-            json=data
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Notion page update failed: {response.status_code} - {response.text}")
+    response = await upstream_request(
+        'notion', 'PATCH',
+        f"{NOTION_API_URL}/v1/pages/{page_id}",
+        headers=headers,
+        json=data
+    )
+    if response.status_code == 200:
+        await read_cache.invalidate('notion:query')
+        return json_body(response)
+    else:
+        raise Exception(f"Notion page update failed: {response.status_code} - {response.text}")
+
+async def _query_notion_pages(database_id: str, body: dict) -> dict:
+    """One page of a Notion database query, bypassing both caches (used for bulk scans)"""
+    notion_token = settings.notion_token
+    headers = {
+        'Authorization': f'Bearer {notion_token}',
+        'Content-Type': 'application/json',
+        'Notion-Version': '2022-06-28'
+    }
+    
+    response = await upstream_request(
+        'notion', 'POST',
+        f"{NOTION_API_URL}/v1/databases/{database_id}/query",
+        headers=headers,
+        json=body
+    )
+    if response.status_code == 200:
+        return json_body(response)
+    else:
+        raise Exception(f"Notion database query failed: {response.status_code} - {response.text}")
 
 # ========================================
 # METRICOOL TOOLS
 # ========================================
 
 @mcp.tool()
-async def metricool_get_brands(ctx: Context = None) -> dict:
+async def metricool_get_brands(fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
     """Get list of brands from Metricool account"""
     await ctx.info("Getting Metricool brands")
     
-    metricool_api_key = os.getenv('METRICOOL_API_KEY')
+    brands = await read_cache.get_or_load('metricool:brands', 'all', _fetch_metricool_brands)
+    return shape('metricool_brands', brands, fields, compact)
+
+async def _fetch_metricool_brands() -> dict:
+    """Fetch Metricool brands, bypassing the read cache"""
+    metricool_api_key = settings.metricool_api_key
     headers = {
         'X-API-KEY': metricool_api_key,
         'Content-Type': 'application/json'
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            "https://api.metricool.com/v1/brands",
-            headers=headers
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Metricool brands request failed: {response.status_code}")
+    response = await upstream_request(
+        'metricool', 'GET',
+        f"{METRICOOL_API_URL}/v1/brands",
+        headers=headers
+    )
+    if response.status_code == 200:
+        return json_body(response)
+    else:
+        raise Exception(f"Metricool brands request failed: {response.status_code}")
 
 @mcp.tool()
-async def metricool_schedule_post(brand_id: str, text: str, social_networks: list, scheduled_time: str, ctx: Context = None) -> dict:
-    """Schedule a post through Metricool"""
+async def metricool_schedule_post(brand_id: str, text: str, social_networks: list, scheduled_time: str, background: bool = False, fields: list = None, compact: bool = True, ctx: Context = None) -> dict:
+    """Schedule a post through Metricool (background=True returns a job id immediately)"""
     await ctx.info(f"Scheduling Metricool post for brand: {brand_id}")
     
-    metricool_api_key = os.getenv('METRICOOL_API_KEY')
+    payload = {
+        'brand_id': brand_id,
+        'text': text,
+        'social_networks': social_networks,
+        'scheduled_time': scheduled_time
+    }
+    if background:
+        job_id = await job_queue.enqueue('metricool_schedule_post', payload)
+        return {"status": "queued", "job_id": job_id}
+    
+    post = await _schedule_metricool_post(**payload)
+    return shape('metricool_post', post, fields, compact)
+
+async def _schedule_metricool_post(brand_id: str, text: str, social_networks: list, scheduled_time: str) -> dict:
+    """Schedule a Metricool post (shared by the tool and the job queue)"""
+    metricool_api_key = settings.metricool_api_key
     headers = {
         'X-API-KEY': metricool_api_key,
         'Content-Type': 'application/json'
@@ -141,32 +269,24 @@ async def metricool_schedule_post(brand_id: str, text: str, social_networks: lis
         'brand_id': brand_id
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.metricool.com/v1/posts",
-            headers=headers,
-            json=data
-        )
-        if response.status_code == 201:
-            return response.json()
-        else:
-            raise Exception(f"Metricool post scheduling failed: {response.status_code}")
+    response = await upstream_request(
+        'metricool', 'POST',
+        f"{METRICOOL_API_URL}/v1/posts",
+        headers=headers,
+        json=data
+    )
+    if response.status_code == 201:
+        return json_body(response)
+    else:
+        raise Exception(f"Metricool post scheduling failed: {response.status_code}")
 
 # ========================================
 # STAND UP SYDNEY BUSINESS TOOLS
 # ========================================
 
-@mcp.tool()
-async def standup_create_event(event_data: dict, ctx: Context = None) -> dict:
-    """Create a new Stand Up Sydney comedy event"""
-    await ctx.info(f"Creating Stand Up Sydney event: {event_data.get('title', 'Untitled')}")
-    
-    # Insert into Supabase events table
-    event_record = await insert_supabase('events', event_data, ctx)
-    
-    # Create corresponding Notion page
-    notion_events_db = os.getenv('NOTION_EVENTS_DATABASE_ID')
-    notion_properties = {
+def _event_notion_properties(event_data: dict) -> dict:
+    """Map a Supabase event record onto the Notion events database schema"""
+    return {
         'Title': {
             'title': [
                 {
@@ -188,12 +308,79 @@ async def standup_create_event(event_data: dict, ctx: Context = None) -> dict:
             'select': {'name': event_data.get('status', 'Planning')}
         }
     }
+
+# Rollbacks run after the tool's own deadline may have passed, so they get a budget of their own
+EVENT_ROLLBACK_SECONDS = 10.0
+
+async def _delete_created_event(rows) -> None:
+    """Roll back the Supabase insert of standup_create_event"""
+    # PostgREST returns the inserted rows as a list with return=representation
+    created = rows[0] if isinstance(rows, list) and rows else rows
+    event_id = created.get('id') if isinstance(created, dict) else None
+    if event_id is not None:
+        await _delete_supabase('events', {'id': event_id})
+
+@mcp.tool()
+async def standup_create_event(event_data: dict, wait_for_notion: bool = True, ctx: Context = None) -> dict:
+    """Create a new Stand Up Sydney comedy event
+
+    Supabase insert and Notion page creation run concurrently. If either write
+    fails, or the call is cancelled or runs out of time, the one that succeeded
+    is rolled back. With wait_for_notion=False the
+    tool returns once the Supabase record exists and queues the Notion sync as a
+    background job (Supabase is the system of record, so that job is not rolled back).
+    """
+    event_title = event_data.get('title', 'Untitled')
+    await ctx.info(f"Creating Stand Up Sydney event: {event_title}")
+    
+    notion_events_db = settings.notion_events_database_id
+    notion_properties = _event_notion_properties(event_data)
+    
+    if not wait_for_notion:
+        # Fire-and-forget: only the system-of-record write blocks the caller
+        event_record = await insert_supabase('events', event_data, ctx)
+        job_id = await job_queue.enqueue(
+            'notion_create_page',
+            {'database_id': notion_events_db, 'properties': notion_properties, 'content': ''}
+        )
+        return {
+            'supabase_record': event_record,
+            'notion_page': None,
+            'notion_sync': {'status': 'queued', 'job_id': job_id},
+            'status': 'created'
+        }
+    
+    results, rollback_errors = await compensated(
+        {
+            'Supabase': insert_supabase('events', event_data, ctx),
+            'Notion': _create_notion_page(notion_events_db, notion_properties)
+        },
+        {
+            'Supabase': _delete_created_event,
+            'Notion': lambda page: _archive_notion_page(page['id'])
+        },
+        undo_seconds=EVENT_ROLLBACK_SECONDS
+    )
+    event_result, notion_result = results['Supabase'], results['Notion']
+    
+    event_failed = isinstance(event_result, BaseException)
+    notion_failed = isinstance(notion_result, BaseException)
+    
+    if event_failed and notion_failed:
+        raise Exception(f"Event creation failed: Supabase: {event_result}; Notion: {notion_result}")
     
-    notion_page = await notion_create_page(notion_events_db, notion_properties, "", ctx)
+    if event_failed or notion_failed:
+        # The leg that succeeded has already been rolled back (or the rollback failed)
+        kept = 'Notion' if event_failed else 'Supabase'
+        if kept in rollback_errors:
+            await ctx.info(f"{kept} rollback failed: {rollback_errors[kept]}")
+        else:
+            await ctx.info(f"{'Supabase' if event_failed else 'Notion'} write failed, {kept} write rolled back")
+        raise Exception(f"Event creation failed: {event_result if event_failed else notion_result}")
     
     return {
-        'supabase_record': event_record,
-        'notion_page': notion_page,
+        'supabase_record': event_result,
+        'notion_page': notion_result,
         'status': 'created'
     }
 
@@ -222,6 +409,27 @@ async def standup_book_comedian(comedian_id: str, event_id: str, fee: float, ctx
         'status': 'booked'
     }
 
+def _render_lineup(event: dict, bookings: list, comedians_by_id: dict) -> dict:
+    """Lineup text for one event from already-fetched bookings and comedians"""
+    lineup_text = f"🎭 {event['title']} LINEUP 🎭\n\n"
+    for booking in bookings:
+        comedian = comedians_by_id.get(str(booking['comedian_id']))
+        if comedian:
+            lineup_text += f"• {comedian['name']}\n"
+    
+    lineup_text += f"\n📅 {event['event_date']}\n📍 {event['venue']}"
+    
+    return {
+        'lineup_text': lineup_text,
+        'event_details': event,
+        'booked_comedians': len(bookings)
+    }
+
+async def _lineup_comedians(bookings: list) -> dict:
+    """Every distinct booked comedian in one set-based query, keyed by id"""
+    comedians = await _select_in('comedians', 'id', [booking['comedian_id'] for booking in bookings])
+    return {str(comedian['id']): comedian for comedian in comedians}
+
 @mcp.tool()
 async def standup_generate_lineup(event_id: str, ctx: Context = None) -> dict:
     """Generate event lineup and promotional content"""
@@ -234,97 +442,390 @@ async def standup_generate_lineup(event_id: str, ctx: Context = None) -> dict:
     
     # Get booked comedians
     bookings = await query_supabase('bookings', {'event_id': event_id}, ctx)
+    comedians_by_id = await _lineup_comedians(bookings)
+    
+    return _render_lineup(event_data[0], bookings, comedians_by_id)
+
+@mcp.tool()
+async def standup_generate_lineups(start_date: str, end_date: str, venue: str = None, status: str = None, ctx: Context = None) -> dict:
+    """Generate lineups for every event between two dates (inclusive, YYYY-MM-DD), optionally for one venue"""
+    await ctx.info(f"Generating lineups for events {start_date} to {end_date}")
     
-    lineup_text = f"🎭 {event_data[0]['title']} LINEUP 🎭\n\n"
+    # Parsed, not interpolated as given: a ',' or ')' would add filters to the and=(...) expression
+    try:
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except ValueError:
+        raise Exception(f"Invalid date range: {start_date!r} to {end_date!r} (expected YYYY-MM-DD)")
+    if end < start:
+        raise Exception(f"Invalid date range: {start_date} is after {end_date}")
+    start_date, end_date = start.isoformat(), end.isoformat()
+    
+    # Three set-based reads regardless of how many shows fall in the window
+    params = {
+        'and': f"(event_date.gte.{start_date},event_date.lt.{(end + timedelta(days=1)).isoformat()})",
+        'order': 'event_date.asc'
+    }
+    if venue:
+        params['venue'] = f"eq.{venue}"
+    if status:
+        params['status'] = f"eq.{status}"
+    events = await _fetch_supabase_page('events', params)
+    
+    bookings = await _select_in('bookings', 'event_id', [event['id'] for event in events])
+    comedians_by_id = await _lineup_comedians(bookings)
+    
+    bookings_by_event = {}
     for booking in bookings:
-        comedian = await query_supabase('comedians', {'id': booking['comedian_id']}, ctx)
-        if comedian:
-            lineup_text += f"• {comedian[0]['name']}\n"
+        bookings_by_event.setdefault(str(booking['event_id']), []).append(booking)
     
-    lineup_text += f"\n📅 {event_data[0]['event_date']}\n📍 {event_data[0]['venue']}"
+    lineups = []
+    for event in events:
+        lineup = _render_lineup(event, bookings_by_event.get(str(event['id']), []), comedians_by_id)
+        lineup['event_id'] = event['id']
+        lineups.append(lineup)
     
     return {
-        'lineup_text': lineup_text,
-        'event_details': event_data[0],
-        'booked_comedians': len(bookings)
+        'start_date': start_date,
+        'end_date': end_date,
+        'venue': venue,
+        'events': len(lineups),
+        'lineups': lineups
     }
 
+# A foreground sync returns this many seconds before its tool deadline, reporting status 'partial'
+NOTION_SYNC_DEADLINE_MARGIN = 5.0
+
 @mcp.tool()
-async def standup_sync_n8n_webhook(workflow_name: str, data: dict, ctx: Context = None) -> dict:
-    """Trigger N8N automation workflow"""
+async def standup_sync_notion_events(full: bool = False, dry_run: bool = False, background: bool = False, ctx: Context = None) -> dict:
+    """Create/update Notion event pages for Supabase events changed since the last sync (full=True rechecks all)"""
+    await ctx.info(f"Syncing Supabase events to Notion (full={full}, dry_run={dry_run})")
+    
+    if background:
+        job_id = await job_queue.enqueue('standup_sync_notion_events', {'full': full, 'dry_run': dry_run})
+        return {"status": "queued", "job_id": job_id}
+    
+    # Progress is checkpointed, so a run cut short by the deadline continues on the next call
+    left = remaining()
+    time_budget = max(left - NOTION_SYNC_DEADLINE_MARGIN, left / 2) if left is not None else None
+    report = await notion_event_sync.run(full=full, dry_run=dry_run, time_budget=time_budget)
+    report['index'] = await notion_event_sync.stats()
+    return report
+
+async def _sync_notion_events(full: bool = False, dry_run: bool = False) -> dict:
+    """Run the Notion events reconciler to completion (background job handler)"""
+    report = await notion_event_sync.run(full=full, dry_run=dry_run)
+    if report['status'] == 'busy':
+        # Another worker is mid-sync; retrying later picks up whatever it did not cover
+        raise Exception("Notion event sync already running")
+    return report
+
+@mcp.tool()
+async def standup_sync_n8n_webhook(workflow_name: str, data: dict, background: bool = False, ctx: Context = None) -> dict:
+    """Trigger N8N automation workflow (background=True returns a job id immediately)"""
     await ctx.info(f"Triggering N8N workflow: {workflow_name}")
     
-    n8n_webhook_url = os.getenv('N8N_WEBHOOK_URL')
+    if background:
+        job_id = await job_queue.enqueue('standup_sync_n8n_webhook', {'workflow_name': workflow_name, 'data': data})
+        return {"status": "queued", "job_id": job_id}
+    
+    return await _trigger_n8n_webhook(workflow_name, data)
+
+async def _trigger_n8n_webhook(workflow_name: str, data: dict) -> dict:
+    """POST to an N8N webhook (shared by the tool and the job queue)"""
+    n8n_webhook_url = settings.n8n_webhook_url
     webhook_url = f"{n8n_webhook_url}/{workflow_name}"
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(webhook_url, json=data)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return {"status": "triggered", "workflow": workflow_name}
+    response = await upstream_request('n8n', 'POST', webhook_url, json=data)
+    if response.status_code == 200:
+        return json_body(response)
+    else:
+        return {"status": "triggered", "workflow": workflow_name}
 
 # ========================================
-# HEALTH CHECK & SERVER UTILITIES
+# BACKGROUND JOBS
 # ========================================
 
+job_queue.register('notion_create_page', _create_notion_page)
+job_queue.register('metricool_schedule_post', _schedule_metricool_post)
+job_queue.register('github_deploy_trigger', _trigger_github_deploy)
+job_queue.register('standup_sync_n8n_webhook', _trigger_n8n_webhook)
+job_queue.register('standup_sync_notion_events', _sync_notion_events)
+
 @mcp.tool()
-async def mcp_health_check(ctx: Context = None) -> dict:
-    """Check MCP server health and tool availability"""
-    await ctx.info("Performing MCP health check")
+async def job_status(job_id: str, ctx: Context = None) -> dict:
+    """Get status, attempts and result of a background job"""
+    await ctx.info(f"Looking up job: {job_id}")
     
-    # Check environment variables
-    required_env = [
-        'SUPABASE_URL', 'SUPABASE_ANON_KEY',
-        'GITHUB_TOKEN', 'NOTION_TOKEN',
-        'METRICOOL_API_KEY'
-    ]
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise Exception(f"Job {job_id} not found")
     
-    missing_env = []
-    for env_var in required_env:
-        if not os.getenv(env_var):
-            missing_env.append(env_var)
-    
-    # Test basic connectivity
-    connectivity_tests = {}
+    return job
+
+@mcp.tool()
+async def job_list(status: str = None, kind: str = None, limit: int = 50, ctx: Context = None) -> dict:
+    """List recent background jobs, optionally filtered by status or kind"""
+    await ctx.info(f"Listing jobs (status={status}, kind={kind})")
     
-    # Test Supabase
+    return {
+        'jobs': await job_queue.list(status=status, kind=kind, limit=limit),
+        'queue': await job_queue.stats()
+    }
+
+# ========================================
+# HEALTH CHECK & SERVER UTILITIES
+# ========================================
+
+# Overall budget for all upstream probes together
+HEALTH_DEADLINE_SECONDS = settings.health_deadline_seconds
+
+def _health_probes() -> dict:
+    """Map upstream name -> (url, headers, healthy status check), or None when not configured"""
+    supabase_url = settings.supabase_url
+    supabase_key = settings.supabase_anon_key
+    notion_token = settings.notion_token
+    github_token = settings.github_token
+    metricool_api_key = settings.metricool_api_key
+    n8n_webhook_url = settings.n8n_webhook_url
+    
+    probes = {
+        'supabase': None, 'notion': None, 'github': None,
+        'metricool': None, 'n8n': None
+    }
+    if supabase_url and supabase_key:
+        probes['supabase'] = (
+            f"{supabase_url}/rest/v1/",
+            {'apikey': supabase_key, 'Authorization': f'Bearer {supabase_key}'},
+            lambda status: status < 500
+        )
+    if notion_token:
+        probes['notion'] = (
+            f"{NOTION_API_URL}/v1/users/me",
+            {'Authorization': f'Bearer {notion_token}', 'Notion-Version': '2022-06-28'},
+            lambda status: status == 200
+        )
+    if github_token:
+        # /rate_limit does not count against the GitHub quota
+        probes['github'] = (
+            f"{GITHUB_API_URL}/rate_limit",
+            {'Authorization': f'token {github_token}', 'Accept': 'application/vnd.github.v3+json'},
+            lambda status: status == 200
+        )
+    if metricool_api_key:
+        probes['metricool'] = (
+            f"{METRICOOL_API_URL}/v1/brands",
+            {'X-API-KEY': metricool_api_key},
+            lambda status: status == 200
+        )
+    if n8n_webhook_url:
+        parts = urlsplit(n8n_webhook_url)
+        probes['n8n'] = (
+            f"{parts.scheme}://{parts.netloc}/healthz",
+            {},
+            lambda status: status == 200
+        )
+    return probes
+
+async def _probe_upstream(url: str, headers: dict, is_healthy) -> dict:
+    """Single connectivity probe with its own latency measurement"""
+    started = time.perf_counter()
     try:
-        supabase_url = os.getenv('SUPABASE_URL')
-        if supabase_url:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{supabase_url}/rest/v1/")
-                connectivity_tests['supabase'] = response.status_code < 500
+        response = await http_client().get(url, headers=headers, timeout=HEALTH_DEADLINE_SECONDS)
+        return {
+            'ok': is_healthy(response.status_code),
+            'status_code': response.status_code,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+    except Exception as e:
+        return {
+            'ok': False,
+            'error': f"{type(e).__name__}: {e}",
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+
+async def _deep_health() -> dict:
+    """Probe every configured upstream concurrently under one overall deadline"""
+    started = time.perf_counter()
+    connectivity = {}
+    tasks = {}
+    for name, probe in _health_probes().items():
+        if probe is None:
+            connectivity[name] = {'ok': False, 'skipped': 'missing_config'}
         else:
-            connectivity_tests['supabase'] = False
-    except:
-        connectivity_tests['supabase'] = False
+            tasks[name] = asyncio.create_task(_probe_upstream(*probe))
+    
+    if tasks:
+        done, pending = await asyncio.wait(tasks.values(), timeout=HEALTH_DEADLINE_SECONDS)
+        for task in pending:
+            task.cancel()
+        for name, task in tasks.items():
+            if task in done:
+                connectivity[name] = task.result()
+            else:
+                connectivity[name] = {'ok': False, 'error': 'deadline_exceeded', 'latency_ms': HEALTH_DEADLINE_SECONDS * 1000}
+    for name, result in connectivity.items():
+        # Probes bypass the breakers so a recovered upstream shows up before its circuit closes
+        result['circuit'] = upstream_breakers.get(name).state
     
-    health_status = {
+    return {
+        'connectivity': connectivity,
+        'checked_at': datetime.now().isoformat(),
+        'check_duration_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+
+def _liveness() -> dict:
+    """Cheap process-level health: no upstream calls"""
+    missing_env = list(settings.missing)
+    return {
         "server": "Stand Up Sydney MCP Server",
         "status": "healthy" if not missing_env else "missing_config",
         "timestamp": datetime.now().isoformat(),
         "tools_registered": len(mcp.tools),
+        "worker": {"id": MCP_WORKER_ID, "workers": MCP_WORKERS, "shared_state": shared_store is not None},
         "missing_environment": missing_env,
-        "connectivity": connectivity_tests,
-        "environment": os.getenv('STANDUP_ENV', 'development')
+        "environment": settings.environment,
+        "startup_seconds": STARTUP
     }
-    
+
+async def _health_status(deep: bool) -> dict:
+    health_status = _liveness()
+    if not deep:
+        return health_status
+    
+    deep_status = await read_cache.get_or_load('health:deep', 'all', _deep_health)
+    health_status.update(deep_status)
+    if health_status['status'] == 'healthy':
+        configured = [result for result in deep_status['connectivity'].values() if 'skipped' not in result]
+        if not all(result['ok'] for result in configured):
+            health_status['status'] = 'degraded'
+    health_status['cache'] = read_cache.stats()
     return health_status
 
+@mcp.tool()
+async def mcp_health_check(deep: bool = True, ctx: Context = None) -> dict:
+    """Check MCP server health and tool availability
+
+    deep=True probes Supabase, Notion, GitHub, Metricool and n8n concurrently
+    (result cached for MCP_HEALTH_CACHE_SECONDS); deep=False is a liveness check
+    that makes no upstream calls.
+    """
+    await ctx.info("Performing MCP health check")
+    
+    return await _health_status(deep)
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health_endpoint(request: Request) -> JSONResponse:
+    """Load balancer probe: liveness by default, cached deep check with ?deep=1"""
+    deep = request.query_params.get('deep', '').lower() in ('1', 'true', 'yes')
+    health_status = await _health_status(deep)
+    status_code = 503 if deep and health_status['status'] != 'healthy' else 200
+    return JSONResponse(health_status, status_code=status_code)
+
+@mcp.tool()
+async def mcp_rate_limit_stats(ctx: Context = None) -> dict:
+    """Report per-upstream rate limiter saturation, throttling counters and circuit breaker states"""
+    await ctx.info("Collecting upstream rate limit statistics")
+    
+    return {
+        'limits': UPSTREAM_LIMITS,
+        'upstreams': upstream_limiters.stats(),
+        'circuit_breakers': upstream_breakers.stats()
+    }
+
+@mcp.tool()
+async def mcp_cache_stats(reset: bool = False, ctx: Context = None) -> dict:
+    """Report read cache and conditional-request cache counters, optionally clearing cached entries"""
+    await ctx.info("Collecting read cache statistics")
+    
+    stats = read_cache.stats()
+    stats['conditional'] = conditional_cache.stats()
+    if local_replica is not None:
+        stats['replica'] = local_replica.stats()
+    if reset:
+        await read_cache.clear()
+    
+    return stats
+
+# ========================================
+# METRICS
+# ========================================
+
+def _runtime_metric_lines():
+    """Cache and rate limiter gauges appended to the Prometheus output"""
+    cache = read_cache.stats()
+    yield '# TYPE mcp_cache_lookups_total counter'
+    for namespace, counters in sorted(cache['namespaces'].items()):
+        for result in ('hits', 'misses', 'coalesced'):
+            yield f'mcp_cache_lookups_total{{namespace="{namespace}",result="{result}"}} {counters[result]}'
+    yield '# TYPE mcp_cache_entries gauge'
+    yield f"mcp_cache_entries {cache['entries']}"
+    
+    limiters = upstream_limiters.stats()
+    yield '# TYPE mcp_upstream_in_flight gauge'
+    for upstream, stats in sorted(limiters.items()):
+        yield f'mcp_upstream_in_flight{{upstream="{upstream}"}} {stats["in_flight"]}'
+    yield '# TYPE mcp_upstream_queued gauge'
+    for upstream, stats in sorted(limiters.items()):
+        yield f'mcp_upstream_queued{{upstream="{upstream}"}} {stats["queued"]}'
+    yield '# TYPE mcp_upstream_throttled_total counter'
+    for upstream, stats in sorted(limiters.items()):
+        yield f'mcp_upstream_throttled_total{{upstream="{upstream}"}} {stats["throttled"]}'
+    
+    yield '# TYPE mcp_startup_seconds gauge'
+    for phase, seconds in STARTUP.items():
+        yield f'mcp_startup_seconds{{phase="{phase}"}} {seconds}'
+
+tool_metrics.add_collector(_runtime_metric_lines)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint served next to the SSE transport"""
+    return PlainTextResponse(
+        tool_metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@mcp.tool()
+async def mcp_metrics(ctx: Context = None) -> dict:
+    """Report per-tool latency percentiles, error rates, upstream time share and payload sizes"""
+    await ctx.info("Collecting MCP tool metrics")
+    
+    return tool_metrics.summary()
+
 # ========================================
 # SERVER STARTUP
 # ========================================
 
+STARTUP['tools_registered'] = round(time.perf_counter() - STARTUP_BEGAN, 3)
+
+def _report_first_connection(host: str, port: int, timeout: float = 30.0) -> None:
+    """Record when the listening socket first accepts a connection (runs on a daemon thread)"""
+    probe_host = '127.0.0.1' if host in ('', '0.0.0.0') else '::1' if host == '::' else host
+    give_up = time.perf_counter() + timeout
+    while time.perf_counter() < give_up:
+        try:
+            with socket.create_connection((probe_host, port), timeout=0.5):
+                STARTUP['first_connection'] = round(time.perf_counter() - STARTUP_BEGAN, 3)
+                print(f"🚀 Accepting connections on port {port} after {STARTUP['first_connection'] * 1000:.0f} ms "
+                      f"(imports {STARTUP['imports'] * 1000:.0f} ms, tools registered at "
+                      f"{STARTUP['tools_registered'] * 1000:.0f} ms)", flush=True)
+                return
+        except OSError:
+            time.sleep(0.005)
+
 if __name__ == "__main__":
     print("🎭 Starting Stand Up Sydney MCP Server...")
     print(f"📊 Registered {len(mcp.tools)} MCP tools:")
     for tool_name in mcp.tools.keys():
         print(f"  • {tool_name}")
     
+    threading.Thread(
+        target=_report_first_connection, args=(settings.host, settings.port), daemon=True
+    ).start()
+    
     # Run the FastMCP server
     mcp.run(
         transport="sse",
-        host="0.0.0.0", 
-        port=8000
+        host=settings.host,
+        port=settings.port
     )
@@ -4,6 +4,8 @@
 
 set -e  # Exit on any error
 
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
 echo "🎭 Setting up Stand Up Sydney MCP Infrastructure..."
 
 # Phase 1: System Setup & Security
@@ -50,7 +52,7 @@ sudo chown -R $USER:$USER /opt/services
 
 # Create FastMCP project structure
 cd /opt/services/fastmcp
-mkdir -p {logs,config,tools}
+mkdir -p {logs,config,tools,data}
 
 echo "✅ Phase 2 Complete - Directories Created"
 
@@ -64,7 +66,7 @@ source venv/bin/activate
 
 # Install FastMCP and dependencies
 pip install --upgrade pip
-pip install fastmcp httpx psycopg2-binary python-dotenv asyncio aiofiles
+pip install fastmcp httpx psycopg2-binary python-dotenv asyncio aiofiles orjson
 
 # Install Playwright
 pip install playwright
@@ -89,4 +91,12 @@ EOF
 
 echo "✅ Phase 4 Complete - N8N Installed"
 
+# Phase 5: Nginx upstream for the MCP workers
+echo "🌐 Phase 5: Generating nginx upstream for MCP_WORKERS=${MCP_WORKERS:-2}..."
+
+# Must match the MCP_WORKERS that `pm2 start ecosystem.config.js` sees
+"$SCRIPT_DIR/nginx-mcp-upstream.sh"
+
+echo "✅ Phase 5 Complete - Nginx Upstream Generated"
+
 echo "🎉 Basic setup complete! Ready for FastMCP server code..."
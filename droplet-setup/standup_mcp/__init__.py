@@ -0,0 +1,4 @@
+"""
+Stand Up Sydney MCP runtime helpers
+Shared infrastructure used by server.py and server_extensions.py
+"""
@@ -0,0 +1,178 @@
+"""
+In-process async read cache
+TTL + LRU cache with in-flight request coalescing for hot MCP lookups
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from standup_mcp.shared_store import SharedStore
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable cache key from tool arguments (dicts are key-sorted)"""
+    return json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+
+
+class ReadCache:
+    """Namespaced read cache with per-namespace TTLs and a global LRU bound.
+
+    Concurrent misses for the same key share a single loader call. Values are
+    returned as stored, so callers must treat them as read-only.
+
+    With a SharedStore the cache becomes two-level and shared by worker
+    processes: local entries are validated against the store's per-namespace
+    generation, local misses fall through to the store's entries, and
+    invalidations are visible to every process. Store reads and writes run in
+    worker threads so a busy store never stalls the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 30.0,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[SharedStore] = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self._clock = clock
+        self._store = store
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, int, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._generations: Dict[str, int] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def ttl_for(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def _generation(self, namespace: str) -> int:
+        if self._store is not None:
+            return self._store.generation(namespace)
+        return self._generations.get(namespace, 0)
+
+    def _count(self, namespace: str, counter: str) -> None:
+        counters = self._counters.setdefault(
+            namespace, {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0, 'invalidations': 0}
+        )
+        counters[counter] += 1
+
+    async def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached value or load it, coalescing concurrent misses"""
+        ttl = self.ttl_for(namespace)
+        if ttl <= 0:
+            return await loader()
+
+        entry_key = (namespace, key)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            expires_at, entry_generation, value = entry
+            if expires_at > self._clock() and entry_generation == self._generation(namespace):
+                self._entries.move_to_end(entry_key)
+                self._count(namespace, 'hits')
+                return value
+            del self._entries[entry_key]
+
+        if self._store is not None:
+            shared = await asyncio.to_thread(self._store.get_entry, namespace, str(key))
+            if shared is not None:
+                value, expires_at, shared_generation = shared
+                self._store_local(entry_key, value, expires_at - time.time(), shared_generation)
+                self._count(namespace, 'hits')
+                return value
+
+        pending = self._inflight.get(entry_key)
+        if pending is not None:
+            self._count(namespace, 'coalesced')
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The caller doing the load was cancelled (e.g. its client disconnected), not this one
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.get_or_load(namespace, key, loader)
+                raise
+
+        self._count(namespace, 'misses')
+        generation = self._generation(namespace)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[entry_key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an error nobody else awaited is not logged
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # Drop results that raced with a write to the same namespace
+            if self._generation(namespace) == generation:
+                self._store_local(entry_key, value, ttl, generation)
+                if self._store is not None:
+                    await asyncio.to_thread(self._store.put_entry, namespace, str(key), value, ttl, generation)
+            return value
+        finally:
+            self._inflight.pop(entry_key, None)
+
+    def _store_local(self, entry_key: Tuple[str, Hashable], value: Any, ttl: float, generation: int) -> None:
+        self._entries[entry_key] = (self._clock() + ttl, generation, value)
+        self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            (evicted_namespace, _), _ = self._entries.popitem(last=False)
+            self._count(evicted_namespace, 'evictions')
+
+    async def invalidate(self, namespace: str, key: Optional[Hashable] = None) -> int:
+        """Drop one key, or every key in a namespace; returns entries removed"""
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        if key is not None:
+            removed = 1 if self._entries.pop((namespace, key), None) is not None else 0
+        else:
+            stale = [entry_key for entry_key in self._entries if entry_key[0] == namespace]
+            for entry_key in stale:
+                del self._entries[entry_key]
+            removed = len(stale)
+        self._count(namespace, 'invalidations')
+        if self._store is not None:
+            # Shared generations are per namespace, so other processes drop the whole namespace
+            await asyncio.to_thread(self._store.bump_generation, namespace)
+        return removed
+
+    async def clear(self) -> None:
+        for namespace in {entry_key[0] for entry_key in self._entries}:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        self._entries.clear()
+        if self._store is not None:
+            await asyncio.to_thread(self._store.clear_cache)
+
+    def stats(self) -> dict:
+        """Hit/miss counters per namespace plus overall totals"""
+        totals = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0, 'invalidations': 0}
+        namespaces = {}
+        for namespace, counters in self._counters.items():
+            lookups = counters['hits'] + counters['misses'] + counters['coalesced']
+            namespaces[namespace] = {
+                **counters,
+                'ttl_seconds': self.ttl_for(namespace),
+                'hit_ratio': round((counters['hits'] + counters['coalesced']) / lookups, 4) if lookups else 0.0,
+            }
+            for name, count in counters.items():
+                totals[name] += count
+        lookups = totals['hits'] + totals['misses'] + totals['coalesced']
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'inflight': len(self._inflight),
+            'shared': self._store is not None,
+            'shared_skipped': dict(self._store.counters) if self._store is not None else {},
+            'hit_ratio': round((totals['hits'] + totals['coalesced']) / lookups, 4) if lookups else 0.0,
+            **totals,
+            'namespaces': namespaces,
+        }
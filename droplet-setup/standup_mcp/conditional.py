@@ -0,0 +1,113 @@
+"""
+Conditional-request response cache
+Stores validators (ETag / Last-Modified / last_edited_time) and bodies so repeat reads revalidate cheaply
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def auth_scope(headers: Optional[dict]) -> str:
+    """Fingerprint of the credentials on a request, so cached bodies never leak across tokens"""
+    headers = headers or {}
+    secret = headers.get('Authorization') or headers.get('X-API-KEY') or headers.get('apikey') or ''
+    return hashlib.sha256(secret.encode()).hexdigest()[:16]
+
+
+class ConditionalEntry:
+    __slots__ = ('etag', 'last_modified', 'validated_at', 'body', 'stored_at')
+
+    def __init__(self, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 validated_at: Optional[str] = None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.validated_at = validated_at
+        self.stored_at = time.time()
+
+
+class ConditionalCache:
+    """LRU of response bodies plus their validators, bounded by entry count and total bytes"""
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, ConditionalEntry]" = OrderedDict()
+        self._bytes = 0
+        self.counters = {'revalidated': 0, 'refetched': 0, 'stored': 0, 'evictions': 0}
+
+    @staticmethod
+    def key(url: str, headers: Optional[dict]) -> str:
+        return f"{auth_scope(headers)}:{url}"
+
+    def get(self, key: str) -> Optional[ConditionalEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a cached entry (empty when uncached)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None,
+              validated_at: Optional[str] = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        self.discard(key)
+        self._entries[key] = ConditionalEntry(body, etag, last_modified, validated_at)
+        self._bytes += len(body)
+        self.counters['stored'] += 1
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self.counters['evictions'] += 1
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def record(self, revalidated: bool) -> None:
+        self.counters['revalidated' if revalidated else 'refetched'] += 1
+
+    async def fetch(self, key: str, send: Callable[[Dict[str, str]], Awaitable[Any]]) -> Tuple[Any, Optional[bytes]]:
+        """Conditional GET: send(extra_headers) makes the request with this key's validators.
+
+        Returns the response and, when it was a 304 for a stored entry, the stored body to answer
+        with instead; 200 responses carrying a validator are stored for next time.
+        """
+        response = await send(self.request_headers(key))
+        if response.status_code == 304:
+            entry = self.get(key)
+            if entry is not None:
+                self.record(revalidated=True)
+                return response, entry.body
+            # Entry was evicted between request and response; fetch unconditionally
+            response = await send({})
+        self.record(revalidated=False)
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified):
+            self.store(key, response.content, etag=etag, last_modified=last_modified)
+        return response, None
+
+    def stats(self) -> dict:
+        lookups = self.counters['revalidated'] + self.counters['refetched']
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            **self.counters,
+            'revalidation_ratio': round(self.counters['revalidated'] / lookups, 4) if lookups else 0.0,
+        }
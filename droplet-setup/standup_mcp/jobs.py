@@ -0,0 +1,295 @@
+"""
+Background job queue
+Async worker pool with SQLite persistence, retries and lease-based claims,
+so several server processes can drain the same job table
+"""
+
+import asyncio
+import contextvars
+import os
+import random
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from standup_mcp.serialization import dumps, loads
+
+JOB_STATUSES = ('queued', 'running', 'retrying', 'succeeded', 'failed')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    run_after REAL NOT NULL,
+    lease_expires REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS jobs_created_idx ON jobs (created_at);
+"""
+
+
+class JobQueue:
+    """Bounded pool of asyncio workers draining a SQLite-backed job table.
+
+    Handlers are plain coroutine functions registered per job kind and called
+    with the job payload as keyword arguments. Failed jobs are retried with
+    jittered exponential backoff until max_attempts is reached.
+
+    Workers claim due jobs straight from the table with a lease that is
+    renewed while the handler runs, so any number of processes can share one
+    database. A job whose lease lapses (its process died) is claimed again by
+    whichever worker polls next.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        workers: int = 4,
+        max_attempts: int = 3,
+        retry_base_delay: float = 2.0,
+        retry_max_delay: float = 60.0,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+    ):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # ---------- persistence ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'lease_expires' not in columns:
+                # Databases created before lease-based claims
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease_expires REAL")
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._db_lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    async def _db(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job['payload'] = loads(job['payload'])
+        job['result'] = loads(job['result']) if job['result'] is not None else None
+        return job
+
+    # ---------- lifecycle ----------
+
+    def register(self, kind: str, handler: Callable[..., Awaitable[Any]]) -> None:
+        self._handlers[kind] = handler
+
+    @property
+    def started(self) -> bool:
+        return self._wake is not None
+
+    async def start(self) -> None:
+        """Spawn workers (idempotent); unfinished jobs are picked up by polling"""
+        if self._wake is not None:
+            return
+        self._wake = asyncio.Event()
+        await self._db("SELECT 1")
+        for _ in range(self.workers):
+            # Fresh context: workers outlive the tool call that started them and must not inherit its deadline
+            self._worker_tasks.append(asyncio.create_task(self._worker(), context=contextvars.Context()))
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+        self._wake = None
+
+    # ---------- public API ----------
+
+    async def enqueue(self, kind: str, payload: dict, max_attempts: Optional[int] = None) -> str:
+        """Persist a job and hand it to the workers; returns the job id"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        await self.start()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        await self._db(
+            "INSERT INTO jobs (id, kind, payload, status, attempts, max_attempts, created_at, updated_at, run_after) "
+            "VALUES (?, ?, ?, 'queued', 0, ?, ?, ?, ?)",
+            (job_id, kind, dumps(payload).decode(), max_attempts or self.max_attempts, now, now, now),
+        )
+        self._wake.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        rows = await self._db("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._row_to_dict(rows[0]) if rows else None
+
+    async def list(self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 50) -> List[dict]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = await self._db(
+            f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [self._row_to_dict(row) for row in rows]
+
+    async def stats(self) -> dict:
+        rows = await self._db("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row['status']: row['count'] for row in rows})
+        return {
+            'workers': self.workers,
+            'running': self._running,
+            'pending': counts['queued'] + counts['retrying'],
+            'jobs': counts,
+        }
+
+    # ---------- workers ----------
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** (attempts - 1)))
+        return random.uniform(delay / 2, delay)
+
+    async def _worker(self) -> None:
+        while True:
+            claim = asyncio.ensure_future(self._claim())
+            try:
+                job = await asyncio.shield(claim)
+            except asyncio.CancelledError:
+                # The claim's UPDATE still lands in its thread: hand back whatever it leased
+                # rather than leave the job stranded until the lease runs out
+                try:
+                    job = await claim
+                    if job is not None:
+                        await self._requeue(job['id'])
+                except Exception:
+                    traceback.print_exc()
+                raise
+            except Exception:
+                traceback.print_exc()
+                job = None
+            if job is None:
+                # Idle: wait for a local enqueue, or poll for jobs from other processes and retries.
+                # asyncio.timeout rather than wait_for: on 3.11 wait_for can swallow a stop() cancel
+                try:
+                    async with asyncio.timeout(self.poll_interval):
+                        await self._wake.wait()
+                except TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                traceback.print_exc()
+
+    async def _claim(self) -> Optional[dict]:
+        """Atomically lease the oldest due job this process has a handler for"""
+        kinds = tuple(self._handlers)
+        if not kinds:
+            return None
+        now = time.time()
+        placeholders = ', '.join('?' for _ in kinds)
+        rows = await self._db(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ?, lease_expires = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE kind IN (" + placeholders + ") AND ("
+            "(status IN ('queued', 'retrying') AND run_after <= ?) "
+            "OR (status = 'running' AND COALESCE(lease_expires, 0) <= ?)"
+            ") ORDER BY run_after LIMIT 1) RETURNING *",
+            (now, now + self.lease_seconds, *kinds, now, now),
+        )
+        return self._row_to_dict(rows[0]) if rows else None
+
+    async def _requeue(self, job_id: str) -> None:
+        """Give a claimed job back without using up an attempt (e.g. on shutdown)"""
+        await self._db(
+            "UPDATE jobs SET status = 'queued', attempts = attempts - 1, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    async def _renew_lease(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await self._db(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running'",
+                (time.time() + self.lease_seconds, job_id),
+            )
+
+    async def _run(self, job: dict) -> None:
+        job_id = job['id']
+        handler = self._handlers.get(job['kind'])
+
+        self._running += 1
+        lease = asyncio.create_task(self._renew_lease(job_id))
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind: {job['kind']}")
+            result = await handler(**job['payload'])
+        except asyncio.CancelledError:
+            await self._requeue(job_id)
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if handler is not None and job['attempts'] < job['max_attempts']:
+                delay = self._backoff(job['attempts'])
+                await self._db(
+                    "UPDATE jobs SET status = 'retrying', error = ?, updated_at = ?, run_after = ?, "
+                    "lease_expires = NULL WHERE id = ?",
+                    (error, time.time(), time.time() + delay, job_id),
+                )
+            else:
+                await self._db(
+                    "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?, lease_expires = NULL WHERE id = ?",
+                    (error, time.time(), job_id),
+                )
+        else:
+            await self._db(
+                "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, updated_at = ?, "
+                "lease_expires = NULL WHERE id = ?",
+                (dumps(result).decode(), time.time(), job_id),
+            )
+        finally:
+            lease.cancel()
+            self._running -= 1
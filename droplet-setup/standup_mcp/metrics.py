@@ -0,0 +1,235 @@
+"""
+Tool-level instrumentation
+Latency histograms, in-flight gauges, upstream timings and payload sizes with Prometheus text output
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from standup_mcp.serialization import dumps
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Upstream seconds spent by the tool call currently running in this task
+_upstream_seconds: contextvars.ContextVar = contextvars.ContextVar('mcp_upstream_seconds', default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram compatible with the Prometheus exposition format"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside the matching bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bound in enumerate(self.buckets):
+            if seen + self.counts[i] >= rank:
+                within = (rank - seen) / self.counts[i] if self.counts[i] else 0.0
+                return lower + (bound - lower) * within
+            seen += self.counts[i]
+            lower = bound
+        return self.buckets[-1]
+
+    def cumulative(self) -> Iterable[Tuple[str, int]]:
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield repr(float(bound)), running
+        yield '+Inf', running + self.counts[-1]
+
+
+def _labels(**labels: Any) -> str:
+    inner = ','.join(f'{key}="{str(value)}"' for key, value in labels.items())
+    return '{' + inner + '}' if inner else ''
+
+
+class ToolMetrics:
+    """Process-wide metrics for MCP tool calls and the upstream requests they make"""
+
+    def __init__(self, measure_payloads: bool = True):
+        self.measure_payloads = measure_payloads
+        self.started_at = time.time()
+        self.tool_latency: Dict[str, Histogram] = {}
+        self.tool_upstream: Dict[str, Histogram] = {}
+        self.tool_response_bytes: Dict[str, Histogram] = {}
+        self.tool_calls: Dict[Tuple[str, str], int] = {}
+        self.tool_in_flight: Dict[str, int] = {}
+        self.upstream_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.upstream_calls: Dict[Tuple[str, str], int] = {}
+        self.upstream_response_bytes: Dict[str, int] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+
+    # ---------- recording ----------
+
+    def instrument(self, fn: Callable) -> Callable:
+        """Wrap an async tool so every call is timed and counted"""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            self.tool_in_flight[name] = self.tool_in_flight.get(name, 0) + 1
+            upstream = [0.0]
+            token = _upstream_seconds.set(upstream)
+            started = time.perf_counter()
+            status = 'ok'
+            try:
+                result = await fn(*args, **kwargs)
+                if self.measure_payloads:
+                    self._observe_payload(name, result)
+                return result
+            except asyncio.CancelledError:
+                # Client went away or the request was cancelled; not counted as a tool error
+                status = 'cancelled'
+                raise
+            except TimeoutError:
+                status = 'timeout'
+                raise
+            except BaseException:
+                status = 'error'
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                _upstream_seconds.reset(token)
+                # Nested tool calls (e.g. standup_* calling insert_supabase) roll up into the caller
+                parent = _upstream_seconds.get()
+                if parent is not None:
+                    parent[0] += upstream[0]
+                self.tool_in_flight[name] -= 1
+                self.tool_calls[(name, status)] = self.tool_calls.get((name, status), 0) + 1
+                self.tool_latency.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+                self.tool_upstream.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(upstream[0])
+
+        return wrapper
+
+    def _observe_payload(self, name: str, result: Any) -> None:
+        try:
+            # Client-facing calls already return encoded text (see serialization.encode_result)
+            size = len(result.encode()) if isinstance(result, str) else len(dumps(result))
+        except (TypeError, ValueError):
+            return
+        self.tool_response_bytes.setdefault(name, Histogram(SIZE_BUCKETS)).observe(size)
+
+    def observe_upstream(self, service: str, method: str, status: str, elapsed: float, size: int = 0) -> None:
+        """Record one upstream HTTP attempt and charge its time to the running tool"""
+        self.upstream_latency.setdefault((service, method), Histogram(LATENCY_BUCKETS)).observe(elapsed)
+        self.upstream_calls[(service, status)] = self.upstream_calls.get((service, status), 0) + 1
+        self.upstream_response_bytes[service] = self.upstream_response_bytes.get(service, 0) + size
+        current = _upstream_seconds.get()
+        if current is not None:
+            current[0] += elapsed
+
+    def add_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        """Register a callback yielding extra Prometheus lines (cache, rate limiter gauges...)"""
+        self._collectors.append(collector)
+
+    # ---------- export ----------
+
+    def summary(self) -> dict:
+        """Per-tool latency percentiles, error rates and upstream share for the MCP tool"""
+        tools = {}
+        for name, histogram in sorted(self.tool_latency.items()):
+            ok = self.tool_calls.get((name, 'ok'), 0)
+            errors = self.tool_calls.get((name, 'error'), 0) + self.tool_calls.get((name, 'timeout'), 0)
+            upstream = self.tool_upstream[name]
+            sizes = self.tool_response_bytes.get(name)
+            tools[name] = {
+                'calls': histogram.count,
+                'errors': errors,
+                'timeouts': self.tool_calls.get((name, 'timeout'), 0),
+                'cancelled': self.tool_calls.get((name, 'cancelled'), 0),
+                'error_rate': round(errors / (ok + errors), 4) if ok + errors else 0.0,
+                'in_flight': self.tool_in_flight.get(name, 0),
+                'avg_ms': round(histogram.sum / histogram.count * 1000, 2),
+                'p50_ms': round(histogram.quantile(0.5) * 1000, 2),
+                'p95_ms': round(histogram.quantile(0.95) * 1000, 2),
+                'p99_ms': round(histogram.quantile(0.99) * 1000, 2),
+                'upstream_share': round(upstream.sum / histogram.sum, 4) if histogram.sum else 0.0,
+                'avg_response_bytes': round(sizes.sum / sizes.count) if sizes and sizes.count else None,
+            }
+        upstreams = {}
+        for (service, method), histogram in sorted(self.upstream_latency.items()):
+            upstreams[f"{service} {method}"] = {
+                'calls': histogram.count,
+                'avg_ms': round(histogram.sum / histogram.count * 1000, 2),
+                'p95_ms': round(histogram.quantile(0.95) * 1000, 2),
+            }
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'tools': tools,
+            'upstreams': upstreams,
+            'upstream_status': {f"{service} {status}": count for (service, status), count in sorted(self.upstream_calls.items())},
+        }
+
+    def render_prometheus(self) -> str:
+        lines = []
+
+        def histogram_lines(metric: str, series: Dict[Any, Histogram], label_names: Tuple[str, ...]):
+            for key, histogram in sorted(series.items()):
+                values = key if isinstance(key, tuple) else (key,)
+                labels = dict(zip(label_names, values))
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{metric}_bucket{_labels(**labels, le=bound)} {count}")
+                lines.append(f"{metric}_sum{_labels(**labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{_labels(**labels)} {histogram.count}")
+
+        lines += ['# HELP mcp_tool_duration_seconds MCP tool call latency',
+                  '# TYPE mcp_tool_duration_seconds histogram']
+        histogram_lines('mcp_tool_duration_seconds', self.tool_latency, ('tool',))
+
+        lines += ['# HELP mcp_tool_upstream_seconds Time each tool call spent waiting on upstream APIs',
+                  '# TYPE mcp_tool_upstream_seconds histogram']
+        histogram_lines('mcp_tool_upstream_seconds', self.tool_upstream, ('tool',))
+
+        lines += ['# HELP mcp_tool_response_bytes Serialized size of tool results',
+                  '# TYPE mcp_tool_response_bytes histogram']
+        histogram_lines('mcp_tool_response_bytes', self.tool_response_bytes, ('tool',))
+
+        lines += ['# HELP mcp_tool_calls_total MCP tool calls by outcome',
+                  '# TYPE mcp_tool_calls_total counter']
+        for (name, status), count in sorted(self.tool_calls.items()):
+            lines.append(f"mcp_tool_calls_total{_labels(tool=name, status=status)} {count}")
+
+        lines += ['# HELP mcp_tool_in_flight MCP tool calls currently executing',
+                  '# TYPE mcp_tool_in_flight gauge']
+        for name, count in sorted(self.tool_in_flight.items()):
+            lines.append(f"mcp_tool_in_flight{_labels(tool=name)} {count}")
+
+        lines += ['# HELP mcp_upstream_request_duration_seconds Upstream HTTP request latency',
+                  '# TYPE mcp_upstream_request_duration_seconds histogram']
+        histogram_lines('mcp_upstream_request_duration_seconds', self.upstream_latency, ('upstream', 'method'))
+
+        lines += ['# HELP mcp_upstream_requests_total Upstream HTTP requests by status',
+                  '# TYPE mcp_upstream_requests_total counter']
+        for (service, status), count in sorted(self.upstream_calls.items()):
+            lines.append(f"mcp_upstream_requests_total{_labels(upstream=service, status=status)} {count}")
+
+        lines += ['# HELP mcp_upstream_response_bytes_total Bytes received from upstream APIs',
+                  '# TYPE mcp_upstream_response_bytes_total counter']
+        for service, size in sorted(self.upstream_response_bytes.items()):
+            lines.append(f"mcp_upstream_response_bytes_total{_labels(upstream=service)} {size}")
+
+        for collector in self._collectors:
+            lines.extend(collector())
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,511 @@
+"""
+Notion event sync
+Incremental Supabase events -> Notion events database reconciler backed by a persisted page-id index
+"""
+
+import asyncio
+import copy
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from standup_mcp.projection import notion_property_value
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page_id TEXT PRIMARY KEY,
+    event_id TEXT,
+    match_key TEXT,
+    notion_fp TEXT,
+    notion_edited TEXT,
+    synced_fp TEXT,
+    synced_edited TEXT
+);
+CREATE INDEX IF NOT EXISTS pages_event_idx ON pages (event_id);
+CREATE INDEX IF NOT EXISTS pages_match_idx ON pages (match_key);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+# Values per id=in.(...) lookup when re-checking individual events
+_ID_CHUNK = 100
+
+# Error messages kept in a run report
+_MAX_ERRORS = 20
+
+
+def _value(prop: dict) -> Any:
+    """Plain value of a Notion property in either read form or the write form we send"""
+    if 'type' not in prop:
+        prop = {'type': next(iter(prop)), **prop}
+    value = notion_property_value(prop)
+    if isinstance(value, str) and prop['type'] == 'date':
+        # Notion echoes dates back with a time/offset when one was given; compare the day
+        return value[:10]
+    return value
+
+
+def _fingerprint(values: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+def _validator_timestamp() -> str:
+    """Scan watermark: Notion rounds last_edited_time to the minute, so step back one"""
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=1)
+    return now.isoformat()
+
+
+class NotionPageIndex:
+    """Notion page id <-> Supabase event id map, plus what each page held when last seen or written.
+
+    Kept in SQLite so restarts (and other workers) do not need to rescan the
+    whole Notion database before the next incremental run. Every method is a
+    blocking SQLite call (another worker may hold the write lock for up to the
+    busy timeout), so NotionEventSync only calls them through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use so server startup does not touch the disk for it
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory and self.path != ':memory:':
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                                   timeout=self.busy_timeout_ms / 1000)
+            conn.row_factory = sqlite3.Row
+            if self.path != ':memory:':
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    def snapshot(self) -> 'NotionPageIndex':
+        """In-memory copy to run a dry run against, leaving this index untouched"""
+        preview = NotionPageIndex(':memory:')
+        with self._lock:
+            self._connect().backup(preview._connect())
+        return preview
+
+    # ---------- meta ----------
+
+    def get_meta(self, key: str) -> Any:
+        rows = self._execute("SELECT value FROM meta WHERE key = ?", (key,))
+        return json.loads(rows[0]['value']) if rows else None
+
+    def set_meta(self, key: str, value: Any) -> None:
+        self._execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+    # ---------- pages ----------
+
+    def find(self, event_id: str, match_key: str) -> Optional[sqlite3.Row]:
+        """The page linked to an event, else an unlinked page with the same title and date"""
+        rows = self._execute("SELECT * FROM pages WHERE event_id = ? LIMIT 1", (event_id,))
+        if rows:
+            return rows[0]
+        rows = self._execute(
+            "SELECT * FROM pages WHERE event_id IS NULL AND match_key = ? LIMIT 1", (match_key,)
+        )
+        return rows[0] if rows else None
+
+    def record_scan(self, pages: Iterable[Tuple[str, Optional[str], str, str, Optional[str]]]) -> None:
+        """(page_id, event_id, match_key, notion_fp, notion_edited) as read from Notion"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "INSERT INTO pages (page_id, event_id, match_key, notion_fp, notion_edited) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (page_id) DO UPDATE SET "
+                    # Without an id property on the page, keep the link made when it was written
+                    "event_id = COALESCE(excluded.event_id, pages.event_id), "
+                    "match_key = excluded.match_key, notion_fp = excluded.notion_fp, "
+                    "notion_edited = excluded.notion_edited",
+                    list(pages),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def record_writes(self, writes: Iterable[Tuple[str, str, str, str, Optional[str]]]) -> None:
+        """(page_id, event_id, match_key, fingerprint, edited) for pages that now hold exactly what the
+        reconciler wrote (or verified) for an event; one transaction per batch"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                for page_id, event_id, match_key, fingerprint, edited in writes:
+                    # An event maps to one page: drop a stale link left by an archived duplicate
+                    conn.execute(
+                        "UPDATE pages SET event_id = NULL WHERE event_id = ? AND page_id != ?", (event_id, page_id)
+                    )
+                    conn.execute(
+                        "INSERT INTO pages (page_id, event_id, match_key, notion_fp, notion_edited, synced_fp, "
+                        "synced_edited) VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (page_id) DO UPDATE SET "
+                        "event_id = excluded.event_id, match_key = excluded.match_key, "
+                        "notion_fp = excluded.notion_fp, notion_edited = excluded.notion_edited, "
+                        "synced_fp = excluded.synced_fp, synced_edited = excluded.synced_edited",
+                        (page_id, event_id, match_key, fingerprint, edited, fingerprint, edited),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def retain(self, page_ids: set) -> int:
+        """Forget pages a full scan no longer returned (archived or deleted in Notion)"""
+        stale = [row['page_id'] for row in self._execute("SELECT page_id FROM pages") if row['page_id'] not in page_ids]
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("DELETE FROM pages WHERE page_id = ?", [(page_id,) for page_id in stale])
+        return len(stale)
+
+    def drifted(self) -> List[str]:
+        """Events whose page changed in Notion since the reconciler last wrote or verified it"""
+        rows = self._execute(
+            "SELECT event_id FROM pages WHERE event_id IS NOT NULL AND notion_edited IS NOT synced_edited"
+        )
+        return [row['event_id'] for row in rows]
+
+    def count(self) -> Dict[str, int]:
+        row = self._execute("SELECT COUNT(*) AS pages, COUNT(event_id) AS linked FROM pages")[0]
+        return {'pages': row['pages'], 'linked': row['linked']}
+
+    # ---------- run lease ----------
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """Take (or extend) a lease so only one reconcile runs at a time across workers"""
+        now = time.time()
+        with self._lock:
+            cursor = self._connect().execute(
+                "INSERT INTO lease (name, owner, expires) VALUES (?, ?, ?) ON CONFLICT (name) DO UPDATE SET "
+                "owner = excluded.owner, expires = excluded.expires "
+                "WHERE lease.expires < ? OR lease.owner = excluded.owner",
+                (name, owner, now + ttl, now),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, name: str, owner: str) -> None:
+        self._execute("DELETE FROM lease WHERE name = ? AND owner = ?", (name, owner))
+
+
+class NotionEventSync:
+    """Bring the Notion events database in line with Supabase `events`, touching only what changed.
+
+    A run:
+      1. Scans Notion pages edited since the last scan (everything on a full
+         run) into the page index, noting pages someone else edited.
+      2. Re-checks events whose page drifted or whose write failed last time.
+      3. Pulls events whose `watermark_column` moved past the stored
+         watermark (keyset-paged on (updated_at, id)) and diffs each one
+         against the index: missing pages are created, pages whose managed
+         properties differ are updated, and the rest are skipped without a
+         Notion request.
+
+    Writes go out `batch_size` at a time through the caller's rate-limited
+    helpers. The watermark is saved after every batch, so a run that stops on
+    its time budget, an open circuit or an error resumes where it left off.
+    Events are never deleted from Notion; archived pages are forgotten on the
+    next full run and recreated if their event still exists. A dry run works
+    on an in-memory snapshot of the index, so it leaves the index, watermark
+    and retry list exactly as they were.
+    """
+
+    LEASE = 'notion_event_sync'
+
+    def __init__(
+        self,
+        index: NotionPageIndex,
+        fetch_events: Callable[[Dict[str, str]], Awaitable[List[dict]]],
+        query_notion: Callable[[dict], Awaitable[dict]],
+        create_page: Callable[[dict], Awaitable[dict]],
+        update_page: Callable[[str, dict], Awaitable[dict]],
+        properties_for: Callable[[dict], dict],
+        id_property: Optional[str] = None,
+        watermark_column: str = 'updated_at',
+        page_size: int = 1000,
+        batch_size: int = 10,
+        overlap: float = 2.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.index = index
+        self.fetch_events = fetch_events
+        self.query_notion = query_notion
+        self.create_page = create_page
+        self.update_page = update_page
+        self.properties_for = properties_for
+        self.id_property = id_property or None
+        self.watermark_column = watermark_column
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.overlap = overlap
+        self.lease_seconds = lease_seconds
+
+    # ---------- diffing ----------
+
+    @functools.cached_property
+    def managed(self) -> List[str]:
+        """Property names the reconciler owns (resolved on first use; properties_for may be defined later)"""
+        return sorted([*self.properties_for({}), *([self.id_property] if self.id_property else [])])
+
+    @functools.cached_property
+    def match_on(self) -> List[str]:
+        """Properties identifying a page that has no id property yet: its title and date"""
+        return sorted(name for name, prop in self.properties_for({}).items() if 'title' in prop or 'date' in prop)
+
+    def _desired(self, event: dict) -> dict:
+        properties = dict(self.properties_for(event))
+        if self.id_property:
+            properties[self.id_property] = {'rich_text': [{'text': {'content': str(event['id'])}}]}
+        return properties
+
+    def _match_key(self, values: Dict[str, Any]) -> str:
+        return json.dumps([str(values.get(name) or '').strip().lower() for name in self.match_on])
+
+    def _page_record(self, page: dict) -> Tuple[str, Optional[str], str, str, Optional[str]]:
+        properties = page.get('properties') or {}
+        values = {name: _value(properties[name]) if name in properties else None for name in self.managed}
+        event_id = values.get(self.id_property) if self.id_property else None
+        return (page['id'], str(event_id) if event_id else None, self._match_key(values),
+                _fingerprint(values), page.get('last_edited_time'))
+
+    def _plan(self, event: dict) -> Optional[tuple]:
+        """('create' | 'update' | 'link', ...) for one event, or None when Notion already matches"""
+        properties = self._desired(event)
+        values = {name: _value(prop) for name, prop in properties.items()}
+        fingerprint = _fingerprint(values)
+        event_id = str(event['id'])
+        match_key = self._match_key(values)
+        row = self.index.find(event_id, match_key)
+        if row is None:
+            return ('create', event_id, match_key, None, properties, fingerprint, None)
+        if row['synced_fp'] == fingerprint and row['notion_edited'] == row['synced_edited'] and row['event_id'] == event_id:
+            return None
+        if row['notion_fp'] == fingerprint:
+            # Already right in Notion (e.g. created by standup_create_event): just link it
+            return ('link', event_id, match_key, row['page_id'], properties, fingerprint, row['notion_edited'])
+        return ('update', event_id, match_key, row['page_id'], properties, fingerprint, None)
+
+    def _plan_all(self, events: List[dict]) -> List[Optional[tuple]]:
+        # Runs in a worker thread: one hop for a whole chunk of index lookups
+        return [self._plan(event) for event in events]
+
+    async def _apply(self, op: tuple) -> Tuple[str, str, str, str, Optional[str]]:
+        """Write one page; returns its index record"""
+        kind, event_id, match_key, page_id, properties, fingerprint, edited = op
+        if kind == 'create':
+            page = await self.create_page(properties)
+            page_id, edited = page['id'], page.get('last_edited_time')
+        elif kind == 'update':
+            page = await self.update_page(page_id, properties)
+            edited = page.get('last_edited_time')
+        return page_id, event_id, match_key, fingerprint, edited
+
+    def _save_meta(self, values: Dict[str, Any]) -> None:
+        # Runs in a worker thread
+        for key, value in values.items():
+            self.index.set_meta(key, value)
+
+    def _commit_batch(self, written: List[tuple], owner: str) -> None:
+        # Runs in a worker thread: record the batch and renew the run lease
+        self.index.record_writes(written)
+        self.index.acquire(self.LEASE, owner, self.lease_seconds)
+
+    async def _reconcile(self, events: List[dict], report: dict, dry_run: bool, owner: str) -> List[str]:
+        """Create/update pages for `events` in batches; returns the ids whose write failed"""
+        ops = []
+        for op in await asyncio.to_thread(self._plan_all, events):
+            report['events_checked'] += 1
+            if op is None:
+                report['unchanged'] += 1
+            else:
+                ops.append(op)
+        if dry_run:
+            for op in ops:
+                report[{'create': 'created', 'update': 'updated', 'link': 'linked'}[op[0]]] += 1
+            return []
+
+        failed = []
+        for start in range(0, len(ops), self.batch_size):
+            batch = ops[start:start + self.batch_size]
+            results = await asyncio.gather(*[self._apply(op) for op in batch], return_exceptions=True)
+            written = []
+            for op, result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    if isinstance(result, asyncio.CancelledError):
+                        raise result
+                    failed.append(op[1])
+                    report['failed'] += 1
+                    if len(report['errors']) < _MAX_ERRORS:
+                        report['errors'].append({'event_id': op[1], 'action': op[0], 'error': str(result)})
+                else:
+                    written.append(result)
+                    report[{'create': 'created', 'update': 'updated', 'link': 'linked'}[op[0]]] += 1
+            await asyncio.to_thread(self._commit_batch, written, owner)
+        return failed
+
+    # ---------- reads ----------
+
+    async def _scan_notion(self, full: bool, report: dict) -> None:
+        """Refresh the index with pages edited since the last scan (every page when full)"""
+        since = None if full else await asyncio.to_thread(self.index.get_meta, 'notion_scanned_at')
+        scanned_at = _validator_timestamp()
+        body: Dict[str, Any] = {'page_size': 100}
+        if since:
+            body['filter'] = {'timestamp': 'last_edited_time', 'last_edited_time': {'on_or_after': since}}
+        seen = set()
+        while True:
+            result = await self.query_notion(dict(body))
+            records = [self._page_record(page) for page in result.get('results', [])
+                       if not page.get('archived') and not page.get('in_trash')]
+            await asyncio.to_thread(self.index.record_scan, records)
+            seen.update(record[0] for record in records)
+            report['notion_pages_scanned'] += len(records)
+            if not result.get('has_more') or not result.get('next_cursor'):
+                break
+            body['start_cursor'] = result['next_cursor']
+        if full:
+            report['notion_pages_forgotten'] = await asyncio.to_thread(self.index.retain, seen)
+        await asyncio.to_thread(self.index.set_meta, 'notion_scanned_at', scanned_at)
+
+    async def _events_by_id(self, ids: List[str]) -> List[dict]:
+        chunks = [ids[i:i + _ID_CHUNK] for i in range(0, len(ids), _ID_CHUNK)]
+        pages = await asyncio.gather(*[
+            self.fetch_events({'id': f"in.({','.join(chunk)})"}) for chunk in chunks
+        ])
+        return [event for page in pages for event in page]
+
+    # ---------- run ----------
+
+    async def run(self, full: bool = False, dry_run: bool = False, time_budget: Optional[float] = None) -> dict:
+        """One reconcile pass; stops early (status 'partial') when time_budget seconds have passed"""
+        started = time.monotonic()
+        report = {
+            'status': 'complete', 'full': full, 'dry_run': dry_run,
+            'notion_pages_scanned': 0, 'events_checked': 0,
+            'created': 0, 'updated': 0, 'linked': 0, 'unchanged': 0, 'failed': 0, 'errors': [],
+        }
+        owner = uuid.uuid4().hex
+        if not await asyncio.to_thread(self.index.acquire, self.LEASE, owner, self.lease_seconds):
+            report['status'] = 'busy'
+            return report
+
+        try:
+            if dry_run:
+                preview = copy.copy(self)
+                preview.index = await asyncio.to_thread(self.index.snapshot)
+                return await preview._pass(full, dry_run, report, owner, started, time_budget)
+            return await self._pass(full, dry_run, report, owner, started, time_budget)
+        finally:
+            await asyncio.to_thread(self.index.release, self.LEASE, owner)
+            report['seconds'] = round(time.monotonic() - started, 2)
+
+    async def _pass(self, full: bool, dry_run: bool, report: dict, owner: str,
+                    started: float, time_budget: Optional[float]) -> dict:
+        """The reconcile pass itself, against self.index (a snapshot when previewing)"""
+        def out_of_time() -> bool:
+            return time_budget is not None and time.monotonic() - started >= time_budget
+
+        full = full or not (await asyncio.to_thread(self.index.count))['pages']
+        await self._scan_notion(full, report)
+
+        # Events whose page someone edited by hand, or whose write failed last run
+        retry = set() if full or dry_run else set(
+            await asyncio.to_thread(self.index.get_meta, 'retry_event_ids') or []
+        )
+        recheck = [] if full else sorted(set(await asyncio.to_thread(self.index.drifted)) | retry)
+        if recheck:
+            retry = set(await self._reconcile(await self._events_by_id(recheck), report, dry_run, owner))
+
+        column = self.watermark_column
+        cursor = None if full else await asyncio.to_thread(self.index.get_meta, 'events_cursor')
+        since = None
+        if cursor is not None:
+            # Start a little early to catch commits that landed out of order
+            since = (datetime.fromisoformat(cursor[0]) - timedelta(seconds=self.overlap)).isoformat()
+            cursor = None
+        chunk_size = self.batch_size * 5
+        more = True
+        while more:
+            if out_of_time():
+                report['status'] = 'partial'
+                break
+            params = {'order': f'{column}.asc,id.asc', 'limit': str(self.page_size)}
+            if cursor is not None:
+                # Keyset paging: strictly after the last (watermark, id) pair
+                mark, last_id = cursor
+                params['or'] = (f'({column}.gt.{_quote(mark)},'
+                                f'and({column}.eq.{_quote(mark)},id.gt.{_quote(last_id)}))')
+            elif since is not None:
+                params[column] = f'gte.{since}'
+            events = await self.fetch_events(params)
+            more = len(events) == self.page_size
+            for start in range(0, len(events), chunk_size):
+                if start and out_of_time():
+                    report['status'] = 'partial'
+                    more = False
+                    break
+                chunk = events[start:start + chunk_size]
+                retry.update(await self._reconcile(chunk, report, dry_run, owner))
+                if chunk[-1].get(column) is None:
+                    # Rows without a watermark can't be paged; every run is then a full pass
+                    more = False
+                    continue
+                cursor = [str(chunk[-1][column]), str(chunk[-1]['id'])]
+                if not dry_run:
+                    await asyncio.to_thread(
+                        self._save_meta, {'events_cursor': cursor, 'retry_event_ids': sorted(retry)}
+                    )
+
+        if not dry_run:
+            await asyncio.to_thread(self._save_meta, {
+                'retry_event_ids': sorted(retry),
+                'last_run': {'at': time.time(), 'status': report['status']},
+            })
+        report['watermark'] = ((await asyncio.to_thread(self.index.get_meta, 'events_cursor')) or [None])[0]
+        report['retry_pending'] = len(retry)
+        return report
+
+    async def stats(self) -> dict:
+        return await asyncio.to_thread(self._stats)
+
+    def _stats(self) -> dict:
+        return {
+            'index': self.index.count(),
+            'watermark': (self.index.get_meta('events_cursor') or [None])[0],
+            'notion_scanned_at': self.index.get_meta('notion_scanned_at'),
+            'retry_pending': len(self.index.get_meta('retry_event_ids') or []),
+            'last_run': self.index.get_meta('last_run'),
+        }
@@ -0,0 +1,226 @@
+"""
+Response projection
+Per-API compact schemas and dotted-path field selection, so tools return the
+handful of keys an agent needs instead of the full upstream JSON
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Long free text (issue bodies, post text) is cut to this many characters in compact output;
+# use compact=False (optionally with `fields`) to get it in full
+COMPACT_TEXT_LIMIT = 500
+
+def _truncate(text: Optional[str], limit: int = COMPACT_TEXT_LIMIT) -> Optional[str]:
+    if text is None or len(text) <= limit:
+        return text
+    return text[:limit] + '…'
+
+
+def select_fields(obj: Any, fields: Iterable[str]) -> Any:
+    """Keep only the given dotted paths ('user.login', 'labels.name'); lists are projected per item"""
+    if isinstance(obj, list):
+        return [select_fields(item, fields) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    # Group sub-paths by their first key so 'user.login' and 'user.id' share one nested projection
+    grouped: Dict[str, List[str]] = {}
+    for field in fields:
+        head, _, rest = field.partition('.')
+        grouped.setdefault(head, []).append(rest)
+    selected: Dict[str, Any] = {}
+    for head, rests in grouped.items():
+        if head not in obj:
+            continue
+        # A bare key wins over its own sub-paths
+        selected[head] = obj[head] if '' in rests else select_fields(obj[head], rests)
+    return selected
+
+
+# ---------- Notion ----------
+
+def _plain_text(rich_text: Optional[list]) -> str:
+    return ''.join(part.get('plain_text') or part.get('text', {}).get('content', '') for part in rich_text or [])
+
+
+def notion_property_value(prop: dict) -> Any:
+    """Collapse a Notion property object to its plain value"""
+    kind = prop.get('type')
+    value = prop.get(kind)
+    if kind in ('title', 'rich_text'):
+        return _plain_text(value)
+    if kind in ('select', 'status'):
+        return value.get('name') if value else None
+    if kind == 'multi_select':
+        return [option.get('name') for option in value or []]
+    if kind == 'date':
+        if not value:
+            return None
+        return value.get('start') if not value.get('end') else {'start': value.get('start'), 'end': value.get('end')}
+    if kind in ('people', 'created_by', 'last_edited_by'):
+        people = value if isinstance(value, list) else [value] if value else []
+        return [person.get('name') or person.get('id') for person in people]
+    if kind == 'relation':
+        return [related.get('id') for related in value or []]
+    if kind == 'files':
+        return [(f.get('file') or f.get('external') or {}).get('url') or f.get('name') for f in value or []]
+    if kind == 'formula' and value:
+        return value.get(value.get('type'))
+    if kind == 'rollup' and value:
+        inner = value.get(value.get('type'))
+        if value.get('type') == 'array':
+            return [notion_property_value(item) for item in inner or []]
+        return inner
+    if kind == 'unique_id' and value:
+        return f"{value.get('prefix')}-{value.get('number')}" if value.get('prefix') else value.get('number')
+    return value
+
+
+def compact_notion_page(page: dict) -> dict:
+    return {
+        'id': page.get('id'),
+        'url': page.get('url'),
+        'created_time': page.get('created_time'),
+        'last_edited_time': page.get('last_edited_time'),
+        'archived': page.get('archived', False),
+        'properties': {name: notion_property_value(prop) for name, prop in (page.get('properties') or {}).items()},
+    }
+
+
+def compact_notion_query(result: dict) -> dict:
+    return {
+        'results': [compact_notion_page(page) for page in result.get('results', [])],
+        'has_more': result.get('has_more', False),
+        'next_cursor': result.get('next_cursor'),
+    }
+
+
+# ---------- GitHub ----------
+
+def compact_github_issue(issue: dict) -> dict:
+    return {
+        'number': issue.get('number'),
+        'title': issue.get('title'),
+        'state': issue.get('state'),
+        'labels': [label.get('name') if isinstance(label, dict) else label for label in issue.get('labels') or []],
+        'assignees': [user.get('login') for user in issue.get('assignees') or []],
+        'author': (issue.get('user') or {}).get('login'),
+        'comments': issue.get('comments'),
+        'is_pull_request': 'pull_request' in issue,
+        'created_at': issue.get('created_at'),
+        'updated_at': issue.get('updated_at'),
+        'closed_at': issue.get('closed_at'),
+        'html_url': issue.get('html_url'),
+        'body': _truncate(issue.get('body')),
+    }
+
+
+def compact_github_workflow_runs(result: dict) -> dict:
+    return {
+        'total_count': result.get('total_count'),
+        'workflow_runs': [
+            {
+                'id': run.get('id'),
+                'run_number': run.get('run_number'),
+                'title': run.get('display_title'),
+                'status': run.get('status'),
+                'conclusion': run.get('conclusion'),
+                'branch': run.get('head_branch'),
+                'sha': run.get('head_sha'),
+                'event': run.get('event'),
+                'created_at': run.get('created_at'),
+                'updated_at': run.get('updated_at'),
+                'html_url': run.get('html_url'),
+            }
+            for run in result.get('workflow_runs', [])
+        ],
+    }
+
+
+# ---------- Metricool ----------
+
+METRICOOL_NETWORKS = ('instagram', 'facebook', 'tiktok', 'twitter', 'youtube', 'linkedin', 'threads', 'bluesky',
+                      'pinterest', 'gmb')
+
+
+def compact_metricool_brand(brand: dict) -> dict:
+    return {
+        'id': brand.get('id'),
+        'label': brand.get('label') or brand.get('title'),
+        'timezone': brand.get('timezone'),
+        'networks': {network: brand[network] for network in METRICOOL_NETWORKS if brand.get(network)},
+    }
+
+
+def compact_metricool_brands(result: Any) -> Any:
+    """Brands come back as a bare list or wrapped under 'brands' / 'data'"""
+    if isinstance(result, list):
+        return [compact_metricool_brand(brand) for brand in result]
+    for key in ('brands', 'data'):
+        if isinstance(result, dict) and isinstance(result.get(key), list):
+            return {key: [compact_metricool_brand(brand) for brand in result[key]]}
+    return result
+
+
+def compact_metricool_post(post: dict) -> dict:
+    """Scheduled post summary; empty keys are dropped since response shapes vary by API version"""
+    publication = post.get('publicationDate')
+    if isinstance(publication, dict):
+        publication, timezone = publication.get('dateTime'), publication.get('timezone')
+    else:
+        publication, timezone = publication or post.get('scheduled_time'), None
+    providers = [
+        {key: provider.get(key) for key in ('network', 'status', 'publicUrl') if provider.get(key) is not None}
+        for provider in post.get('providers') or []
+    ]
+    compact = {
+        'id': post.get('id'),
+        'uuid': post.get('uuid'),
+        'status': post.get('status'),
+        'publication_date': publication,
+        'timezone': timezone,
+        'draft': post.get('draft'),
+        'providers': providers or post.get('social_networks'),
+        'text': _truncate(post.get('text')),
+    }
+    return {key: value for key, value in compact.items() if value is not None}
+
+
+PROJECTIONS: Dict[str, Callable[[Any], Any]] = {
+    'notion_page': compact_notion_page,
+    'notion_query': compact_notion_query,
+    'github_issue': compact_github_issue,
+    'github_issues': lambda issues: [compact_github_issue(issue) for issue in issues],
+    'github_workflow_runs': compact_github_workflow_runs,
+    'metricool_brands': compact_metricool_brands,
+    'metricool_post': compact_metricool_post,
+}
+
+
+# Wrapped list responses: `fields` applies to each item, paging keys are kept
+_LIST_KEYS = {
+    'notion_query': ('results',),
+    'github_workflow_runs': ('workflow_runs',),
+    'metricool_brands': ('brands', 'data'),
+}
+_PAGING_KEYS = ('has_more', 'next_cursor', 'total_count')
+
+
+def shape(schema: str, data: Any, fields: Optional[List[str]] = None, compact: bool = True) -> Any:
+    """Apply a tool's response projection.
+
+    compact=True maps the upstream JSON through the schema's projection and
+    compact=False leaves it untouched; `fields` then narrows either result to
+    the given dotted paths (with compact=False they address the raw object,
+    e.g. the full untruncated 'body' of an issue).
+    """
+    if compact:
+        data = PROJECTIONS[schema](data)
+    if not fields:
+        return data
+    if isinstance(data, dict):
+        for key in _LIST_KEYS.get(schema, ()):
+            if isinstance(data.get(key), list):
+                shaped = {paging: data[paging] for paging in _PAGING_KEYS if paging in data}
+                shaped[key] = select_fields(data[key], fields)
+                return shaped
+    return select_fields(data, fields)
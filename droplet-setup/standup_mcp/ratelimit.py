@@ -0,0 +1,203 @@
+"""
+Per-upstream rate limiting
+Token bucket + concurrency semaphore shared by every tool that calls a third-party API
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+from standup_mcp.shared_store import SharedStore
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds to wait"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+def jittered_backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff for retry attempt N (1-based)"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in FIFO order"""
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        started = self._clock()
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if self._paused_until > now:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return self._clock() - started
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for a while (e.g. after a 429 with Retry-After)"""
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+        self._tokens = 0.0
+        self._updated = self._clock()
+
+
+class SharedTokenBucket:
+    """Token bucket whose state lives in a SharedStore, so every worker process draws from it"""
+
+    def __init__(self, store: SharedStore, name: str, rate: float, burst: float):
+        self.store = store
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        # Local lock keeps this process's waiters in FIFO order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token from the shared bucket; returns seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                wait = await asyncio.to_thread(self.store.take_token, self.name, self.rate, self.burst)
+                if wait <= 0:
+                    return time.monotonic() - started
+                # Small jitter so workers polling the same bucket don't collide
+                await asyncio.sleep(wait + random.uniform(0, min(0.05, wait)))
+
+    async def pause(self, seconds: float) -> None:
+        """Pause the bucket for every worker process (written from a worker thread)"""
+        await asyncio.to_thread(self.store.pause_bucket, self.name, seconds)
+
+
+class UpstreamLimiter:
+    """Rate + concurrency limits and saturation counters for one upstream API"""
+
+    def __init__(self, name: str, rate: float, burst: Optional[float] = None, concurrency: int = 4,
+                 store: Optional[SharedStore] = None):
+        self.name = name
+        self.concurrency = concurrency
+        burst = burst if burst is not None else max(1.0, rate)
+        if store is not None:
+            self.bucket = SharedTokenBucket(store, f"upstream:{name}", rate, burst)
+        else:
+            self.bucket = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.queued = 0
+        self.counters = {
+            'requests': 0,
+            'throttled': 0,
+            'retries': 0,
+            'errors': 0,
+        }
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a concurrency slot and a rate token for the duration of one request"""
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self.bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queued -= 1
+        waited = time.monotonic() - started
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self.counters['requests'] += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def throttled(self, retry_after: float) -> None:
+        """Record an upstream rate-limit response and back off every caller"""
+        self.counters['throttled'] += 1
+        await self.bucket.pause(retry_after)
+
+    def stats(self) -> dict:
+        requests = self.counters['requests']
+        return {
+            'rate_per_second': self.bucket.rate,
+            'burst': self.bucket.burst,
+            'concurrency': self.concurrency,
+            'in_flight': self.in_flight,
+            'queued': self.queued,
+            'saturation': round(self.in_flight / self.concurrency, 4) if self.concurrency else 0.0,
+            **self.counters,
+            'avg_wait_seconds': round(self.wait_seconds_total / requests, 4) if requests else 0.0,
+            'max_wait_seconds': round(self.wait_seconds_max, 4),
+        }
+
+
+class RateLimiterRegistry:
+    """Lazily-created limiters keyed by upstream name.
+
+    With a SharedStore, rates are enforced globally across `workers` processes
+    and each process gets an equal share of the concurrency limit, rounded down
+    so the fleet stays within it. Every process keeps at least one slot, so the
+    total exceeds the limit when there are more workers than slots.
+    """
+
+    def __init__(self, limits: Dict[str, dict], default: Optional[dict] = None,
+                 store: Optional[SharedStore] = None, workers: int = 1):
+        self.limits = limits
+        self.default = default or {'rate': 10.0, 'concurrency': 10}
+        self.store = store
+        self.workers = max(1, workers)
+        self._limiters: Dict[str, UpstreamLimiter] = {}
+
+    def get(self, name: str) -> UpstreamLimiter:
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            limits = dict(self.limits.get(name, self.default))
+            limits['concurrency'] = max(1, limits['concurrency'] // self.workers)
+            limiter = UpstreamLimiter(name, store=self.store, **limits)
+            self._limiters[name] = limiter
+        return limiter
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
@@ -0,0 +1,353 @@
+"""
+Local read replica
+Embedded SQLite copy of hot Supabase tables, kept fresh by updated_at-watermark delta pulls
+"""
+
+import asyncio
+import contextvars
+import sqlite3
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from standup_mcp.serialization import dumps, parse
+
+# fetch_page(table, params) -> rows; params are PostgREST query parameters
+FetchPage = Callable[[str, Dict[str, str]], Awaitable[List[dict]]]
+
+# generations(table) -> (writes, deletes): counters every worker bumps after writing to the table
+Generations = Callable[[str], Tuple[int, int]]
+
+
+def _text(value: Any) -> Optional[str]:
+    """Index columns hold PostgREST's text form of a value so eq filters compare the same way"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _decode_rows(rows: List[tuple]) -> List[dict]:
+    """Stored row JSON as one array: a single parse, and the bytes can be sent on unchanged"""
+    return parse(('[' + ','.join(row[0] for row in rows) + ']').encode())
+
+
+def _quote(value: str) -> str:
+    # Values inside PostgREST or=(...) containing '.', ':' or ',' must be double-quoted
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+class ReplicaTable:
+    def __init__(self, name: str, indexes: Sequence[str]):
+        self.name = name
+        self.indexes = tuple(dict.fromkeys(['id', *indexes]))
+        self.watermark: Optional[str] = None
+        self.ready = False
+        self.synced_at = 0.0
+        self.last_full_sync = 0.0
+        # (writes, deletes) generations the replica has caught up with
+        self.generation: Optional[Tuple[Optional[int], Optional[int]]] = None
+        self.resync: Optional[asyncio.Task] = None
+        self.counters = {'syncs': 0, 'sync_errors': 0, 'rows_pulled': 0, 'rows_deleted': 0,
+                         'hits': 0, 'fallbacks': 0, 'resyncs': 0}
+        self.last_error: Optional[str] = None
+
+
+class LocalReplica:
+    """In-process replica of a few Supabase tables, indexed for equality lookups.
+
+    Every `sync_interval` seconds each table pulls rows whose watermark column
+    moved past the last one seen (keyset-paged on (updated_at, id), starting
+    `overlap` seconds early to catch commits that landed out of order). A full
+    pull every `full_sync_interval` removes rows deleted upstream. Writes made
+    through the server are applied immediately via upsert()/delete().
+
+    Lookups run synchronously on the event loop: they are single indexed
+    SQLite reads. select() returns None, telling the caller to go to Supabase,
+    when a table has not finished its first sync, its last successful sync is
+    older than `max_staleness`, or a filter uses a column that is not indexed.
+
+    With `generations` (shared by every worker process) a write made by another
+    worker also makes lookups fall back, until a sync started after it has
+    finished; the sync is started straight away, and is a full one when rows
+    were deleted, since a delta pull cannot see deletions. The bump made by
+    this worker's own write is taken back with acknowledge() once the write is
+    applied locally, so it does not send lookups to Supabase.
+    """
+
+    def __init__(
+        self,
+        fetch_page: FetchPage,
+        tables: Dict[str, Sequence[str]],
+        db_path: str = ':memory:',
+        watermark_column: str = 'updated_at',
+        page_size: int = 1000,
+        sync_interval: float = 15.0,
+        full_sync_interval: float = 3600.0,
+        max_staleness: float = 120.0,
+        overlap: float = 2.0,
+        generations: Optional[Generations] = None,
+    ):
+        self.fetch_page = fetch_page
+        self.watermark_column = watermark_column
+        self.page_size = page_size
+        self.sync_interval = sync_interval
+        self.full_sync_interval = full_sync_interval
+        self.max_staleness = max_staleness
+        self.overlap = overlap
+        self.generations = generations
+        self.tables = {name: ReplicaTable(name, indexes) for name, indexes in tables.items()}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=MEMORY" if db_path == ':memory:' else "PRAGMA journal_mode=WAL")
+        for table in self.tables.values():
+            self._create(table)
+        self._task: Optional[asyncio.Task] = None
+        self._sync_locks = {name: asyncio.Lock() for name in self.tables}
+
+    # ---------- storage ----------
+
+    def _create(self, table: ReplicaTable) -> None:
+        columns = ', '.join(f'"{column}" TEXT' for column in table.indexes if column != 'id')
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table.name}" (id TEXT PRIMARY KEY, data TEXT NOT NULL, '
+            f'watermark TEXT{", " + columns if columns else ""})'
+        )
+        for column in table.indexes:
+            if column != 'id':
+                self._conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{table.name}_{column}_idx" ON "{table.name}" ("{column}")'
+                )
+        row = self._conn.execute(f'SELECT MAX(watermark) FROM "{table.name}"').fetchone()
+        table.watermark = row[0]
+
+    def _upsert_rows(self, table: ReplicaTable, rows: Iterable[dict]) -> int:
+        columns = ['id', 'data', 'watermark', *[column for column in table.indexes if column != 'id']]
+        values = [
+            (_text(row['id']), dumps(row).decode(), _text(row.get(self.watermark_column)),
+             *[_text(row.get(column)) for column in columns[3:]])
+            for row in rows if row.get('id') is not None
+        ]
+        if not values:
+            return 0
+        quoted = ', '.join(f'"{column}"' for column in columns)
+        updates = ', '.join(f'"{column}" = excluded."{column}"' for column in columns[1:])
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                f'INSERT INTO "{table.name}" ({quoted}) VALUES ({", ".join("?" for _ in columns)}) '
+                # Never let a page fetched before a local write overwrite the newer row
+                f'ON CONFLICT (id) DO UPDATE SET {updates} '
+                f'WHERE excluded.watermark IS NULL OR "{table.name}".watermark IS NULL '
+                f'OR excluded.watermark >= "{table.name}".watermark',
+                values,
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return len(values)
+
+    # ---------- public API ----------
+
+    def replicates(self, table: str) -> bool:
+        return table in self.tables
+
+    def is_fresh(self, table: str) -> bool:
+        state = self.tables.get(table)
+        return state is not None and state.ready and time.time() - state.synced_at <= self.max_staleness
+
+    def _coherent(self, state: ReplicaTable) -> bool:
+        """False (and a catch-up sync is started) when another worker wrote since the last sync"""
+        if self.generations is None:
+            return True
+        writes, deletes = self.generations(state.name)
+        if state.generation == (writes, deletes):
+            return True
+        if state.resync is None or state.resync.done():
+            full = state.generation is None or state.generation[1] != deletes
+            state.counters['resyncs'] += 1
+            state.resync = asyncio.create_task(self._resync(state.name, full), context=contextvars.Context())
+        return False
+
+    async def _resync(self, table: str, full: bool) -> None:
+        state = self.tables[table]
+        try:
+            await self.sync(table, full=full)
+        except Exception as e:
+            state.counters['sync_errors'] += 1
+            state.last_error = f"{type(e).__name__}: {e}"
+
+    def select(self, table: str, filters: Optional[dict] = None) -> Optional[List[dict]]:
+        """Rows matching equality filters, or None if the replica can't answer authoritatively"""
+        state = self.tables.get(table)
+        if state is None:
+            return None
+        filters = filters or {}
+        if (not self.is_fresh(table) or any(column not in state.indexes for column in filters)
+                or not self._coherent(state)):
+            state.counters['fallbacks'] += 1
+            return None
+        where = ' AND '.join(f'"{column}" = ?' for column in filters)
+        rows = self._conn.execute(
+            f'SELECT data FROM "{table}"{" WHERE " + where if where else ""} ORDER BY rowid',
+            tuple(_text(value) for value in filters.values()),
+        ).fetchall()
+        state.counters['hits'] += 1
+        return _decode_rows(rows)
+
+    def select_in(self, table: str, column: str, values: Iterable[Any]) -> Optional[List[dict]]:
+        """Rows whose column is any of `values` (one indexed query instead of N lookups)"""
+        state = self.tables.get(table)
+        if state is None or column not in state.indexes or not self.is_fresh(table) or not self._coherent(state):
+            if state is not None:
+                state.counters['fallbacks'] += 1
+            return None
+        wanted = list(dict.fromkeys(_text(value) for value in values))
+        if not wanted:
+            return []
+        rows = self._conn.execute(
+            f'SELECT data FROM "{table}" WHERE "{column}" IN ({", ".join("?" for _ in wanted)}) ORDER BY rowid',
+            wanted,
+        ).fetchall()
+        state.counters['hits'] += 1
+        return _decode_rows(rows)
+
+    def upsert(self, table: str, rows: Iterable[dict]) -> None:
+        """Apply rows returned by a Supabase write"""
+        state = self.tables.get(table)
+        if state is not None:
+            self._upsert_rows(state, rows)
+
+    def delete(self, table: str, ids: Iterable[Any]) -> None:
+        if table in self.tables:
+            self._conn.executemany(f'DELETE FROM "{table}" WHERE id = ?', [(_text(i),) for i in ids])
+
+    def acknowledge(self, table: str, generation: Tuple[int, int], deleted: bool = False) -> None:
+        """Catch up with the generations bumped by a write this worker made and already applied.
+
+        `generation` is the shared (writes, deletes) pair read after the write. Unless it is exactly
+        one write (and one delete, when rows were deleted) past what the replica had caught up with,
+        another worker wrote in between and the next lookup still falls back and resyncs.
+        """
+        state = self.tables.get(table)
+        if state is None or state.generation is None or None in state.generation:
+            return
+        writes, deletes = state.generation
+        if tuple(generation) == (writes + 1, deletes + 1 if deleted else deletes):
+            state.generation = (generation[0], generation[1])
+
+    # ---------- sync ----------
+
+    async def sync(self, table: str, full: bool = False) -> int:
+        """Pull rows changed since the watermark (or everything when full); returns rows pulled"""
+        state = self.tables[table]
+        async with self._sync_locks[table]:
+            started = time.time()
+            # Read before pulling: writes that land later bump it again and trigger another sync
+            generation = self.generations(table) if self.generations is not None else None
+            column = self.watermark_column
+            since = None if full else state.watermark
+            if since is not None and self.overlap:
+                since = (datetime.fromisoformat(since) - timedelta(seconds=self.overlap)).isoformat()
+            seen = set() if full else None
+            pulled = 0
+            cursor = None
+            while True:
+                params = {'order': f'{column}.asc,id.asc', 'limit': str(self.page_size)}
+                if cursor is not None:
+                    # Keyset paging: strictly after the last (watermark, id) pair, so ties never repeat or skip
+                    mark, last_id = cursor
+                    params['or'] = (f'({column}.gt.{_quote(mark)},'
+                                    f'and({column}.eq.{_quote(mark)},id.gt.{_quote(last_id)}))')
+                elif since is not None:
+                    params[column] = f'gte.{since}'
+                rows = await self.fetch_page(table, params)
+                if not rows:
+                    break
+                self._upsert_rows(state, rows)
+                pulled += len(rows)
+                if seen is not None:
+                    seen.update(_text(row['id']) for row in rows)
+                last = rows[-1]
+                if last.get(column) is None:
+                    # Without a watermark on the rows there is no keyset to page on
+                    break
+                cursor = (_text(last[column]), _text(last['id']))
+                if len(rows) < self.page_size:
+                    break
+                await asyncio.sleep(0)
+
+            if seen is not None:
+                if cursor is not None:
+                    # Rows written locally after the pull passed them are newer than its last watermark
+                    candidates = self._conn.execute(
+                        f'SELECT id FROM "{table}" WHERE watermark IS NULL OR watermark <= ?', (cursor[0],)
+                    )
+                else:
+                    # Nothing (or nothing with a watermark) upstream: everything not pulled is gone
+                    candidates = self._conn.execute(f'SELECT id FROM "{table}"')
+                stale = [row[0] for row in candidates if row[0] not in seen]
+                self.delete(table, stale)
+                state.counters['rows_deleted'] += len(stale)
+                state.last_full_sync = started
+
+            row = self._conn.execute(f'SELECT MAX(watermark) FROM "{table}"').fetchone()
+            state.watermark = row[0]
+            if generation is not None:
+                # A delta pull only catches up with writes; deletions need a full pull
+                deletes_seen = generation[1] if full else (state.generation or (None, None))[1]
+                state.generation = (generation[0], deletes_seen)
+            state.ready = True
+            state.synced_at = started
+            state.counters['syncs'] += 1
+            state.counters['rows_pulled'] += pulled
+            state.last_error = None
+            return pulled
+
+    async def sync_all(self) -> None:
+        for name, state in self.tables.items():
+            full = not state.ready or time.time() - state.last_full_sync >= self.full_sync_interval
+            try:
+                await self.sync(name, full=full)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                state.counters['sync_errors'] += 1
+                state.last_error = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+
+    async def _run(self) -> None:
+        while True:
+            await self.sync_all()
+            await asyncio.sleep(self.sync_interval)
+
+    def start(self) -> None:
+        """Start the background sync loop (idempotent; needs a running event loop)"""
+        if self._task is None or self._task.done():
+            # Fresh context so the loop does not inherit the deadline of the tool call that started it
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        now = time.time()
+        tables = {}
+        for name, state in self.tables.items():
+            count = self._conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            tables[name] = {
+                'rows': count,
+                'ready': state.ready,
+                'fresh': self.is_fresh(name),
+                'watermark': state.watermark,
+                'seconds_since_sync': round(now - state.synced_at, 1) if state.synced_at else None,
+                'indexes': list(state.indexes),
+                **state.counters,
+                'last_error': state.last_error,
+            }
+        return {'running': self._task is not None and not self._task.done(), 'tables': tables}
@@ -0,0 +1,222 @@
+"""
+Upstream resilience
+Per-upstream circuit breakers, per-tool deadlines that propagate to nested calls,
+and concurrent writes that are rolled back together
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+import traceback
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+# Absolute time.monotonic() by which the current tool call must finish; None means unbounded
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('mcp_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a tool call (or an upstream request inside it) runs out of time"""
+
+
+class CircuitOpenError(Exception):
+    """Raised without contacting an upstream whose circuit breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open after repeated failures; retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None when there is none"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@asynccontextmanager
+async def deadline(seconds: Optional[float]):
+    """Bound the enclosed block; nested deadlines can only shorten an outer one"""
+    outer = _deadline.get()
+    if seconds is None or seconds <= 0:
+        yield
+        return
+    at = time.monotonic() + seconds
+    if outer is not None:
+        at = min(at, outer)
+    token = _deadline.set(at)
+    try:
+        # The event loop clock is time.monotonic(), so the absolute deadline can be used as-is
+        async with asyncio.timeout_at(at) as scope:
+            yield
+    except TimeoutError as e:
+        if scope.expired() and not isinstance(e, DeadlineExceeded):
+            raise DeadlineExceeded(f"deadline of {seconds:g}s exceeded") from None
+        raise
+    finally:
+        _deadline.reset(token)
+
+
+def with_deadline(fn: Callable, seconds: Callable[[str], Optional[float]]) -> Callable:
+    """Wrap an async tool so each call runs under seconds(tool_name)"""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        async with deadline(seconds(name)):
+            return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+# Rollbacks still running after their caller was cancelled (the event loop only keeps weak references)
+_rollbacks: Set[asyncio.Task] = set()
+
+
+def _outcome(task: asyncio.Task) -> Any:
+    if task.cancelled():
+        return asyncio.CancelledError()
+    return task.exception() or task.result()
+
+
+async def _roll_back(tasks: Dict[str, asyncio.Task], undo: Dict[str, Callable[[Any], Awaitable]],
+                     seconds: float) -> Dict[str, Exception]:
+    # Writes still in flight when the caller was cancelled stop here; only finished ones are undone
+    for task in tasks.values():
+        task.cancel()
+    await asyncio.wait(tasks.values())
+    errors: Dict[str, Exception] = {}
+
+    async def undo_one(name: str, result: Any) -> None:
+        try:
+            async with deadline(seconds):
+                await undo[name](result)
+        except Exception as e:
+            errors[name] = e
+            traceback.print_exc()
+
+    await asyncio.gather(*[
+        undo_one(name, _outcome(task)) for name, task in tasks.items()
+        if name in undo and not isinstance(_outcome(task), BaseException)
+    ])
+    return errors
+
+
+async def compensated(writes: Dict[str, Awaitable], undo: Dict[str, Callable[[Any], Awaitable]],
+                      undo_seconds: float = 10.0) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """Run writes concurrently; if any fails, undo (undo[name](result)) the ones that succeeded.
+
+    Returns each write's result or exception, and the errors of undo steps that failed. When the
+    caller is cancelled (deadline or client gone) part-way, finished writes are undone before the
+    cancellation propagates. Undo runs in a task of its own, shielded from the caller and under a
+    fresh `undo_seconds` deadline instead of what is left of the caller's.
+    """
+    tasks = {name: asyncio.ensure_future(write) for name, write in writes.items()}
+
+    def start_rollback() -> asyncio.Task:
+        rollback = asyncio.create_task(_roll_back(tasks, undo, undo_seconds), context=contextvars.Context())
+        _rollbacks.add(rollback)
+        rollback.add_done_callback(_rollbacks.discard)
+        return rollback
+
+    try:
+        await asyncio.wait(tasks.values())
+    except asyncio.CancelledError:
+        await asyncio.shield(start_rollback())
+        raise
+    results = {name: _outcome(task) for name, task in tasks.items()}
+    if not any(isinstance(result, BaseException) for result in results.values()):
+        return results, {}
+    return results, await asyncio.shield(start_rollback())
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; open -> half-open after
+    `recovery_timeout`, where up to `half_open_max_calls` probes decide whether to close again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        self.counters = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    def before_call(self) -> None:
+        """Admit a call or raise CircuitOpenError"""
+        if self.state == 'open':
+            retry_in = self.opened_at + self.recovery_timeout - self._clock()
+            if retry_in > 0:
+                self.counters['rejected'] += 1
+                raise CircuitOpenError(self.name, retry_in)
+            self.state = 'half_open'
+            self._probes = 0
+        if self.state == 'half_open':
+            if self._probes >= self.half_open_max_calls:
+                self.counters['rejected'] += 1
+                raise CircuitOpenError(self.name, self.recovery_timeout)
+            self._probes += 1
+
+    def record_success(self) -> None:
+        self.counters['successes'] += 1
+        self.consecutive_failures = 0
+        if self.state == 'half_open':
+            self.state = 'closed'
+
+    def record_failure(self) -> None:
+        self.counters['failures'] += 1
+        self.consecutive_failures += 1
+        if self.state == 'half_open' or self.consecutive_failures >= self.failure_threshold:
+            if self.state != 'open':
+                self.counters['opened'] += 1
+            self.state = 'open'
+            self.opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot when a call ends without an outcome (e.g. cancelled)"""
+        if self.state == 'half_open' and self._probes > 0:
+            self._probes -= 1
+
+    def stats(self) -> dict:
+        retry_in = self.opened_at + self.recovery_timeout - self._clock() if self.state == 'open' else 0.0
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'retry_in_seconds': round(max(0.0, retry_in), 2),
+            **self.counters,
+        }
+
+
+class BreakerRegistry:
+    """Lazily-created circuit breakers keyed by upstream name"""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.options = {
+            'failure_threshold': failure_threshold,
+            'recovery_timeout': recovery_timeout,
+            'half_open_max_calls': half_open_max_calls,
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **self.options)
+            self._breakers[name] = breaker
+        return breaker
+
+    def stats(self) -> dict:
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
@@ -0,0 +1,113 @@
+"""
+JSON serialization
+orjson when it is installed (stdlib json otherwise), and pass-through of upstream
+bodies that reach the client without being transformed
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; everything works with the stdlib
+    orjson = None
+
+# True while a tool call is running: tools called from other tools hand back Python objects
+_in_tool_call: contextvars.ContextVar[bool] = contextvars.ContextVar('mcp_in_tool_call', default=False)
+
+
+class RawList(list):
+    """A parsed JSON array that keeps the exact bytes it was parsed from until it is modified"""
+
+    __slots__ = ('raw',)
+
+
+class RawDict(dict):
+    """A parsed JSON object that keeps the exact bytes it was parsed from until it is modified"""
+
+    __slots__ = ('raw',)
+
+
+def _drops_raw(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Modified: dumps() must encode the current contents, not the upstream bytes
+        self.raw = None
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Only the top level is tracked; values nested inside are plain lists and dicts, so copy a row
+# (dict(row)) before changing it in a result that is returned as parsed
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert',
+              'pop', 'remove', 'clear', 'sort', 'reverse'):
+    setattr(RawList, _name, _drops_raw(getattr(list, _name)))
+for _name in ('__setitem__', '__delitem__', '__ior__', 'update', 'pop', 'popitem', 'setdefault', 'clear'):
+    setattr(RawDict, _name, _drops_raw(getattr(dict, _name)))
+del _name
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse(body: bytes) -> Any:
+    """Decode an upstream body; arrays and objects remember `body` so they can be sent on as-is"""
+    value = loads(body)
+    if isinstance(value, list):
+        value = RawList(value)
+    elif isinstance(value, dict):
+        value = RawDict(value)
+    else:
+        return value
+    value.raw = body if isinstance(body, bytes) else body.encode()
+    return value
+
+
+def json_body(response) -> Any:
+    """Faster drop-in for httpx's response.json()"""
+    return parse(response.content)
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON; unmodified upstream bodies are returned without re-encoding"""
+    raw = getattr(obj, 'raw', None)
+    if raw is not None and isinstance(obj, (RawList, RawDict)):
+        return raw
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(obj, default=str, separators=(',', ':'), ensure_ascii=False).encode()
+
+
+def encode_result(fn: Callable) -> Callable:
+    """Wrap an async tool so a call from the client returns its result as JSON text.
+
+    The MCP layer sends text results as-is, so large results are encoded once by
+    dumps() (or not at all when they are an upstream body) instead of by the SDK's
+    stdlib encoder. Nested tool calls still get Python objects.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if _in_tool_call.get():
+            return await fn(*args, **kwargs)
+        token = _in_tool_call.set(True)
+        try:
+            result = await fn(*args, **kwargs)
+        finally:
+            _in_tool_call.reset(token)
+        return result if isinstance(result, str) else dumps(result).decode()
+
+    # No declared return type: the result is pre-encoded text, not a structured-output schema
+    wrapper.__signature__ = inspect.signature(fn).replace(return_annotation=inspect.Signature.empty)
+    wrapper.__annotations__ = {name: hint for name, hint in fn.__annotations__.items() if name != 'return'}
+    return wrapper
@@ -0,0 +1,241 @@
+"""
+Server settings
+Credentials, upstream URLs, limits and tuning knobs read from the environment once at startup,
+validated, and frozen
+"""
+
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Reported as missing configuration by the health checks when unset
+REQUIRED_ENV = ('SUPABASE_URL', 'SUPABASE_ANON_KEY', 'GITHUB_TOKEN', 'NOTION_TOKEN', 'METRICOOL_API_KEY')
+
+_DEADLINE_PREFIX = 'MCP_TOOL_DEADLINE_'
+_RATE_PREFIX = 'MCP_RATE_LIMIT_'
+_CONCURRENCY_PREFIX = 'MCP_CONCURRENCY_'
+_TIMEOUT_PREFIX = 'MCP_UPSTREAM_TIMEOUT_'
+
+_TRUE = ('true', '1', 'yes', 'on')
+_FALSE = ('false', '0', 'no', 'off')
+
+
+class SettingsError(ValueError):
+    """Raised at startup when the environment holds values the server cannot use"""
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Credentials and upstreams
+    supabase_url: Optional[str]
+    supabase_anon_key: Optional[str]
+    notion_token: Optional[str]
+    notion_events_database_id: Optional[str]
+    notion_events_id_property: str
+    github_token: Optional[str]
+    metricool_api_key: Optional[str]
+    n8n_webhook_url: Optional[str]
+    notion_api_url: str
+    github_api_url: str
+    metricool_api_url: str
+
+    # Listener and processes
+    host: str
+    port: int
+    environment: str
+    workers: int
+    worker_id: str
+    shared_state: bool
+    shared_state_db: str
+    shared_state_busy_ms: int
+    shared_cache_max_kb: int
+
+    # Deadlines and upstream calls
+    tool_deadline_seconds: float
+    # Per-tool overrides from MCP_TOOL_DEADLINE_<TOOL_NAME>, keyed by tool name
+    tool_deadlines: Mapping[str, float]
+    upstream_timeout_seconds: float
+    # Per-upstream overrides from MCP_UPSTREAM_TIMEOUT_<SERVICE>, MCP_RATE_LIMIT_<SERVICE> and
+    # MCP_CONCURRENCY_<SERVICE>, keyed by lower-case service name
+    upstream_timeouts: Mapping[str, float]
+    rate_limits: Mapping[str, float]
+    concurrency_limits: Mapping[str, int]
+    upstream_max_attempts: int
+    upstream_max_retry_after: float
+    breaker_failure_threshold: int
+    breaker_recovery_seconds: float
+    health_deadline_seconds: float
+
+    # Caches (a TTL of 0 disables caching for that namespace)
+    cache_ttl_events: float
+    cache_ttl_comedians: float
+    cache_ttl_metricool_brands: float
+    cache_ttl_notion_query: float
+    health_cache_seconds: float
+    cache_max_entries: int
+    conditional_cache_entries: int
+    conditional_cache_mb: int
+    notion_revalidate_max_age: float
+    supabase_in_chunk: int
+    metrics_payload_sizes: bool
+
+    # Replica, jobs and Notion sync
+    replica_enabled: bool
+    replica_db: str
+    replica_watermark_column: str
+    replica_sync_seconds: float
+    replica_full_sync_seconds: float
+    replica_max_staleness: float
+    jobs_db: str
+    job_workers: int
+    job_max_attempts: int
+    notion_sync_db: str
+    notion_sync_watermark_column: str
+    notion_sync_batch_size: int
+
+    missing: Tuple[str, ...]
+
+    def tool_deadline(self, name: str) -> float:
+        return self.tool_deadlines.get(name, self.tool_deadline_seconds)
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> 'Settings':
+        """Read and check every setting, reporting all problems at once"""
+        errors: List[str] = []
+
+        def text(name: str, default: Optional[str] = None) -> Optional[str]:
+            value = (environ.get(name) or '').strip()
+            return value or default
+
+        def url(name: str, default: Optional[str] = None) -> Optional[str]:
+            value = text(name, default)
+            if value is None:
+                return None
+            parts = urlsplit(value)
+            if parts.scheme not in ('http', 'https') or not parts.netloc:
+                errors.append(f"{name} must be an http(s) URL, got {value!r}")
+            return value.rstrip('/')
+
+        def seconds(name: str, default: float, allow_zero: bool = False, unit: str = 'seconds') -> float:
+            raw = text(name)
+            if raw is None:
+                return default
+            try:
+                value = float(raw)
+            except ValueError:
+                value = -1.0
+            if value < 0 or (value == 0 and not allow_zero) or value != value or value == float('inf'):
+                kind = 'a non-negative' if allow_zero else 'a positive'
+                errors.append(f"{name} must be {kind} number of {unit}, got {raw!r}")
+                return default
+            return value
+
+        def integer(name: str, default: int, minimum: int = 1, maximum: Optional[int] = None) -> int:
+            raw = text(name)
+            if raw is None:
+                return default
+            try:
+                value = int(raw)
+            except ValueError:
+                value = None
+            if value is None or value < minimum or (maximum is not None and value > maximum):
+                bound = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+                errors.append(f"{name} must be a whole number {bound}, got {raw!r}")
+                return default
+            return value
+
+        def flag(name: str, default: bool) -> bool:
+            raw = text(name)
+            if raw is None:
+                return default
+            if raw.lower() in _TRUE:
+                return True
+            if raw.lower() not in _FALSE:
+                errors.append(f"{name} must be true or false, got {raw!r}")
+                return default
+            return False
+
+        def overrides(prefix: str, parse, exclude: str = '') -> Mapping[str, float]:
+            return MappingProxyType({
+                name[len(prefix):].lower(): parse(name)
+                for name in environ
+                if name.startswith(prefix) and name != exclude
+            })
+
+        port = integer('MCP_PORT', 8000, maximum=65535)
+        default_deadline = seconds('MCP_TOOL_DEADLINE_SECONDS', 30.0)
+        default_timeout = seconds('MCP_UPSTREAM_TIMEOUT_SECONDS', 10.0)
+
+        settings = cls(
+            supabase_url=url('SUPABASE_URL'),
+            supabase_anon_key=text('SUPABASE_ANON_KEY'),
+            notion_token=text('NOTION_TOKEN'),
+            notion_events_database_id=text('NOTION_EVENTS_DATABASE_ID'),
+            notion_events_id_property=text('NOTION_EVENTS_ID_PROPERTY', ''),
+            github_token=text('GITHUB_TOKEN'),
+            metricool_api_key=text('METRICOOL_API_KEY'),
+            n8n_webhook_url=url('N8N_WEBHOOK_URL'),
+            # Overridable so benchmarks can point the server at local stand-ins
+            notion_api_url=url('NOTION_API_URL', 'https://api.notion.com'),
+            github_api_url=url('GITHUB_API_URL', 'https://api.github.com'),
+            metricool_api_url=url('METRICOOL_API_URL', 'https://api.metricool.com'),
+
+            host=text('MCP_HOST', '0.0.0.0'),
+            port=port,
+            environment=text('STANDUP_ENV', 'development'),
+            workers=integer('MCP_WORKERS', 1, maximum=99),
+            worker_id=text('MCP_WORKER_ID', '0'),
+            shared_state=flag('MCP_SHARED_STATE', False),
+            shared_state_db=text('MCP_SHARED_STATE_DB', 'data/mcp_state.sqlite3'),
+            shared_state_busy_ms=integer('MCP_SHARED_STATE_BUSY_MS', 100),
+            shared_cache_max_kb=integer('MCP_SHARED_CACHE_MAX_KB', 512),
+
+            tool_deadline_seconds=default_deadline,
+            tool_deadlines=overrides(_DEADLINE_PREFIX, lambda name: seconds(name, default_deadline),
+                                     exclude='MCP_TOOL_DEADLINE_SECONDS'),
+            upstream_timeout_seconds=default_timeout,
+            upstream_timeouts=overrides(_TIMEOUT_PREFIX, lambda name: seconds(name, default_timeout),
+                                        exclude='MCP_UPSTREAM_TIMEOUT_SECONDS'),
+            # 0 turns rate limiting off for an upstream
+            rate_limits=overrides(
+                _RATE_PREFIX, lambda name: seconds(name, 0.0, allow_zero=True, unit='requests per second')
+            ),
+            concurrency_limits=overrides(_CONCURRENCY_PREFIX, lambda name: integer(name, 1)),
+            upstream_max_attempts=integer('MCP_UPSTREAM_MAX_ATTEMPTS', 4),
+            upstream_max_retry_after=seconds('MCP_UPSTREAM_MAX_RETRY_AFTER', 30.0, allow_zero=True),
+            breaker_failure_threshold=integer('MCP_BREAKER_FAILURE_THRESHOLD', 5),
+            breaker_recovery_seconds=seconds('MCP_BREAKER_RECOVERY_SECONDS', 30.0),
+            health_deadline_seconds=seconds('MCP_HEALTH_DEADLINE_SECONDS', 3.0),
+
+            cache_ttl_events=seconds('MCP_CACHE_TTL_EVENTS', 30.0, allow_zero=True),
+            cache_ttl_comedians=seconds('MCP_CACHE_TTL_COMEDIANS', 300.0, allow_zero=True),
+            cache_ttl_metricool_brands=seconds('MCP_CACHE_TTL_METRICOOL_BRANDS', 600.0, allow_zero=True),
+            cache_ttl_notion_query=seconds('MCP_CACHE_TTL_NOTION_QUERY', 60.0, allow_zero=True),
+            health_cache_seconds=seconds('MCP_HEALTH_CACHE_SECONDS', 15.0, allow_zero=True),
+            cache_max_entries=integer('MCP_CACHE_MAX_ENTRIES', 1024),
+            conditional_cache_entries=integer('MCP_CONDITIONAL_CACHE_ENTRIES', 512),
+            conditional_cache_mb=integer('MCP_CONDITIONAL_CACHE_MB', 32),
+            notion_revalidate_max_age=seconds('MCP_NOTION_REVALIDATE_MAX_AGE', 300.0, allow_zero=True),
+            supabase_in_chunk=integer('MCP_SUPABASE_IN_CHUNK', 100, maximum=1000),
+            metrics_payload_sizes=flag('MCP_METRICS_PAYLOAD_SIZES', True),
+
+            replica_enabled=flag('MCP_REPLICA_ENABLED', False),
+            replica_db=text('MCP_REPLICA_DB', ':memory:'),
+            replica_watermark_column=text('MCP_REPLICA_WATERMARK_COLUMN', 'updated_at'),
+            replica_sync_seconds=seconds('MCP_REPLICA_SYNC_SECONDS', 15.0),
+            replica_full_sync_seconds=seconds('MCP_REPLICA_FULL_SYNC_SECONDS', 3600.0),
+            replica_max_staleness=seconds('MCP_REPLICA_MAX_STALENESS', 120.0),
+            jobs_db=text('MCP_JOBS_DB', 'data/mcp_jobs.sqlite3'),
+            job_workers=integer('MCP_JOB_WORKERS', 4),
+            job_max_attempts=integer('MCP_JOB_MAX_ATTEMPTS', 3),
+            notion_sync_db=text('MCP_NOTION_SYNC_DB', 'data/mcp_notion_sync.sqlite3'),
+            notion_sync_watermark_column=text('MCP_NOTION_SYNC_WATERMARK_COLUMN', 'updated_at'),
+            notion_sync_batch_size=integer('MCP_NOTION_SYNC_BATCH_SIZE', 10, maximum=100),
+
+            missing=tuple(name for name in REQUIRED_ENV if not text(name)),
+        )
+        if errors:
+            raise SettingsError("Invalid configuration:\n  " + "\n  ".join(errors))
+        return settings
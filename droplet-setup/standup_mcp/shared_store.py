@@ -0,0 +1,232 @@
+"""
+Cross-process shared state
+SQLite (WAL) store that lets several MCP worker processes share cache entries,
+cache invalidations and rate-limit token buckets
+"""
+
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from standup_mcp.serialization import dumps, parse
+
+# Expired entries for keys that are never read again are swept every N writes
+_PURGE_EVERY = 500
+
+# Invalidations must not be lost to lock contention, so they retry instead of giving up
+_LOCKED_RETRIES = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS cache_generations (
+    namespace TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS token_buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    paused_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def _is_locked(error: sqlite3.OperationalError) -> bool:
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+class SharedStore:
+    """Small synchronous SQLite store; every operation is one short transaction.
+
+    Each thread gets its own connection, so nothing here serializes on a Python
+    lock. Only generation() is meant to be called on the event loop (WAL reads
+    never wait for writers); writes and entry reads should go through
+    asyncio.to_thread. The busy timeout is short: cache writes and token takes
+    give up (or report a short wait) rather than queue behind another worker.
+    Wall-clock time is used throughout because monotonic clocks are not
+    comparable between processes.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 100, max_entry_bytes: int = 512 * 1024):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.max_entry_bytes = max_entry_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._puts = itertools.count(1)
+        self.counters = {'oversized': 0, 'busy': 0}
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                                   timeout=self.busy_timeout_ms / 1000)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            self._local.conn = conn
+        return conn
+
+    def _retry_locked(self, operation: Callable[[], Any]) -> Any:
+        for attempt in range(1, _LOCKED_RETRIES + 1):
+            try:
+                return operation()
+            except sqlite3.OperationalError as e:
+                if not _is_locked(e) or attempt == _LOCKED_RETRIES:
+                    raise
+                self.counters['busy'] += 1
+                time.sleep(self.busy_timeout_ms / 1000)
+
+# ---------- cache ----------
+
+    def generation(self, namespace: str) -> int:
+        row = self._conn.execute(
+            "SELECT generation FROM cache_generations WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, namespace: str) -> int:
+        """Invalidate a namespace for every process; returns the new generation"""
+        def bump() -> int:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "INSERT INTO cache_generations (namespace, generation) VALUES (?, 1) "
+                    "ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1 RETURNING generation",
+                    (namespace,),
+                ).fetchone()
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return row[0]
+        return self._retry_locked(bump)
+
+    def get_entry(self, namespace: str, key: str) -> Optional[Tuple[Any, float, int]]:
+        """(value, expires_at, generation) for a live entry of the current generation"""
+        row = self._conn.execute(
+            "SELECT e.value, e.expires_at, e.generation FROM cache_entries e "
+            "LEFT JOIN cache_generations g ON g.namespace = e.namespace "
+            "WHERE e.namespace = ? AND e.key = ? AND e.expires_at > ? "
+            "AND e.generation = COALESCE(g.generation, 0)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return parse(row[0]), row[1], row[2]
+
+    def put_entry(self, namespace: str, key: str, value: Any, ttl: float, generation: int) -> bool:
+        """Store a value unless the namespace was invalidated since `generation` was read.
+
+        Best effort: values larger than max_entry_bytes, or a store locked by
+        another worker for longer than the busy timeout, are skipped (False).
+        """
+        body = dumps(value)
+        if len(body) > self.max_entry_bytes:
+            self.counters['oversized'] += 1
+            return False
+        try:
+            self._conn.execute(
+                "INSERT INTO cache_entries (namespace, key, value, generation, expires_at) "
+                "SELECT ?, ?, ?, ?, ? WHERE COALESCE((SELECT generation FROM cache_generations "
+                "WHERE namespace = ?), 0) = ? "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, "
+                "generation = excluded.generation, expires_at = excluded.expires_at",
+                (namespace, key, body, generation, time.time() + ttl, namespace, generation),
+            )
+            if next(self._puts) % _PURGE_EVERY == 0:
+                self.purge_expired()
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e):
+                raise
+            self.counters['busy'] += 1
+            return False
+        return True
+
+    def clear_cache(self) -> None:
+        def clear() -> None:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO cache_generations (namespace, generation) "
+                    "SELECT DISTINCT namespace, 1 FROM cache_entries WHERE true "
+                    "ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1"
+                )
+                conn.execute("DELETE FROM cache_entries")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        self._retry_locked(clear)
+
+    def purge_expired(self) -> int:
+        return self._conn.execute(
+            "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+
+    # ---------- token buckets ----------
+
+    def take_token(self, name: str, rate: float, burst: float) -> float:
+        """Take one token from a shared bucket; returns 0 on success, else seconds until one is due
+        (a short retry delay when another worker holds the store)"""
+        now = time.time()
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e):
+                raise
+            self.counters['busy'] += 1
+            return self.busy_timeout_ms / 1000
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at, paused_until FROM token_buckets WHERE name = ?", (name,)
+            ).fetchone()
+            tokens, updated_at, paused_until = row if row else (burst, now, 0.0)
+            if paused_until > now:
+                wait = paused_until - now
+            else:
+                tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / rate
+                updated_at = now
+            conn.execute(
+                "INSERT INTO token_buckets (name, tokens, updated_at, paused_until) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET tokens = excluded.tokens, "
+                "updated_at = excluded.updated_at, paused_until = excluded.paused_until",
+                (name, tokens, updated_at, paused_until),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def pause_bucket(self, name: str, seconds: float) -> None:
+        now = time.time()
+        self._retry_locked(lambda: self._conn.execute(
+            "INSERT INTO token_buckets (name, tokens, updated_at, paused_until) VALUES (?, 0, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET tokens = 0, updated_at = excluded.updated_at, "
+            "paused_until = MAX(paused_until, excluded.paused_until)",
+            (name, now, now + seconds),
+        ))
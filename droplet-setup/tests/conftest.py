@@ -0,0 +1,115 @@
+"""
+Shared fakes for the standup_mcp tests
+
+`async def` tests are run on a fresh event loop by the hook below, so no async
+pytest plugin is needed.
+"""
+
+import asyncio
+import inspect
+import re
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    asyncio.run(pyfuncitem.obj(**arguments))
+    return True
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeUpstream:
+    """Async stand-in for an upstream call (loader, handler or API helper).
+
+    Records every call's arguments, raises ConnectionError for the first
+    `failures` calls and otherwise answers with `results` in turn, repeating
+    the last; a callable result is called with the call's arguments. A gated
+    upstream holds every call until release().
+    """
+
+    def __init__(self, *results, failures: int = 0, delay: float = 0.0, gated: bool = False):
+        self.results = results or (None,)
+        self.failures = failures
+        self.delay = delay
+        self.calls = []
+        self._gate = asyncio.Event() if gated else None
+
+    def release(self) -> None:
+        self._gate.set()
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        attempt = len(self.calls)
+        if self._gate is not None:
+            await self._gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if attempt <= self.failures:
+            raise ConnectionError(f'attempt {attempt} failed')
+        result = self.results[min(attempt - self.failures, len(self.results)) - 1]
+        return result(*args, **kwargs) if callable(result) else result
+
+
+_QUOTED = re.compile(r'"([^"]*)"')
+
+
+class FakePostgrest:
+    """One Supabase table answering the PostgREST parameters the replica and the Notion sync send:
+    order=updated_at.asc,id.asc with a limit, the keyset `or` filter, updated_at=gte. and id=in.(...)
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.requests = []
+
+    def put(self, id, updated_at, **fields):
+        self.rows[id] = {**self.rows.get(id, {'id': id}), **fields, 'updated_at': updated_at}
+
+    async def select(self, params):
+        self.requests.append(dict(params))
+        rows = sorted(self.rows.values(), key=lambda row: (row['updated_at'], row['id']))
+        if 'id' in params:
+            wanted = params['id'][len('in.('):-1].split(',')
+            return [dict(row) for row in rows if row['id'] in wanted]
+        if 'or' in params:
+            mark, _, last_id = _QUOTED.findall(params['or'])
+            rows = [row for row in rows if (row['updated_at'], row['id']) > (mark, last_id)]
+        elif 'updated_at' in params:
+            since = params['updated_at'].removeprefix('gte.')
+            rows = [row for row in rows if row['updated_at'] >= since]
+        return [dict(row) for row in rows[:int(params['limit'])]]
+
+    async def fetch_page(self, table, params):
+        return await self.select(params)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_upstream():
+    """Factory: fake_upstream(*results, failures=0, delay=0.0, gated=False)"""
+    return FakeUpstream
+
+
+@pytest.fixture
+def postgrest():
+    return FakePostgrest()
@@ -0,0 +1,147 @@
+"""
+ReadCache: coalescing, cancellation hand-off, generation invalidation and the shared store
+"""
+
+import asyncio
+
+from standup_mcp.cache import ReadCache, make_key
+from standup_mcp.shared_store import SharedStore
+
+
+async def test_concurrent_misses_share_one_load(fake_upstream):
+    cache = ReadCache()
+    upstream = fake_upstream({'v': 1}, gated=True)
+    tasks = [asyncio.create_task(cache.get_or_load('events', 'k', upstream)) for _ in range(5)]
+    await asyncio.sleep(0)
+    upstream.release()
+
+    assert await asyncio.gather(*tasks) == [{'v': 1}] * 5
+    assert len(upstream.calls) == 1
+    stats = cache.stats()
+    assert (stats['misses'], stats['coalesced'], stats['inflight']) == (1, 4, 0)
+
+
+async def test_waiter_reloads_when_the_loading_caller_is_cancelled(fake_upstream):
+    cache = ReadCache()
+    upstream = fake_upstream('first', 'second', gated=True)
+    leader = asyncio.create_task(cache.get_or_load('events', 'k', upstream))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load('events', 'k', upstream))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    upstream.release()
+
+    # The surviving waiter took over the load instead of inheriting the cancellation
+    assert await waiter == 'second'
+    assert leader.cancelled()
+    assert len(upstream.calls) == 2
+
+
+async def test_cancelled_waiter_does_not_cancel_the_load(fake_upstream):
+    cache = ReadCache()
+    upstream = fake_upstream('value', gated=True)
+    leader = asyncio.create_task(cache.get_or_load('events', 'k', upstream))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load('events', 'k', upstream))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    upstream.release()
+
+    assert await leader == 'value'
+    assert waiter.cancelled()
+
+
+async def test_loader_errors_reach_every_waiter_and_are_not_cached(fake_upstream):
+    cache = ReadCache()
+    upstream = fake_upstream('ok', failures=1, delay=0.001)
+
+    results = await asyncio.gather(
+        *(cache.get_or_load('events', 'k', upstream) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert await cache.get_or_load('events', 'k', upstream) == 'ok'
+    assert len(upstream.calls) == 2
+
+
+async def test_result_that_raced_with_an_invalidation_is_not_cached(fake_upstream):
+    cache = ReadCache()
+    upstream = fake_upstream('stale', 'fresh', gated=True)
+    load = asyncio.create_task(cache.get_or_load('events', 'k', upstream))
+    await asyncio.sleep(0)
+    await cache.invalidate('events')
+    upstream.release()
+
+    # The in-flight caller still gets its result, but later readers must not be served it
+    assert await load == 'stale'
+    assert await cache.get_or_load('events', 'k', upstream) == 'fresh'
+
+
+async def test_invalidate_one_key_or_a_whole_namespace(fake_upstream):
+    cache = ReadCache()
+    for key in ('a', 'b'):
+        await cache.get_or_load('events', key, fake_upstream(key))
+    await cache.get_or_load('comedians', 'a', fake_upstream('c'))
+
+    assert await cache.invalidate('events', 'a') == 1
+    assert await cache.invalidate('events') == 1
+    assert await cache.get_or_load('comedians', 'a', fake_upstream('reloaded')) == 'c'
+
+
+async def test_entries_expire_after_their_namespace_ttl(clock, fake_upstream):
+    cache = ReadCache(default_ttl=30.0, ttls={'events': 5.0}, clock=clock)
+    upstream = fake_upstream(1, 2)
+
+    assert await cache.get_or_load('events', 'k', upstream) == 1
+    clock.advance(4.9)
+    assert await cache.get_or_load('events', 'k', upstream) == 1
+    clock.advance(0.2)
+    assert await cache.get_or_load('events', 'k', upstream) == 2
+
+
+async def test_zero_ttl_bypasses_the_cache(fake_upstream):
+    cache = ReadCache(ttls={'events': 0})
+    upstream = fake_upstream(0, 1)
+
+    assert [await cache.get_or_load('events', 'k', upstream) for _ in range(2)] == [0, 1]
+    assert cache.stats()['entries'] == 0
+
+
+async def test_least_recently_used_entry_is_evicted(fake_upstream):
+    cache = ReadCache(max_entries=2)
+    await cache.get_or_load('events', 'a', fake_upstream('a'))
+    await cache.get_or_load('events', 'b', fake_upstream('b'))
+    await cache.get_or_load('events', 'a', fake_upstream('a2'))
+    await cache.get_or_load('events', 'c', fake_upstream('c'))
+
+    assert await cache.get_or_load('events', 'a', fake_upstream('a3')) == 'a'
+    assert await cache.get_or_load('events', 'b', fake_upstream('b2')) == 'b2'
+    assert cache.stats()['evictions'] >= 1
+
+
+def test_make_key_ignores_dict_ordering():
+    assert make_key({'a': 1, 'b': 2}, 'x') == make_key({'b': 2, 'a': 1}, 'x')
+
+
+async def test_shared_store_serves_and_invalidates_across_processes(tmp_path, fake_upstream):
+    path = str(tmp_path / 'state.sqlite3')
+    # Two caches over one file stand in for two worker processes
+    worker_a = ReadCache(store=SharedStore(path))
+    worker_b = ReadCache(store=SharedStore(path))
+
+    assert await worker_a.get_or_load('events', 'k', fake_upstream({'v': 1})) == {'v': 1}
+    assert await worker_b.get_or_load('events', 'k', fake_upstream({'v': 'unexpected'})) == {'v': 1}
+    await worker_b.invalidate('events')
+    # worker_a's local copy was dropped because the shared generation moved
+    assert await worker_a.get_or_load('events', 'k', fake_upstream({'v': 2})) == {'v': 2}
+
+
+def test_shared_store_skips_oversized_entries(tmp_path):
+    store = SharedStore(str(tmp_path / 'state.sqlite3'), max_entry_bytes=64)
+
+    assert store.put_entry('events', 'small', {'v': 1}, 30.0, 0)
+    assert not store.put_entry('events', 'big', {'v': 'x' * 100}, 30.0, 0)
+    assert store.counters['oversized'] == 1
+    assert store.get_entry('events', 'big') is None
@@ -0,0 +1,128 @@
+"""
+ConditionalCache: validator reuse, 304 handling, per-credential keys and size bounds
+"""
+
+from standup_mcp.conditional import ConditionalCache, auth_scope
+
+URL = 'https://api.github.com/repos/o/r/issues'
+TOKEN = {'Authorization': 'Bearer one'}
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class FakeServer:
+    """Answers conditional GETs like GitHub: 304 when If-None-Match matches the current ETag"""
+
+    def __init__(self, body=b'[{"number": 1}]', etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.sent = []
+
+    async def send(self, validators):
+        self.sent.append(validators)
+        if self.etag and validators.get('If-None-Match') == self.etag:
+            return FakeResponse(304, headers={'ETag': self.etag})
+        return FakeResponse(200, self.body, {'ETag': self.etag} if self.etag else {})
+
+
+async def test_first_read_stores_the_body_and_the_next_one_reuses_the_etag():
+    cache, server = ConditionalCache(), FakeServer()
+    key = cache.key(URL, TOKEN)
+
+    first, cached = await cache.fetch(key, server.send)
+    assert (first.status_code, cached) == (200, None)
+    assert cache.request_headers(key) == {'If-None-Match': '"v1"'}
+
+    response, cached = await cache.fetch(key, server.send)
+
+    assert server.sent == [{}, {'If-None-Match': '"v1"'}]
+    assert response.status_code == 304
+    assert cached == b'[{"number": 1}]'
+    assert (cache.counters['revalidated'], cache.counters['refetched']) == (1, 1)
+    assert cache.stats()['revalidation_ratio'] == 0.5
+
+
+async def test_changed_resource_replaces_the_stored_body():
+    cache, server = ConditionalCache(), FakeServer()
+    key = cache.key(URL, TOKEN)
+    await cache.fetch(key, server.send)
+    server.body, server.etag = b'[{"number": 2}]', '"v2"'
+
+    response, cached = await cache.fetch(key, server.send)
+
+    assert cached is None
+    assert response.content == b'[{"number": 2}]'
+    assert cache.get(key).body == b'[{"number": 2}]'
+    assert cache.request_headers(key) == {'If-None-Match': '"v2"'}
+
+
+async def test_304_for_an_evicted_entry_refetches_without_validators():
+    cache, server = ConditionalCache(), FakeServer()
+    key = cache.key(URL, TOKEN)
+    await cache.fetch(key, server.send)
+
+    async def send(validators):
+        response = await server.send(validators)
+        if response.status_code == 304:
+            # Evicted while the request was in flight
+            cache.discard(key)
+        return response
+
+    response, cached = await cache.fetch(key, send)
+
+    assert server.sent == [{}, {'If-None-Match': '"v1"'}, {}]
+    assert (response.status_code, cached) == (200, None)
+    assert cache.get(key) is not None
+
+
+async def test_responses_without_validators_or_with_errors_are_not_stored():
+    cache = ConditionalCache()
+
+    async def no_validators(validators):
+        return FakeResponse(200, b'{}')
+
+    async def failed(validators):
+        return FakeResponse(500, b'oops', {'ETag': '"e"'})
+
+    await cache.fetch('a', no_validators)
+    await cache.fetch('b', failed)
+
+    assert cache.stats()['entries'] == 0
+
+
+def test_last_modified_is_sent_as_if_modified_since():
+    cache = ConditionalCache()
+    cache.store('k', b'{}', last_modified='Wed, 01 Oct 2026 00:00:00 GMT')
+
+    assert cache.request_headers('k') == {'If-Modified-Since': 'Wed, 01 Oct 2026 00:00:00 GMT'}
+    assert cache.request_headers('missing') == {}
+
+
+def test_keys_are_scoped_to_the_credentials():
+    assert ConditionalCache.key(URL, TOKEN) != ConditionalCache.key(URL, {'Authorization': 'Bearer two'})
+    assert ConditionalCache.key(URL, TOKEN) == ConditionalCache.key(URL, dict(TOKEN))
+    assert auth_scope({'X-API-KEY': 'k'}) != auth_scope(None)
+    assert 'Bearer' not in ConditionalCache.key(URL, TOKEN)
+
+
+def test_least_recently_used_entries_are_evicted_by_count_and_bytes():
+    cache = ConditionalCache(max_entries=2, max_bytes=10)
+    cache.store('a', b'1234', etag='a')
+    cache.store('b', b'1234', etag='b')
+    cache.get('a')
+    cache.store('c', b'1234', etag='c')
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    cache.store('d', b'12345678', etag='d')
+    assert [key for key in ('a', 'c', 'd') if cache.get(key)] == ['d']
+    assert cache.stats()['bytes'] == 8
+
+    cache.store('huge', b'x' * 11, etag='h')
+    assert cache.get('huge') is None
+    assert cache.get('d') is not None
@@ -0,0 +1,168 @@
+"""
+JobQueue: retries, lease expiry and reclaim, lease renewal and resuming after a restart
+"""
+
+import asyncio
+
+import pytest
+
+from standup_mcp.jobs import JobQueue
+
+
+def sent(to):
+    return {'sent': to}
+
+
+async def wait_for(queue, job_id, *statuses, timeout=3.0):
+    async with asyncio.timeout(timeout):
+        while True:
+            job = await queue.get(job_id)
+            if job['status'] in statuses:
+                return job
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    """Queues over one database file, as separate processes would open it"""
+    def make(**options):
+        options = {'poll_interval': 0.01, 'retry_base_delay': 0.01, 'retry_max_delay': 0.02, **options}
+        return JobQueue(str(tmp_path / 'jobs.sqlite3'), **options)
+    return make
+
+
+async def test_job_runs_and_stores_its_result(make_queue, fake_upstream):
+    queue = make_queue()
+    queue.register('email', fake_upstream(sent))
+    job_id = await queue.enqueue('email', {'to': 'comic@example.com'})
+    job = await wait_for(queue, job_id, 'succeeded')
+    stats = await queue.stats()
+    await queue.stop()
+
+    assert job['result'] == {'sent': 'comic@example.com'}
+    assert job['attempts'] == 1
+    assert job['error'] is None
+    assert stats['jobs']['succeeded'] == 1
+    assert stats['pending'] == 0
+
+
+async def test_unknown_job_kind_is_rejected(make_queue):
+    with pytest.raises(ValueError):
+        await make_queue().enqueue('fax', {})
+
+
+async def test_failed_job_is_retried_with_backoff_until_it_succeeds(make_queue, fake_upstream):
+    queue = make_queue()
+    upstream = fake_upstream(sent, failures=2)
+    queue.register('email', upstream)
+    job_id = await queue.enqueue('email', {'to': 'a@example.com'})
+    job = await wait_for(queue, job_id, 'succeeded', 'failed')
+    await queue.stop()
+
+    assert job['status'] == 'succeeded'
+    assert job['attempts'] == 3
+    assert len(upstream.calls) == 3
+
+
+async def test_job_fails_once_its_attempts_are_used_up(make_queue, fake_upstream):
+    queue = make_queue(max_attempts=2)
+    upstream = fake_upstream(sent, failures=5)
+    queue.register('email', upstream)
+    job_id = await queue.enqueue('email', {'to': 'a@example.com'})
+    job = await wait_for(queue, job_id, 'failed')
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert job['attempts'] == 2
+    assert job['error'] == 'ConnectionError: attempt 2 failed'
+    assert len(upstream.calls) == 2
+
+
+def test_backoff_grows_and_is_capped():
+    queue = JobQueue(':memory:', retry_base_delay=1.0, retry_max_delay=5.0)
+
+    assert 0.5 <= queue._backoff(1) <= 1.0
+    assert 2.0 <= queue._backoff(3) <= 4.0
+    assert 2.5 <= queue._backoff(10) <= 5.0
+
+
+async def test_job_of_a_dead_process_is_reclaimed_once_its_lease_lapses(make_queue, fake_upstream):
+    # A process that claims a job and dies before finishing it
+    crashed = make_queue(workers=0, lease_seconds=0.1)
+    crashed.register('email', fake_upstream(sent))
+    job_id = await crashed.enqueue('email', {'to': 'a@example.com'})
+    assert (await crashed._claim())['id'] == job_id
+
+    survivor = make_queue()
+    upstream = fake_upstream(sent)
+    survivor.register('email', upstream)
+    await survivor.start()
+    await asyncio.sleep(0.05)
+    during_lease = len(upstream.calls)
+    job = await wait_for(survivor, job_id, 'succeeded')
+    await survivor.stop()
+
+    assert during_lease == 0
+    assert job['attempts'] == 2
+
+
+async def test_running_job_keeps_its_lease_while_the_handler_works(make_queue, fake_upstream):
+    first, second = make_queue(lease_seconds=0.06), make_queue(lease_seconds=0.06)
+    upstream = fake_upstream(sent, delay=0.3)
+    for queue in (first, second):
+        queue.register('email', upstream)
+    job_id = await first.enqueue('email', {'to': 'a@example.com'})
+    await asyncio.sleep(0.02)
+    await second.start()
+    job = await wait_for(first, job_id, 'succeeded')
+    await asyncio.gather(first.stop(), second.stop())
+
+    # The lease was renewed, so the second process never claimed the job
+    assert len(upstream.calls) == 1
+    assert job['attempts'] == 1
+
+
+async def test_jobs_left_by_a_restart_are_resumed(make_queue, fake_upstream):
+    before = make_queue()
+    stuck = fake_upstream(gated=True)
+    before.register('email', stuck)
+    running_id = await before.enqueue('email', {'to': 'a@example.com'})
+    while not stuck.calls:
+        await asyncio.sleep(0.01)
+    # Shutting down hands the running job back to the queue without using up an attempt
+    await before.stop()
+    requeued = await before.get(running_id)
+
+    never_started = make_queue(workers=0)
+    never_started.register('email', stuck)
+    queued_id = await never_started.enqueue('email', {'to': 'b@example.com'})
+
+    after = make_queue()
+    after.register('email', fake_upstream(sent))
+    await after.start()
+    jobs = [await wait_for(after, job_id, 'succeeded') for job_id in (running_id, queued_id)]
+    await after.stop()
+
+    assert requeued['status'] == 'queued'
+    assert requeued['attempts'] == 0
+    assert [job['result'] for job in jobs] == [{'sent': 'a@example.com'}, {'sent': 'b@example.com'}]
+
+
+async def test_workers_bound_how_many_jobs_run_at_once(make_queue):
+    queue = make_queue(workers=2)
+    running = peak = 0
+
+    async def handler(**payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.03)
+        running -= 1
+
+    queue.register('email', handler)
+    job_ids = [await queue.enqueue('email', {'n': n}) for n in range(6)]
+    for job_id in job_ids:
+        await wait_for(queue, job_id, 'succeeded')
+    await queue.stop()
+
+    assert peak == 2
@@ -0,0 +1,332 @@
+"""
+NotionEventSync: incremental reconcile, dry runs, resuming partial runs, retries and the run lease
+"""
+
+import asyncio
+import sqlite3
+import time
+import types
+from datetime import datetime, timezone
+
+import pytest
+
+from standup_mcp import notion_sync
+from standup_mcp.notion_sync import NotionEventSync, NotionPageIndex
+
+
+def properties_for(event):
+    return {
+        'Title': {'title': [{'text': {'content': event.get('title', 'New Event')}}]},
+        'Date': {'date': {'start': event.get('event_date')}},
+        'Venue': {'rich_text': [{'text': {'content': event.get('venue', '')}}]},
+        'Status': {'select': {'name': event.get('status', 'Planning')}},
+    }
+
+
+def _read_form(properties):
+    """What Notion returns for properties we wrote"""
+    out = {}
+    for name, prop in properties.items():
+        kind = next(iter(prop))
+        value = prop[kind]
+        if kind in ('title', 'rich_text'):
+            value = [{'plain_text': part['text']['content'], 'text': part['text']} for part in value]
+        out[name] = {'type': kind, kind: value}
+    return out
+
+
+class FakeNotion:
+    """In-memory events database answering the query/create/update helpers the sync is given"""
+
+    def __init__(self, clock=None):
+        self.pages = {}
+        self.calls = {'query': 0, 'create': 0, 'update': 0}
+        self.queries = []
+        self.clock = clock
+        self.fail_updates = 0
+
+    def _edited(self):
+        return datetime.now(timezone.utc).isoformat()
+
+    def _write_cost(self):
+        if self.clock is not None:
+            self.clock.advance(1.0)
+
+    def edit(self, page_id, name, text):
+        """A person changing a page in the Notion UI"""
+        self.pages[page_id]['properties'][name] = {
+            'type': 'rich_text', 'rich_text': [{'plain_text': text, 'text': {'content': text}}]
+        }
+        self.pages[page_id]['last_edited_time'] = self._edited()
+
+    def find(self, title):
+        return next(page for page in self.pages.values()
+                    if page['properties']['Title']['title'][0]['plain_text'] == title)
+
+    async def query(self, body):
+        self.calls['query'] += 1
+        self.queries.append(body)
+        pages = sorted(self.pages.values(), key=lambda page: page['id'])
+        since = (body.get('filter') or {}).get('last_edited_time', {}).get('on_or_after')
+        if since:
+            pages = [page for page in pages if page['last_edited_time'] >= since]
+        start = int(body.get('start_cursor') or 0)
+        end = start + body['page_size']
+        return {'results': pages[start:end], 'has_more': end < len(pages),
+                'next_cursor': str(end) if end < len(pages) else None}
+
+    async def create(self, properties):
+        self.calls['create'] += 1
+        self._write_cost()
+        page_id = f'page-{len(self.pages):04d}'
+        self.pages[page_id] = {'id': page_id, 'properties': _read_form(properties),
+                               'last_edited_time': self._edited()}
+        return self.pages[page_id]
+
+    async def update(self, page_id, properties):
+        self.calls['update'] += 1
+        self._write_cost()
+        if self.fail_updates:
+            self.fail_updates -= 1
+            raise RuntimeError('Notion 502')
+        self.pages[page_id]['properties'].update(_read_form(properties))
+        self.pages[page_id]['last_edited_time'] = self._edited()
+        return self.pages[page_id]
+
+
+def seed_events(postgrest, count):
+    for n in range(count):
+        postgrest.put(f'ev{n:03d}', f'2026-10-01T00:{n // 60:02d}:{n % 60:02d}',
+                      title=f'Show {n}', event_date=f'2026-11-{n % 28 + 1:02d}', venue='Factory')
+    return postgrest
+
+
+def make_sync(notion, events, index=None, **options):
+    options = {'batch_size': 2, 'page_size': 10, **options}
+    return NotionEventSync(index or NotionPageIndex(':memory:'), events.select, notion.query,
+                           notion.create, notion.update, properties_for, **options)
+
+
+async def test_first_run_creates_pages_and_the_next_one_writes_nothing(postgrest):
+    notion = FakeNotion()
+    sync = make_sync(notion, seed_events(postgrest, 25))
+
+    first = await sync.run()
+    notion.calls.update(create=0, update=0)
+    second = await sync.run()
+
+    assert first['status'] == 'complete'
+    assert first['created'] == 25
+    assert len(notion.pages) == 25
+    assert second['unchanged'] == second['events_checked'] > 0
+    assert second['created'] == second['updated'] == 0
+    assert notion.calls['create'] == notion.calls['update'] == 0
+    assert (await sync.stats())['index'] == {'pages': 25, 'linked': 25}
+
+
+async def test_only_changed_events_are_written(postgrest):
+    notion = FakeNotion()
+    sync = make_sync(notion, seed_events(postgrest, 25))
+    await sync.run()
+    postgrest.put('ev003', '2026-10-02T00:00:00', status='Cancelled')
+    notion.calls.update(create=0, update=0)
+
+    report = await sync.run()
+
+    assert report['updated'] == 1
+    assert (notion.calls['create'], notion.calls['update']) == (0, 1)
+    assert notion.find('Show 3')['properties']['Status']['select']['name'] == 'Cancelled'
+    # Only events past the overlap window are re-read
+    assert report['events_checked'] < 25
+
+
+async def test_existing_page_with_the_same_title_and_date_is_linked_not_duplicated(postgrest):
+    notion = FakeNotion()
+    seed_events(postgrest, 3)
+    await notion.create(properties_for(postgrest.rows['ev001']))
+
+    report = await make_sync(notion, postgrest).run()
+
+    assert report['linked'] == 1
+    assert report['created'] == 2
+    assert len(notion.pages) == 3
+
+
+async def test_dry_run_reports_the_plan_without_touching_notion_or_the_index(postgrest):
+    notion = FakeNotion()
+    index = NotionPageIndex(':memory:')
+    sync = make_sync(notion, seed_events(postgrest, 12), index=index)
+    await sync.run()
+    postgrest.put('ev004', '2026-10-02T00:00:00', venue='Enmore')
+    postgrest.put('ev100', '2026-10-02T00:00:01', title='Late Show', event_date='2026-12-01')
+    before = {key: index.get_meta(key) for key in ('events_cursor', 'notion_scanned_at', 'retry_event_ids')}
+    notion.calls.update(create=0, update=0)
+
+    preview = await sync.run(dry_run=True)
+
+    assert preview['dry_run']
+    assert (preview['created'], preview['updated']) == (1, 1)
+    assert notion.calls['create'] == notion.calls['update'] == 0
+    assert {key: index.get_meta(key) for key in before} == before
+    assert index.count() == {'pages': 12, 'linked': 12}
+
+    applied = await sync.run()
+    assert (applied['created'], applied['updated']) == (1, 1)
+
+
+async def test_dry_run_on_an_empty_index_leaves_it_empty(postgrest):
+    index = NotionPageIndex(':memory:')
+    report = await make_sync(FakeNotion(), seed_events(postgrest, 5), index=index).run(dry_run=True)
+
+    assert report['created'] == 5
+    assert index.count() == {'pages': 0, 'linked': 0}
+    assert index.get_meta('events_cursor') is None
+
+
+async def test_run_stopped_by_its_time_budget_resumes_where_it_left_off(postgrest, clock, monkeypatch):
+    monkeypatch.setattr(notion_sync, 'time', types.SimpleNamespace(monotonic=clock, time=time.time))
+    # Each Notion write costs one fake second; pages of 10 events, batches of 2
+    notion = FakeNotion(clock=clock)
+    sync = make_sync(notion, seed_events(postgrest, 30))
+
+    first = await sync.run(time_budget=12.0)
+    postgrest.requests.clear()
+    second = await sync.run()
+
+    assert first['status'] == 'partial'
+    assert 0 < first['created'] < 30
+    assert second['status'] == 'complete'
+    # No event was created twice, and the second run started from the saved watermark
+    assert len(notion.pages) == 30
+    assert 'updated_at' in postgrest.requests[0]
+    assert first['created'] + second['created'] == 30
+
+
+async def test_run_interrupted_by_an_error_resumes_from_the_last_saved_batch(postgrest):
+    notion = FakeNotion()
+    sync = make_sync(notion, seed_events(postgrest, 30))
+    pages = 0
+
+    async def flaky_select(params):
+        nonlocal pages
+        pages += 1
+        if pages == 2:
+            raise ConnectionError('supabase unreachable')
+        return await postgrest.select(params)
+
+    sync.fetch_events = flaky_select
+    with pytest.raises(ConnectionError):
+        await sync.run()
+    created_before = len(notion.pages)
+    sync.fetch_events = postgrest.select
+    report = await sync.run()
+
+    assert created_before == 10
+    assert report['created'] == 20
+    assert len(notion.pages) == 30
+    # The lease was released by the failed run
+    assert report['status'] == 'complete'
+
+
+async def test_failed_writes_are_retried_on_the_next_run(postgrest):
+    notion = FakeNotion()
+    sync = make_sync(notion, seed_events(postgrest, 5))
+    await sync.run()
+    postgrest.put('ev002', '2026-10-02T00:00:00', title='Renamed')
+    notion.fail_updates = 1
+
+    failed = await sync.run()
+    retried = await sync.run()
+
+    assert failed['failed'] == 1
+    assert failed['retry_pending'] == 1
+    assert failed['errors'] == [{'event_id': 'ev002', 'action': 'update', 'error': 'Notion 502'}]
+    assert retried['updated'] == 1
+    assert retried['retry_pending'] == 0
+    assert notion.find('Renamed')
+
+
+async def test_hand_edited_page_is_put_back(postgrest):
+    notion = FakeNotion()
+    sync = make_sync(notion, seed_events(postgrest, 5))
+    await sync.run()
+    page_id = notion.find('Show 2')['id']
+    notion.edit(page_id, 'Venue', 'Wrong venue')
+
+    report = await sync.run()
+
+    assert report['updated'] == 1
+    assert notion.pages[page_id]['properties']['Venue']['rich_text'][0]['plain_text'] == 'Factory'
+
+
+async def test_restarted_process_resumes_from_the_persisted_index(postgrest, tmp_path):
+    path = str(tmp_path / 'notion_sync.sqlite3')
+    notion = FakeNotion()
+    await make_sync(notion, seed_events(postgrest, 15), index=NotionPageIndex(path)).run()
+    notion.queries.clear()
+    postgrest.requests.clear()
+    notion.calls.update(create=0, update=0)
+
+    report = await make_sync(notion, postgrest, index=NotionPageIndex(path)).run()
+
+    assert report['created'] == report['updated'] == 0
+    # Incremental on both sides: a filtered Notion scan and a watermark-bounded event pull
+    assert 'filter' in notion.queries[0]
+    assert 'updated_at' in postgrest.requests[0]
+
+
+async def test_full_run_forgets_archived_pages_and_recreates_them(postgrest):
+    notion = FakeNotion()
+    sync = make_sync(notion, seed_events(postgrest, 4))
+    await sync.run()
+    notion.pages[notion.find('Show 1')['id']]['archived'] = True
+
+    report = await sync.run(full=True)
+
+    assert report['notion_pages_forgotten'] == 1
+    assert report['created'] == 1
+    assert report['unchanged'] == 3
+
+
+async def test_only_one_run_at_a_time_and_an_expired_lease_is_reclaimed(postgrest):
+    notion = FakeNotion()
+    index = NotionPageIndex(':memory:')
+    sync = make_sync(notion, seed_events(postgrest, 3), index=index)
+
+    assert index.acquire(NotionEventSync.LEASE, 'other-worker', 300.0)
+    busy = await sync.run()
+    assert busy['status'] == 'busy'
+    assert notion.calls['query'] == 0
+
+    # The other worker died; its lease has run out
+    assert index.acquire(NotionEventSync.LEASE, 'other-worker', -1.0)
+    report = await sync.run()
+    assert report['status'] == 'complete'
+    assert report['created'] == 3
+
+
+async def test_event_loop_keeps_running_while_another_worker_holds_the_index(postgrest, tmp_path):
+    path = str(tmp_path / 'notion_sync.sqlite3')
+    index = NotionPageIndex(path, busy_timeout_ms=2000)
+    index.count()
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticking = asyncio.create_task(ticker())
+    run = asyncio.create_task(make_sync(FakeNotion(), seed_events(postgrest, 3), index=index).run())
+    await asyncio.sleep(0.2)
+    holder.execute("ROLLBACK")
+    holder.close()
+    report = await run
+    ticking.cancel()
+
+    # The run waited on the lock in a worker thread, not on the event loop
+    assert ticks >= 10
+    assert report['created'] == 3
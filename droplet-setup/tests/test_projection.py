@@ -0,0 +1,138 @@
+"""
+Response projection: compact schemas, dotted-path field selection and shape()
+"""
+
+from standup_mcp.projection import (
+    COMPACT_TEXT_LIMIT,
+    compact_github_issue,
+    compact_metricool_brands,
+    compact_metricool_post,
+    notion_property_value,
+    select_fields,
+    shape,
+)
+
+
+def notion_page(**properties):
+    return {
+        'object': 'page', 'id': 'page-1', 'url': 'https://notion.so/page-1',
+        'created_time': '2026-10-01T00:00:00.000Z', 'last_edited_time': '2026-10-02T00:00:00.000Z',
+        'parent': {'database_id': 'db'}, 'icon': None, 'cover': None,
+        'properties': properties,
+    }
+
+
+ISSUE = {
+    'number': 7, 'title': 'Lineup page is slow', 'state': 'open', 'comments': 2,
+    'labels': [{'id': 1, 'name': 'bug', 'color': 'f00'}, 'perf'],
+    'assignees': [{'login': 'sam', 'id': 1}], 'user': {'login': 'alex', 'id': 2, 'type': 'User'},
+    'body': 'x' * (COMPACT_TEXT_LIMIT + 50), 'html_url': 'https://github.com/o/r/issues/7',
+    'reactions': {'+1': 3}, 'node_id': 'I_1',
+}
+
+
+def test_select_fields_keeps_nested_paths_and_projects_lists_per_item():
+    issue = {'number': 7, 'user': {'login': 'alex', 'id': 2}, 'labels': [{'name': 'bug', 'color': 'f00'}]}
+
+    assert select_fields(issue, ['number', 'user.login', 'labels.name']) == {
+        'number': 7, 'user': {'login': 'alex'}, 'labels': [{'name': 'bug'}]
+    }
+    assert select_fields([issue, issue], ['user.id']) == [{'user': {'id': 2}}] * 2
+
+
+def test_select_fields_skips_missing_paths():
+    issue = {'number': 7, 'user': None, 'labels': 'not a list'}
+
+    assert select_fields(issue, ['title', 'milestone.title']) == {}
+    # Paths through a scalar stop at it
+    assert select_fields(issue, ['user.login', 'labels.name']) == {'user': None, 'labels': 'not a list'}
+
+
+def test_bare_key_wins_over_its_sub_paths():
+    issue = {'user': {'login': 'alex', 'id': 2}}
+
+    assert select_fields(issue, ['user.login', 'user']) == {'user': {'login': 'alex', 'id': 2}}
+
+
+def test_notion_properties_collapse_to_plain_values():
+    def prop(kind, value):
+        return {'type': kind, kind: value}
+
+    assert notion_property_value(prop('title', [{'plain_text': 'Late '}, {'text': {'content': 'Show'}}])) == 'Late Show'
+    assert notion_property_value(prop('select', {'name': 'Planning'})) == 'Planning'
+    assert notion_property_value(prop('select', None)) is None
+    assert notion_property_value(prop('multi_select', [{'name': 'a'}, {'name': 'b'}])) == ['a', 'b']
+    assert notion_property_value(prop('date', {'start': '2026-11-01', 'end': None})) == '2026-11-01'
+    assert notion_property_value(prop('date', {'start': '2026-11-01', 'end': '2026-11-02'})) == {
+        'start': '2026-11-01', 'end': '2026-11-02'
+    }
+    assert notion_property_value(prop('people', [{'name': 'Sam'}, {'id': 'u2'}])) == ['Sam', 'u2']
+    assert notion_property_value(prop('formula', {'type': 'number', 'number': 3})) == 3
+    assert notion_property_value(prop('rollup', {'type': 'array', 'array': [prop('select', {'name': 'x'})]})) == ['x']
+    assert notion_property_value(prop('unique_id', {'prefix': 'EV', 'number': 12})) == 'EV-12'
+    assert notion_property_value(prop('checkbox', True)) is True
+
+
+def test_compact_notion_query_keeps_paging_and_drops_page_noise():
+    result = {
+        'object': 'list', 'has_more': True, 'next_cursor': 'c2',
+        'results': [notion_page(Title={'type': 'title', 'title': [{'plain_text': 'Show'}]})],
+    }
+
+    compact = shape('notion_query', result)
+
+    assert compact == {
+        'results': [{
+            'id': 'page-1', 'url': 'https://notion.so/page-1', 'created_time': '2026-10-01T00:00:00.000Z',
+            'last_edited_time': '2026-10-02T00:00:00.000Z', 'archived': False, 'properties': {'Title': 'Show'},
+        }],
+        'has_more': True, 'next_cursor': 'c2',
+    }
+
+
+def test_compact_github_issue_flattens_people_and_labels_and_truncates_the_body():
+    compact = compact_github_issue(ISSUE)
+
+    assert compact['labels'] == ['bug', 'perf']
+    assert compact['assignees'] == ['sam']
+    assert compact['author'] == 'alex'
+    assert not compact['is_pull_request']
+    assert len(compact['body']) == COMPACT_TEXT_LIMIT + 1
+    assert compact['body'].endswith('…')
+    assert 'reactions' not in compact
+
+
+def test_compact_tolerates_missing_keys():
+    compact = compact_github_issue({'number': 1})
+
+    assert compact['labels'] == compact['assignees'] == []
+    assert compact['author'] is None
+    assert compact['body'] is None
+    assert compact_metricool_post({'id': 5}) == {'id': 5}
+
+
+def test_metricool_brands_keep_their_wrapper():
+    brand = {'id': 1, 'title': 'Stand Up Sydney', 'instagram': 'standupsyd', 'facebook': None, 'extra': 'x'}
+    compact = {'id': 1, 'label': 'Stand Up Sydney', 'timezone': None, 'networks': {'instagram': 'standupsyd'}}
+
+    assert compact_metricool_brands([brand]) == [compact]
+    assert compact_metricool_brands({'data': [brand]}) == {'data': [compact]}
+    assert compact_metricool_brands({'unexpected': True}) == {'unexpected': True}
+
+
+def test_fields_apply_to_each_item_of_a_wrapped_list_and_keep_paging_keys():
+    result = {'total_count': 2, 'workflow_runs': [
+        {'id': 1, 'status': 'completed', 'head_branch': 'main'},
+        {'id': 2, 'status': 'queued', 'head_branch': 'dev'},
+    ]}
+
+    assert shape('github_workflow_runs', result, fields=['id', 'status']) == {
+        'total_count': 2, 'workflow_runs': [{'id': 1, 'status': 'completed'}, {'id': 2, 'status': 'queued'}]
+    }
+
+
+def test_full_response_with_fields_addresses_the_raw_object():
+    shaped = shape('github_issue', ISSUE, fields=['body', 'user.login', 'milestone'], compact=False)
+
+    assert shaped == {'body': ISSUE['body'], 'user': {'login': 'alex'}}
+    assert shape('github_issue', ISSUE, compact=False) is ISSUE
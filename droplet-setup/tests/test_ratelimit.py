@@ -0,0 +1,210 @@
+"""
+Rate limiting: token-bucket refill, Retry-After pauses, concurrency slots and shared buckets
+"""
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from standup_mcp.ratelimit import (
+    RateLimiterRegistry,
+    TokenBucket,
+    UpstreamLimiter,
+    jittered_backoff,
+    parse_retry_after,
+)
+from standup_mcp.shared_store import SharedStore
+
+
+def test_parse_retry_after_seconds_and_http_dates():
+    now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    http_date = format_datetime(now + timedelta(seconds=90), usegmt=True)
+
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after(' 1.5 ') == 1.5
+    assert parse_retry_after('-4') == 0.0
+    assert parse_retry_after(http_date, now=now.timestamp()) == pytest.approx(90.0)
+    assert parse_retry_after(format_datetime(now, usegmt=True), now=now.timestamp() + 60) == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+
+
+def test_jittered_backoff_stays_under_the_exponential_cap():
+    for attempt in range(1, 10):
+        assert 0 <= jittered_backoff(attempt, base=0.5, cap=4.0) <= min(4.0, 0.5 * 2 ** (attempt - 1))
+
+
+async def test_bucket_spends_its_burst_then_refills_with_time(clock):
+    bucket = TokenBucket(rate=2.0, burst=3.0, clock=clock)
+
+    assert [await bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket._tokens == 0.0
+    clock.advance(1.0)
+    # One second at 2/s refilled two tokens, one of which is taken straight away
+    assert await bucket.acquire() == 0.0
+    clock.advance(100.0)
+    bucket._refill()
+    assert bucket._tokens == 3.0
+
+
+async def test_empty_bucket_waits_for_the_next_token():
+    bucket = TokenBucket(rate=20.0, burst=1.0)
+    await bucket.acquire()
+    started = time.monotonic()
+    await bucket.acquire()
+
+    assert time.monotonic() - started >= 0.04
+
+
+async def test_pause_holds_every_caller_until_retry_after_passes():
+    bucket = TokenBucket(rate=1000.0, burst=10.0)
+    await bucket.pause(0.1)
+    started = time.monotonic()
+    await asyncio.gather(bucket.acquire(), bucket.acquire())
+
+    assert time.monotonic() - started >= 0.1
+
+
+async def test_pause_only_extends_an_existing_pause(clock):
+    bucket = TokenBucket(rate=1.0, burst=1.0, clock=clock)
+    await bucket.pause(30.0)
+    await bucket.pause(5.0)
+
+    assert bucket._paused_until == clock.now + 30.0
+
+
+async def test_zero_rate_means_unlimited():
+    bucket = TokenBucket(rate=0.0, burst=0.0)
+
+    assert [await bucket.acquire() for _ in range(100)] == [0.0] * 100
+
+
+async def test_limiter_caps_concurrent_requests():
+    limiter = UpstreamLimiter('notion', rate=0.0, concurrency=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    stats = limiter.stats()
+    assert peak == 2
+    assert (stats['requests'], stats['in_flight'], stats['queued']) == (6, 0, 0)
+
+
+async def test_limiter_releases_its_slot_when_cancelled_while_waiting_for_a_token():
+    limiter = UpstreamLimiter('notion', rate=1.0, burst=1.0, concurrency=1)
+    async with limiter.slot():
+        pass
+    waiting = asyncio.create_task(limiter.slot().__aenter__())
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+
+    assert not limiter._semaphore.locked()
+    assert limiter.queued == 0
+
+
+async def test_throttled_pauses_the_bucket():
+    limiter = UpstreamLimiter('github', rate=1000.0, concurrency=4)
+    await limiter.throttled(0.05)
+    started = time.monotonic()
+    async with limiter.slot():
+        pass
+
+    assert time.monotonic() - started >= 0.05
+    assert limiter.stats()['throttled'] == 1
+
+
+def test_registry_splits_concurrency_between_workers_without_exceeding_the_limit():
+    limits = {'notion': {'rate': 3.0, 'concurrency': 5}, 'supabase': {'rate': 50.0, 'concurrency': 20}}
+    registry = RateLimiterRegistry(limits, workers=2)
+
+    assert registry.get('notion').concurrency == 2
+    assert registry.get('supabase').concurrency == 10
+    assert registry.get('notion') is registry.get('notion')
+    assert registry.get('unknown').concurrency == 5
+    for workers in range(1, 9):
+        split = RateLimiterRegistry(limits, workers=workers)
+        assert split.get('notion').concurrency * workers <= 5 or split.get('notion').concurrency == 1
+
+
+def test_every_worker_keeps_one_slot_when_workers_outnumber_them():
+    registry = RateLimiterRegistry({'notion': {'rate': 3.0, 'concurrency': 3}}, workers=4)
+
+    assert registry.get('notion').concurrency == 1
+
+
+def test_shared_bucket_is_drawn_down_by_every_process(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    worker_a, worker_b = SharedStore(path), SharedStore(path)
+
+    assert worker_a.take_token('upstream:notion', 1.0, 2.0) == 0.0
+    assert worker_b.take_token('upstream:notion', 1.0, 2.0) == 0.0
+    assert 0.0 < worker_a.take_token('upstream:notion', 1.0, 2.0) <= 1.0
+
+
+def test_shared_pause_reaches_other_processes(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    worker_a, worker_b = SharedStore(path), SharedStore(path)
+
+    worker_a.pause_bucket('upstream:github', 5.0)
+    assert worker_b.take_token('upstream:github', 100.0, 100.0) == pytest.approx(5.0, abs=0.5)
+
+
+def test_shared_bucket_reports_a_short_wait_when_the_store_is_locked(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    store = SharedStore(path, busy_timeout_ms=20)
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        wait = store.take_token('upstream:notion', 1.0, 1.0)
+        elapsed = time.monotonic() - started
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+
+    assert wait == pytest.approx(0.02)
+    assert elapsed < 0.5
+    assert store.counters['busy'] == 1
+
+
+async def test_limiter_over_a_shared_store_waits_for_tokens(tmp_path):
+    store = SharedStore(str(tmp_path / 'state.sqlite3'))
+    limiter = UpstreamLimiter('notion', rate=20.0, burst=1.0, concurrency=4, store=store)
+    started = time.monotonic()
+    for _ in range(2):
+        async with limiter.slot():
+            pass
+
+    assert time.monotonic() - started >= 0.04
+
+
+async def test_throttled_pauses_the_shared_bucket_before_returning(tmp_path):
+    path = str(tmp_path / 'state.sqlite3')
+    limiter = UpstreamLimiter('github', rate=100.0, concurrency=4, store=SharedStore(path))
+    await limiter.throttled(5.0)
+
+    # Already written when throttled() returns, so the retry that follows waits for it
+    assert SharedStore(path).take_token('upstream:github', 100.0, 100.0) == pytest.approx(5.0, abs=0.5)
+
+
+async def test_shared_pause_errors_reach_the_caller(tmp_path, monkeypatch):
+    store = SharedStore(str(tmp_path / 'state.sqlite3'))
+    limiter = UpstreamLimiter('github', rate=100.0, concurrency=4, store=store)
+
+    def locked(name, seconds):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(store, 'pause_bucket', locked)
+    with pytest.raises(sqlite3.OperationalError):
+        await limiter.throttled(5.0)
@@ -0,0 +1,208 @@
+"""
+LocalReplica: keyset paging, delta and full pulls, stale deletion and cross-worker generations
+"""
+
+from standup_mcp.replica import LocalReplica
+
+
+class FakeGenerations:
+    """Shared (writes, deletes) counters every worker process bumps after writing a table"""
+
+    def __init__(self):
+        self.writes = 0
+        self.deletes = 0
+
+    def __call__(self, table):
+        return self.writes, self.deletes
+
+
+def ids(rows):
+    return sorted(row['id'] for row in rows)
+
+
+async def test_keyset_paging_never_repeats_or_skips_rows_sharing_a_watermark(postgrest):
+    for n in range(7):
+        postgrest.put(f'e{n}', '2026-01-01T10:00:00', venue='Comedy Store')
+    replica = LocalReplica(postgrest.fetch_page, {'events': ['venue']}, page_size=3)
+
+    assert await replica.sync('events', full=True) == 7
+    assert ids(replica.select('events')) == [f'e{n}' for n in range(7)]
+    # 3 + 3 + 1 rows: the short last page ends the pull
+    assert len(postgrest.requests) == 3
+    assert postgrest.requests[1]['or'] == ('(updated_at.gt."2026-01-01T10:00:00",'
+                                           'and(updated_at.eq."2026-01-01T10:00:00",id.gt."e2"))')
+
+
+async def test_delta_sync_starts_an_overlap_before_the_watermark(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    postgrest.put('e2', '2026-01-01T11:00:00')
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, overlap=2.0)
+    await replica.sync('events', full=True)
+    postgrest.put('e3', '2026-01-01T12:00:00')
+    postgrest.requests.clear()
+
+    # e2 is pulled again because of the overlap, and e3 is new
+    assert await replica.sync('events') == 2
+    assert postgrest.requests[0]['updated_at'] == 'gte.2026-01-01T10:59:58'
+    assert ids(replica.select('events')) == ['e1', 'e2', 'e3']
+
+
+async def test_full_sync_deletes_rows_that_are_gone_upstream(postgrest):
+    for n in range(4):
+        postgrest.put(f'e{n}', f'2026-01-01T10:0{n}:00')
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, page_size=2)
+    await replica.sync('events', full=True)
+    del postgrest.rows['e1']
+
+    # A delta pull cannot see deletions; the full pull removes the row
+    await replica.sync('events')
+    assert ids(replica.select('events')) == ['e0', 'e1', 'e2', 'e3']
+    await replica.sync('events', full=True)
+    assert ids(replica.select('events')) == ['e0', 'e2', 'e3']
+    assert replica.stats()['tables']['events']['rows_deleted'] == 1
+
+
+async def test_full_sync_keeps_rows_written_locally_after_the_pull_passed_them(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+
+    async def fetch_then_write(table, params):
+        rows = await postgrest.fetch_page(table, params)
+        replica.upsert('events', [{'id': 'e2', 'updated_at': '2026-01-01T12:00:00'}])
+        return rows
+
+    replica = LocalReplica(fetch_then_write, {'events': []})
+    await replica.sync('events', full=True)
+
+    assert ids(replica.select('events')) == ['e1', 'e2']
+
+
+async def test_empty_full_sync_removes_every_row(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    postgrest.put('e2', '2026-01-01T11:00:00')
+    replica = LocalReplica(postgrest.fetch_page, {'events': []})
+    await replica.sync('events', full=True)
+    postgrest.rows.clear()
+
+    assert await replica.sync('events', full=True) == 0
+    assert replica.select('events') == []
+    assert replica.stats()['tables']['events']['rows_deleted'] == 2
+
+
+async def test_older_page_never_overwrites_a_newer_local_write(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00', status='draft')
+    replica = LocalReplica(postgrest.fetch_page, {'events': ['status']})
+    await replica.sync('events', full=True)
+    replica.upsert('events', [{'id': 'e1', 'updated_at': '2026-01-01T11:00:00', 'status': 'published'}])
+    await replica.sync('events', full=True)
+
+    assert ids(replica.select('events', {'status': 'published'})) == ['e1']
+    assert replica.select('events', {'status': 'draft'}) == []
+
+
+async def test_select_falls_back_until_it_can_answer_authoritatively(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00', venue='Enmore', status='live')
+    replica = LocalReplica(postgrest.fetch_page, {'events': ['venue']}, max_staleness=60.0)
+
+    assert replica.select('events') is None
+    await replica.sync('events', full=True)
+    assert ids(replica.select('events', {'venue': 'Enmore'})) == ['e1']
+    assert replica.select('events', {'status': 'live'}) is None
+    assert replica.select('comedians') is None
+    assert ids(replica.select_in('events', 'venue', ['Enmore', 'Enmore', 'Factory'])) == ['e1']
+    assert replica.select_in('events', 'venue', []) == []
+
+    replica.tables['events'].synced_at -= 61.0
+    assert replica.select('events') is None
+    # Not synced yet, unindexed column, stale
+    assert replica.stats()['tables']['events']['fallbacks'] == 3
+
+
+async def test_write_by_another_worker_falls_back_and_resyncs(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    generations = FakeGenerations()
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, generations=generations)
+    await replica.sync('events', full=True)
+    assert ids(replica.select('events')) == ['e1']
+
+    postgrest.put('e2', '2026-01-01T11:00:00')
+    generations.writes += 1
+    assert replica.select('events') is None
+    await replica.tables['events'].resync
+    assert ids(replica.select('events')) == ['e1', 'e2']
+    assert replica.stats()['tables']['events']['resyncs'] == 1
+
+
+async def test_delete_by_another_worker_triggers_a_full_resync(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    postgrest.put('e2', '2026-01-01T11:00:00')
+    generations = FakeGenerations()
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, generations=generations)
+    await replica.sync('events', full=True)
+    del postgrest.rows['e1']
+    generations.deletes += 1
+
+    assert replica.select('events') is None
+    await replica.tables['events'].resync
+    assert ids(replica.select('events')) == ['e2']
+
+
+async def test_own_write_is_acknowledged_without_a_fallback_or_resync(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    postgrest.put('e2', '2026-01-01T10:00:00')
+    generations = FakeGenerations()
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, generations=generations)
+    await replica.sync('events', full=True)
+
+    # As the server's write paths do: bump the shared generations, apply locally, acknowledge
+    generations.writes += 1
+    replica.upsert('events', [{'id': 'e3', 'updated_at': '2026-01-01T12:00:00'}])
+    replica.acknowledge('events', generations('events'))
+    assert ids(replica.select('events')) == ['e1', 'e2', 'e3']
+
+    generations.writes += 1
+    generations.deletes += 1
+    replica.delete('events', ['e1'])
+    replica.acknowledge('events', generations('events'), deleted=True)
+    assert ids(replica.select('events')) == ['e2', 'e3']
+
+    stats = replica.stats()['tables']['events']
+    assert (stats['fallbacks'], stats['resyncs']) == (0, 0)
+    assert replica.tables['events'].resync is None
+
+
+async def test_own_write_racing_another_workers_write_still_resyncs(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    generations = FakeGenerations()
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, generations=generations)
+    await replica.sync('events', full=True)
+
+    # Another worker's write landed between ours and the generation read
+    postgrest.put('e2', '2026-01-01T11:00:00')
+    generations.writes += 2
+    replica.acknowledge('events', generations('events'))
+
+    assert replica.select('events') is None
+    await replica.tables['events'].resync
+    assert ids(replica.select('events')) == ['e1', 'e2']
+
+
+async def test_concurrent_lookups_start_only_one_resync(postgrest):
+    postgrest.put('e1', '2026-01-01T10:00:00')
+    generations = FakeGenerations()
+    replica = LocalReplica(postgrest.fetch_page, {'events': []}, generations=generations)
+    await replica.sync('events', full=True)
+    generations.writes += 1
+
+    assert [replica.select('events') for _ in range(5)] == [None] * 5
+    await replica.tables['events'].resync
+    assert replica.stats()['tables']['events']['resyncs'] == 1
+
+
+async def test_sync_errors_are_recorded_and_the_loop_keeps_going(fake_upstream):
+    replica = LocalReplica(fake_upstream(failures=1), {'events': []})
+    await replica.sync_all()
+
+    stats = replica.stats()['tables']['events']
+    assert stats['sync_errors'] == 1
+    assert stats['last_error'] == 'ConnectionError: attempt 1 failed'
+    assert not stats['ready']
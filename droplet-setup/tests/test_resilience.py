@@ -0,0 +1,266 @@
+"""
+Circuit breakers, per-tool deadlines and rolled-back concurrent writes
+"""
+
+import asyncio
+
+import pytest
+
+from standup_mcp.replica import LocalReplica
+from standup_mcp.resilience import (
+    BreakerRegistry,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    compensated,
+    deadline,
+    remaining,
+    with_deadline,
+)
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker('notion', failure_threshold=3, clock=clock)
+
+    fail(breaker, 2)
+    breaker.before_call()
+    breaker.record_success()
+    fail(breaker, 2)
+    assert breaker.state == 'closed'
+    fail(breaker, 1)
+    assert breaker.state == 'open'
+
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_call()
+    assert raised.value.name == 'notion'
+    assert raised.value.retry_in == 30.0
+    assert breaker.stats()['rejected'] == 1
+    assert breaker.stats()['opened'] == 1
+
+
+def test_half_open_probe_success_closes_the_breaker(clock):
+    breaker = CircuitBreaker('github', failure_threshold=1, recovery_timeout=10.0, clock=clock)
+    fail(breaker, 1)
+
+    clock.advance(10.0)
+    breaker.before_call()
+    assert breaker.state == 'half_open'
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == 'closed'
+    breaker.before_call()
+
+
+def test_half_open_probe_failure_reopens_for_another_recovery_period(clock):
+    breaker = CircuitBreaker('metricool', failure_threshold=2, recovery_timeout=10.0, clock=clock)
+    fail(breaker, 2)
+
+    clock.advance(10.0)
+    fail(breaker, 1)
+
+    assert breaker.state == 'open'
+    assert breaker.opened_at == clock.now
+    assert breaker.stats()['opened'] == 2
+    assert breaker.stats()['retry_in_seconds'] == 10.0
+
+
+def test_released_probe_slot_admits_the_next_caller(clock):
+    breaker = CircuitBreaker('notion', failure_threshold=1, recovery_timeout=5.0, clock=clock)
+    fail(breaker, 1)
+    clock.advance(5.0)
+
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.state == 'half_open'
+
+
+def test_registry_shares_one_breaker_per_upstream():
+    registry = BreakerRegistry(failure_threshold=1)
+    fail(registry.get('notion'), 1)
+
+    assert registry.get('notion') is registry.get('notion')
+    assert registry.stats()['notion']['state'] == 'open'
+    assert 'github' not in registry.stats()
+    assert registry.get('github').state == 'closed'
+
+
+async def test_deadline_raises_deadline_exceeded():
+    with pytest.raises(DeadlineExceeded):
+        async with deadline(0.02):
+            await asyncio.sleep(1)
+
+
+async def test_nested_deadline_cannot_extend_the_outer_one():
+    assert remaining() is None
+    async with deadline(0.5):
+        outer = remaining()
+        async with deadline(10.0):
+            inner = remaining()
+        async with deadline(0.1):
+            shorter = remaining()
+
+    assert 0 < inner <= outer <= 0.5
+    assert shorter <= 0.1
+    assert remaining() is None
+
+
+async def test_inner_deadline_expiry_is_reported_once():
+    async with deadline(5.0):
+        with pytest.raises(DeadlineExceeded) as raised:
+            async with deadline(0.01):
+                await asyncio.sleep(1)
+
+    assert str(raised.value) == 'deadline of 0.01s exceeded'
+
+
+async def test_upstream_timeouts_are_not_reported_as_deadlines():
+    with pytest.raises(TimeoutError) as raised:
+        async with deadline(5.0):
+            raise TimeoutError('read timeout')
+
+    assert not isinstance(raised.value, DeadlineExceeded)
+
+
+async def test_with_deadline_looks_up_each_tool_by_name():
+    seen = []
+
+    def seconds(name):
+        seen.append(name)
+        return 0.02 if name == 'slow_tool' else None
+
+    async def slow_tool():
+        await asyncio.sleep(1)
+
+    async def fast_tool(value):
+        return value, remaining()
+
+    with pytest.raises(DeadlineExceeded):
+        await with_deadline(slow_tool, seconds)()
+    assert await with_deadline(fast_tool, seconds)('ok') == ('ok', None)
+    assert seen == ['slow_tool', 'fast_tool']
+    assert with_deadline(fast_tool, seconds).__name__ == 'fast_tool'
+
+
+async def test_background_sync_started_inside_a_tool_call_outlives_its_deadline():
+    seen = []
+
+    async def fetch_page(table, params):
+        seen.append(remaining())
+        return []
+
+    replica = LocalReplica(fetch_page, {'events': []}, sync_interval=0.01)
+    async with deadline(0.05):
+        replica.start()
+    await asyncio.sleep(0.1)
+    running = replica.stats()['running']
+    await replica.stop()
+
+    assert running
+    assert len(seen) > 1
+    assert set(seen) == {None}
+
+
+async def test_supabase_row_is_deleted_when_the_notion_page_fails(fake_upstream):
+    delete_row, archive_page = fake_upstream(), fake_upstream()
+
+    results, errors = await compensated(
+        {'Supabase': fake_upstream([{'id': 'ev1'}])(), 'Notion': fake_upstream(failures=1)()},
+        {'Supabase': delete_row, 'Notion': archive_page},
+    )
+
+    assert results['Supabase'] == [{'id': 'ev1'}]
+    assert isinstance(results['Notion'], ConnectionError)
+    assert delete_row.calls == [(([{'id': 'ev1'}],), {})]
+    assert archive_page.calls == []
+    assert errors == {}
+
+
+async def test_notion_page_is_archived_when_the_supabase_insert_fails(fake_upstream):
+    delete_row, archive_page = fake_upstream(), fake_upstream()
+
+    results, errors = await compensated(
+        {'Supabase': fake_upstream(failures=1, delay=0.01)(), 'Notion': fake_upstream({'id': 'page-1'})()},
+        {'Supabase': delete_row, 'Notion': archive_page},
+    )
+
+    assert isinstance(results['Supabase'], ConnectionError)
+    assert archive_page.calls == [(({'id': 'page-1'},), {})]
+    assert delete_row.calls == []
+    assert errors == {}
+
+
+async def test_nothing_is_rolled_back_when_every_write_succeeds(fake_upstream):
+    undo = fake_upstream()
+
+    results, errors = await compensated(
+        {'Supabase': fake_upstream('row')(), 'Notion': fake_upstream('page')()},
+        {'Supabase': undo, 'Notion': undo},
+    )
+
+    assert results == {'Supabase': 'row', 'Notion': 'page'}
+    assert (undo.calls, errors) == ([], {})
+
+
+async def test_failed_rollback_is_reported(fake_upstream):
+    results, errors = await compensated(
+        {'Supabase': fake_upstream('row')(), 'Notion': fake_upstream(failures=1)()},
+        {'Supabase': fake_upstream(failures=1), 'Notion': fake_upstream()},
+    )
+
+    assert list(errors) == ['Supabase']
+    assert str(errors['Supabase']) == 'attempt 1 failed'
+
+
+async def test_writes_finished_before_the_deadline_are_rolled_back_under_a_deadline_of_their_own(fake_upstream):
+    stuck = fake_upstream(gated=True)
+    undo_deadlines = []
+
+    async def delete_row(rows):
+        undo_deadlines.append(remaining())
+        await asyncio.sleep(0.05)
+
+    with pytest.raises(DeadlineExceeded):
+        async with deadline(0.05):
+            await compensated(
+                {'Supabase': fake_upstream('row')(), 'Notion': stuck()},
+                {'Supabase': delete_row, 'Notion': fake_upstream()},
+                undo_seconds=5.0,
+            )
+
+    # Ran (and finished) past the caller's expired deadline, bounded by undo_seconds instead
+    assert len(undo_deadlines) == 1
+    assert 4.0 < undo_deadlines[0] <= 5.0
+
+
+async def test_client_cancel_mid_write_still_rolls_back_and_the_rollback_outlives_a_second_cancel(fake_upstream):
+    archived = asyncio.Event()
+
+    async def archive_page(page):
+        await asyncio.sleep(0.05)
+        archived.set()
+
+    stuck = fake_upstream(gated=True)
+    call = asyncio.create_task(compensated(
+        {'Supabase': stuck(), 'Notion': fake_upstream({'id': 'page-1'})()},
+        {'Supabase': fake_upstream(), 'Notion': archive_page},
+    ))
+    await asyncio.sleep(0.01)
+    call.cancel()
+    await asyncio.sleep(0.01)
+    call.cancel()
+    await asyncio.gather(call, return_exceptions=True)
+
+    assert call.cancelled()
+    assert not archived.is_set()
+    async with asyncio.timeout(1.0):
+        await archived.wait()
@@ -0,0 +1,146 @@
+"""
+Serialization: upstream bodies sent on unchanged, re-encoding after changes and pre-encoded tool results
+"""
+
+import inspect
+import json
+
+import pytest
+
+from standup_mcp import serialization
+from standup_mcp.serialization import RawDict, RawList, dumps, encode_result, parse
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+def test_unmodified_body_goes_out_byte_for_byte():
+    body = b'{ "id" : "ev1",  "title":"Late   Show", "fee":1.50 }'
+    value = parse(body)
+
+    assert isinstance(value, RawDict)
+    assert value['title'] == 'Late   Show'
+    assert dumps(value) is body
+    assert dumps(serialization.json_body(FakeResponse(b'[1, 2,  3]'))) == b'[1, 2,  3]'
+
+
+def test_scalar_bodies_are_plain_values():
+    assert parse(b'42') == 42
+    assert parse(b'null') is None
+    assert parse('"text"') == 'text'
+
+
+@pytest.mark.parametrize('change', [
+    lambda row: row.__setitem__('title', 'Changed'),
+    lambda row: row.update(title='Changed'),
+    lambda row: row.setdefault('venue', 'Enmore'),
+    lambda row: row.pop('fee'),
+    lambda row: row.__delitem__('fee'),
+    lambda row: row.clear(),
+])
+def test_changed_object_is_re_encoded(change):
+    row = parse(b'{"id": "ev1", "title": "Show", "fee": 10}')
+    change(row)
+
+    assert row.raw is None
+    assert json.loads(dumps(row)) == dict(row)
+
+
+@pytest.mark.parametrize('change', [
+    lambda rows: rows.append({'id': 'ev3'}),
+    lambda rows: rows.extend([{'id': 'ev3'}]),
+    lambda rows: rows.pop(),
+    lambda rows: rows.__setitem__(0, {'id': 'other'}),
+    lambda rows: rows.sort(key=lambda row: row['id'], reverse=True),
+    lambda rows: rows.reverse(),
+])
+def test_changed_array_is_re_encoded(change):
+    rows = parse(b'[{"id": "ev1"}, {"id": "ev2"}]')
+    change(rows)
+
+    assert isinstance(rows, RawList)
+    assert json.loads(dumps(rows)) == list(rows)
+
+
+def test_reading_keeps_the_raw_bytes():
+    body = b'{"id": "ev1", "tags": ["a"]}'
+    row = parse(body)
+
+    assert row.get('id') == 'ev1'
+    assert 'tags' in row
+    assert dict(row.items()) == row.copy()
+    assert dumps(row) is body
+
+
+def test_dumps_falls_back_to_the_stdlib_for_values_orjson_rejects():
+    assert json.loads(dumps({'big': 2 ** 80, 1: 'int key'})) == {'big': 2 ** 80, '1': 'int key'}
+
+
+async def test_top_level_tool_result_is_json_text():
+    @encode_result
+    async def tool(event_id: str, ctx=None) -> dict:
+        return {'id': event_id, 'fee': 10}
+
+    result = await tool('ev1')
+
+    assert isinstance(result, str)
+    assert json.loads(result) == {'id': 'ev1', 'fee': 10}
+
+
+async def test_upstream_body_returned_by_a_tool_is_not_re_encoded():
+    body = b'{"id": "ev1",   "spacing": "kept"}'
+
+    @encode_result
+    async def tool() -> dict:
+        return parse(body)
+
+    assert await tool() == body.decode()
+
+
+async def test_string_result_is_sent_as_is():
+    @encode_result
+    async def tool() -> str:
+        return 'already text'
+
+    assert await tool() == 'already text'
+
+
+async def test_nested_tool_call_returns_python_objects():
+    @encode_result
+    async def inner(event_id: str) -> dict:
+        return {'id': event_id}
+
+    @encode_result
+    async def outer() -> dict:
+        event = await inner('ev1')
+        assert event == {'id': 'ev1'}
+        return {'event': event, 'nested': serialization._in_tool_call.get()}
+
+    assert json.loads(await outer()) == {'event': {'id': 'ev1'}, 'nested': True}
+    # Reset once the outer call finished
+    assert serialization._in_tool_call.get() is False
+    assert json.loads(await inner('ev2')) == {'id': 'ev2'}
+
+
+async def test_tool_errors_reset_the_nesting_flag():
+    @encode_result
+    async def tool():
+        raise ValueError('upstream failed')
+
+    with pytest.raises(ValueError):
+        await tool()
+    assert serialization._in_tool_call.get() is False
+
+
+def test_wrapped_tool_keeps_its_parameters_but_drops_the_return_type():
+    async def tool(event_id: str, fields: list = None, ctx=None) -> dict:
+        return {}
+
+    wrapped = encode_result(tool)
+
+    assert list(inspect.signature(wrapped).parameters) == ['event_id', 'fields', 'ctx']
+    assert inspect.signature(wrapped).return_annotation is inspect.Signature.empty
+    assert 'return' not in wrapped.__annotations__
+    assert wrapped.__name__ == 'tool'
@@ -0,0 +1,112 @@
+"""
+Settings.from_env: defaults, parsing, per-name overrides and rejecting values the server cannot use
+"""
+
+import dataclasses
+
+import pytest
+
+from standup_mcp.settings import REQUIRED_ENV, Settings, SettingsError
+
+
+def test_defaults_with_an_empty_environment():
+    settings = Settings.from_env({})
+
+    assert settings.supabase_url is None
+    assert settings.notion_api_url == 'https://api.notion.com'
+    assert (settings.port, settings.workers, settings.tool_deadline_seconds) == (8000, 1, 30.0)
+    assert not settings.shared_state
+    assert settings.metrics_payload_sizes
+    assert settings.missing == REQUIRED_ENV
+
+
+def test_values_are_parsed_and_urls_lose_their_trailing_slash():
+    settings = Settings.from_env({
+        'SUPABASE_URL': ' https://project.supabase.co/ ',
+        'SUPABASE_ANON_KEY': 'anon',
+        'MCP_PORT': '9001',
+        'MCP_WORKERS': '4',
+        'MCP_SHARED_STATE': 'Yes',
+        'MCP_METRICS_PAYLOAD_SIZES': 'off',
+        'MCP_CACHE_TTL_EVENTS': '0',
+        'MCP_UPSTREAM_MAX_RETRY_AFTER': '2.5',
+    })
+
+    assert settings.supabase_url == 'https://project.supabase.co'
+    assert (settings.port, settings.workers) == (9001, 4)
+    assert settings.shared_state and not settings.metrics_payload_sizes
+    assert settings.cache_ttl_events == 0.0
+    assert settings.upstream_max_retry_after == 2.5
+    assert 'SUPABASE_URL' not in settings.missing and 'SUPABASE_ANON_KEY' not in settings.missing
+
+
+def test_per_name_overrides():
+    settings = Settings.from_env({
+        'MCP_TOOL_DEADLINE_SECONDS': '20',
+        'MCP_TOOL_DEADLINE_NOTION_SYNC_EVENTS': '120',
+        'MCP_UPSTREAM_TIMEOUT_GITHUB': '4',
+        'MCP_RATE_LIMIT_NOTION': '0',
+        'MCP_CONCURRENCY_SUPABASE': '8',
+    })
+
+    assert settings.tool_deadline('notion_sync_events') == 120.0
+    assert settings.tool_deadline('query_supabase') == 20.0
+    assert 'seconds' not in settings.tool_deadlines
+    assert dict(settings.upstream_timeouts) == {'github': 4.0}
+    assert dict(settings.rate_limits) == {'notion': 0.0}
+    assert dict(settings.concurrency_limits) == {'supabase': 8}
+
+
+def test_settings_are_frozen():
+    settings = Settings.from_env({})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.port = 1
+    with pytest.raises(TypeError):
+        settings.tool_deadlines['x'] = 1.0
+
+
+@pytest.mark.parametrize('name, value', [
+    ('SUPABASE_URL', 'project.supabase.co'),
+    ('SUPABASE_URL', 'ftp://project.supabase.co'),
+    ('N8N_WEBHOOK_URL', 'https://'),
+    ('NOTION_API_URL', 'localhost:9000'),
+])
+def test_invalid_urls_are_rejected(name, value):
+    with pytest.raises(SettingsError) as raised:
+        Settings.from_env({name: value})
+
+    assert f"{name} must be an http(s) URL, got {value!r}" in str(raised.value)
+
+
+@pytest.mark.parametrize('name, value', [
+    ('MCP_PORT', '0'),
+    ('MCP_PORT', '70000'),
+    ('MCP_PORT', '80.5'),
+    ('MCP_WORKERS', 'two'),
+    ('MCP_SUPABASE_IN_CHUNK', '5000'),
+    ('MCP_CONCURRENCY_NOTION', '0'),
+    ('MCP_TOOL_DEADLINE_SECONDS', '0'),
+    ('MCP_TOOL_DEADLINE_SECONDS', '-5'),
+    ('MCP_TOOL_DEADLINE_SECONDS', 'nan'),
+    ('MCP_UPSTREAM_TIMEOUT_SECONDS', 'inf'),
+    ('MCP_UPSTREAM_TIMEOUT_GITHUB', 'soon'),
+    ('MCP_CACHE_TTL_EVENTS', '-1'),
+    ('MCP_RATE_LIMIT_NOTION', 'fast'),
+    ('MCP_SHARED_STATE', 'maybe'),
+])
+def test_invalid_numbers_and_flags_are_rejected(name, value):
+    with pytest.raises(SettingsError) as raised:
+        Settings.from_env({name: value})
+
+    assert name in str(raised.value)
+    assert repr(value) in str(raised.value)
+
+
+def test_every_problem_is_reported_at_once():
+    with pytest.raises(SettingsError) as raised:
+        Settings.from_env({'MCP_PORT': 'x', 'SUPABASE_URL': 'nope', 'MCP_JOB_WORKERS': '0'})
+
+    message = str(raised.value)
+    assert message.startswith('Invalid configuration:')
+    assert all(name in message for name in ('MCP_PORT', 'SUPABASE_URL', 'MCP_JOB_WORKERS'))